@@ -0,0 +1,304 @@
+"""
+Static pytest fixtures dependency graph.
+
+Fixtures and tests are read from the source (no pytest run, no imports), fixtures are resolved like pytest does:
+test classes first (innermost first), then the test module, then conftest.py files from the test directory up.
+Arguments named by the test parametrize marks are not fixtures, unless they are parametrized `indirect`.
+"""
+
+import ast
+import math
+import os
+
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.files import is_test_file, iter_python_files
+from PluginsUtils.parallel import parallel_map
+from UniqueFixturesNames import iter_fixtures
+
+# Fixture arguments which are not fixtures defined in the code.
+NON_FIXTURE_ARGS = {"self", "cls", "request"}
+
+
+def is_fixtures_file(name):
+    return name == "conftest.py" or is_test_file(filename=name)
+
+
+def _literal_len(elm):
+    if isinstance(elm, (ast.List, ast.Tuple, ast.Set)):
+        return len(elm.elts)
+
+    return None
+
+
+def _func_args(func):
+    args = func.args
+    return [arg.arg for arg in (*args.posonlyargs, *args.args, *args.kwonlyargs) if arg.arg not in NON_FIXTURE_ARGS]
+
+
+def _string_names(elm):
+    """
+    Get the names of a parametrize argnames: `"a, b"`, `["a", "b"]` or `("a", "b")`.
+    """
+    if isinstance(elm, ast.Constant) and isinstance(elm.value, str):
+        return [name.strip() for name in elm.value.split(",") if name.strip()]
+
+    if isinstance(elm, (ast.List, ast.Tuple)):
+        return [name.value for name in elm.elts if isinstance(name, ast.Constant) and isinstance(name.value, str)]
+
+    return []
+
+
+def _parametrized_args(decorators):
+    """
+    Get the arguments the parametrize marks give values to directly (not through an `indirect` fixture).
+    """
+    names = set()
+    for deco in decorators:
+        if deco.kind != "mark.parametrize":
+            continue
+
+        argnames = _string_names(elm=deco.args[0] if deco.args else deco.keyword(name="argnames"))
+        indirect = deco.keyword(name="indirect")
+        if isinstance(indirect, ast.Constant) and indirect.value is True:
+            continue
+
+        names.update(set(argnames) - set(_string_names(elm=indirect)))
+
+    return names
+
+
+def _usefixtures(decorators):
+    for deco in decorators:
+        if deco.kind == "mark.usefixtures":
+            for arg in deco.args:
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                    yield arg.value
+
+
+def _parametrize_count(decorators):
+    """
+    Number of items the parametrize marks create, unknown (not a literal) lists count as 1.
+    """
+    count = 1
+    for deco in decorators:
+        if deco.kind == "mark.parametrize" and len(deco.args) > 1:
+            count *= _literal_len(elm=deco.args[1]) or 1
+
+    return count
+
+
+def _fixture(func, resolver):
+    keywords = resolver.find(node=func, kind="fixture").keywords
+    scope = keywords.get("scope")
+    autouse = keywords.get("autouse")
+    return {
+        "name": func.name,
+        "lineno": func.lineno,
+        "scope": scope.value if isinstance(scope, ast.Constant) else "function",
+        "autouse": bool(getattr(autouse, "value", False)),
+        "params": _literal_len(elm=keywords["params"]) if "params" in keywords else None,
+        "deps": _func_args(func=func),
+    }
+
+
+def extract_fixtures(tree):
+    resolver = get_decorator_resolver(tree=tree)
+    return {func.name: _fixture(func=func, resolver=resolver) for func in iter_fixtures(tree=tree)}
+
+
+def extract_class_fixtures(tree, filename):
+    """
+    Get test class path -> the scope of the fixtures defined in the class, for the classes which define fixtures.
+    """
+    resolver = get_decorator_resolver(tree=tree)
+    classes = {}
+
+    def iter_classes(body, class_name=None):
+        for elm in body:
+            if isinstance(elm, ast.ClassDef) and elm.name.startswith("Test"):
+                name = f"{class_name}::{elm.name}" if class_name else elm.name
+                fixtures = {
+                    item.name: _fixture(func=item, resolver=resolver)
+                    for item in elm.body
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and resolver.is_fixture(node=item)
+                }
+                if fixtures:
+                    classes[name] = {"filename": f"{filename}::{name}", "fixtures": fixtures}
+
+                iter_classes(body=elm.body, class_name=name)
+
+    iter_classes(body=tree.body)
+    return classes
+
+
+def extract_tests(tree):
+    resolver = get_decorator_resolver(tree=tree)
+
+    def iter_tests(body, class_name=None, class_decorators=(), classes=()):
+        for elm in body:
+            if isinstance(elm, ast.ClassDef) and elm.name.startswith("Test"):
+                name = f"{class_name}::{elm.name}" if class_name else elm.name
+                yield from iter_tests(
+                    body=elm.body,
+                    class_name=name,
+                    class_decorators=(*class_decorators, *resolver.iter_decorators(node=elm)),
+                    classes=(name, *classes),
+                )
+
+            elif isinstance(elm, (ast.FunctionDef, ast.AsyncFunctionDef)) and elm.name.startswith("test_"):
+                decorators = [*class_decorators, *resolver.iter_decorators(node=elm)]
+                parametrized = _parametrized_args(decorators=decorators)
+                yield {
+                    "name": f"{class_name}::{elm.name}" if class_name else elm.name,
+                    "lineno": elm.lineno,
+                    "classes": list(classes),
+                    "fixtures": [
+                        *_usefixtures(decorators=decorators),
+                        *(arg for arg in _func_args(func=elm) if arg not in parametrized),
+                    ],
+                    "parametrize": _parametrize_count(decorators=decorators),
+                }
+
+    return list(iter_tests(body=tree.body))
+
+
+def extract_module(filename):
+    try:
+        with open(filename, "rb") as fd:
+            tree = ast.parse(fd.read(), filename=filename)
+
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    return {
+        "filename": filename,
+        "fixtures": extract_fixtures(tree=tree),
+        "classes": extract_class_fixtures(tree=tree, filename=filename),
+        "tests": extract_tests(tree=tree) if is_test_file(filename=filename) else [],
+    }
+
+
+class FixtureGraph:
+    """
+    Fixtures dependency graph of a tests tree.
+    """
+
+    def __init__(self, modules):
+        self.modules = {module["filename"]: module for module in modules if module}
+        self.conftests = {
+            os.path.dirname(filename): module
+            for filename, module in self.modules.items()
+            if os.path.basename(filename) == "conftest.py"
+        }
+        self._scopes = {}
+
+    @classmethod
+    def from_paths(cls, paths):
+        return cls(
+            modules=parallel_map(func=extract_module, items=iter_python_files(paths=paths, match=is_fixtures_file))
+        )
+
+    def scopes(self, filename):
+        """
+        Get the modules a test module sees fixtures from, nearest first.
+        """
+        if filename not in self._scopes:
+            scopes = [self.modules[filename]]
+            directory = os.path.dirname(filename)
+            while True:
+                conftest = self.conftests.get(directory)
+                if conftest and conftest is not scopes[0]:
+                    scopes.append(conftest)
+
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    break
+
+                directory = parent
+
+            self._scopes[filename] = scopes
+
+        return self._scopes[filename]
+
+    def test_scopes(self, filename, test):
+        """
+        Get the scopes a test sees fixtures from, its classes (innermost first) and then its module scopes.
+        """
+        classes = self.modules[filename]["classes"]
+        return [*(classes[name] for name in test["classes"] if name in classes), *self.scopes(filename=filename)]
+
+    def resolve(self, scopes, name, below=None):
+        """
+        Get (scope, fixture) name resolves to from scopes.
+        below is the scope of a fixture requesting a fixture with its own name (overriding it),
+        resolution starts after it.
+        """
+        start = next(idx + 1 for idx, module in enumerate(scopes) if module is below) if below is not None else 0
+        for module in scopes[start:]:
+            fixture = module["fixtures"].get(name)
+            if fixture:
+                return module, fixture
+
+        return None, None
+
+    def autouse(self, scopes):
+        names = []
+        for module in scopes:
+            names.extend(name for name, fixture in module["fixtures"].items() if fixture["autouse"])
+
+        return names
+
+    def closure(self, filename, test):
+        """
+        Get the fixtures test pulls in, as a list of (scope filename, fixture), the scope filename of a class
+        fixture is `filename::Class`.
+        """
+        scopes = self.test_scopes(filename=filename, test=test)
+        closure = {}
+        to_visit = [(name, None) for name in (*self.autouse(scopes=scopes), *test["fixtures"])]
+        while to_visit:
+            name, below = to_visit.pop()
+            module, fixture = self.resolve(scopes=scopes, name=name, below=below)
+            if not fixture or (module["filename"], name) in closure:
+                continue
+
+            closure[module["filename"], name] = fixture
+            for dep in fixture["deps"]:
+                to_visit.append((dep, module if dep == name else None))
+
+        return [(key[0], fixture) for key, fixture in closure.items()]
+
+    def iter_tests(self):
+        for filename, module in sorted(self.modules.items()):
+            for test in module["tests"]:
+                yield filename, test
+
+    def report(self, top=20):
+        """
+        Get per test closure sizes and parametrize multiplication, and function scoped fixtures dependents.
+        """
+        tests = []
+        dependents = {}
+        for filename, test in self.iter_tests():
+            closure = self.closure(filename=filename, test=test)
+            fan_out = math.prod(fixture["params"] or 1 for _, fixture in closure)
+            tests.append({
+                "test": f"{filename}::{test['name']}",
+                "lineno": test["lineno"],
+                "closure_size": len(closure),
+                "items": fan_out * test["parametrize"],
+            })
+            for fixture_filename, fixture in closure:
+                if fixture["scope"] == "function":
+                    key = f"{fixture_filename}::{fixture['name']}"
+                    dependents[key] = dependents.get(key, 0) + 1
+
+        return {
+            "tests": len(tests),
+            "largest_closures": sorted(tests, key=lambda test: (-test["closure_size"], test["test"]))[:top],
+            "most_items": sorted(tests, key=lambda test: (-test["items"], test["test"]))[:top],
+            "most_used_function_fixtures": [
+                {"fixture": fixture, "tests": count}
+                for fixture, count in sorted(dependents.items(), key=lambda item: (-item[1], item[0]))[:top]
+            ],
+        }
@@ -0,0 +1,45 @@
+"""
+Report the heaviest tests and fixtures of a tests tree from its static fixtures graph.
+
+python -m FixtureGraph [--top N] [--json] [paths ...]
+"""
+
+import argparse
+import json
+import sys
+
+from FixtureGraph import FixtureGraph
+
+
+def print_report(report):
+    print(f"Tests: {report['tests']}")
+    print("\nLargest fixtures closures:")
+    for test in report["largest_closures"]:
+        print(f"  {test['closure_size']:>6}  {test['test']}")
+
+    print("\nMost generated items (parametrize x fixtures params):")
+    for test in report["most_items"]:
+        print(f"  {test['items']:>6}  {test['test']}")
+
+    print("\nFunction scoped fixtures used by most tests:")
+    for fixture in report["most_used_function_fixtures"]:
+        print(f"  {fixture['tests']:>6}  {fixture['fixture']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m FixtureGraph", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=["."], help="Tests directories or files.")
+    parser.add_argument("--top", type=int, default=20, help="Number of entries in each list.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(args=argv)
+
+    report = FixtureGraph.from_paths(paths=args.paths).report(top=args.top)
+    if args.json:
+        json.dump(obj=report, fp=sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report=report)
+
+
+if __name__ == "__main__":
+    main()
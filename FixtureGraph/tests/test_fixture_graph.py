@@ -0,0 +1,65 @@
+import json
+from subprocess import PIPE, Popen
+
+conftest_content = """
+import pytest
+
+
+@pytest.fixture(scope="session", params=[1, 2, 3])
+def backend(request):
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    yield
+"""
+
+tests_content = """
+import pytest
+
+
+@pytest.fixture
+def client(backend):
+    return backend
+
+
+@pytest.mark.parametrize("value", [1, 2])
+def test_client(client, value):
+    assert client
+
+
+class TestThings:
+    @pytest.fixture
+    def client(self):
+        return 0
+
+    def test_class_client(self, client):
+        assert client == 0
+"""
+
+
+def fixture_graph_report(cwd, args):
+    out, _ = Popen(
+        args=["python", "-m", "FixtureGraph", "--json", *args], stdout=PIPE, stderr=PIPE, cwd=str(cwd)
+    ).communicate()
+    return json.loads(s=out)
+
+
+def test_fixture_graph_report(tmpdir):
+    tmpdir.join("tests", "conftest.py").write(conftest_content, ensure=True)
+    tmpdir.join("tests", "test_things.py").write(tests_content)
+
+    report = fixture_graph_report(cwd=tmpdir, args=["tests"])
+    # test_client: client, backend (3 params) and the autouse clean, `value` is a parametrize argument (2 params).
+    # test_class_client: the class client shadows the module one.
+    assert report["tests"] == 2
+    assert report["most_items"] == [
+        {"test": "tests/test_things.py::test_client", "lineno": 11, "closure_size": 3, "items": 6},
+        {"test": "tests/test_things.py::TestThings::test_class_client", "lineno": 20, "closure_size": 2, "items": 1},
+    ]
+    assert report["most_used_function_fixtures"] == [
+        {"fixture": "tests/conftest.py::clean", "tests": 2},
+        {"fixture": "tests/test_things.py::TestThings::client", "tests": 1},
+        {"fixture": "tests/test_things.py::client", "tests": 1},
+    ]
@@ -3,9 +3,14 @@ flake8 plugin which verifies that all functions are called with arg=value (and n
 """
 
 import ast
-import re
 
-FCN001 = "FCN001: [{f_name}] function should be called with keywords arguments. {values}"
+from FunctionCallForceNames.engine import FCN001, CallsChecker, resolve_callee_name
+from FunctionCallForceNames.matcher import ExcludeMatcher
+from FunctionCallForceNames.signatures import CalleeResolver, get_signature_index, keywords_optional
+from PluginsUtils.metrics import count, measured
+from PluginsUtils.results import get_file_result
+
+ENGINES = ("visitor", "legacy")
 
 
 class FunctionCallForceNames:
@@ -17,9 +22,11 @@ class FunctionCallForceNames:
     name = "FunctionCallForceNames"
     version = "1.0.0"
 
-    def __init__(self, tree, lines):
+    def __init__(self, tree, filename=None):
         self.tree = tree
-        self.lines = lines
+        self.filename = filename
+        self.signatures = None
+        self.resolver = None
 
     @classmethod
     def add_options(cls, option_manager):
@@ -30,10 +37,31 @@ class FunctionCallForceNames:
             comma_separated_list=True,
             help="Functions to exclude from checking.",
         )
+        option_manager.add_option(
+            long_option_name="--fcn_engine",
+            default="visitor",
+            parse_from_config=True,
+            choices=ENGINES,
+            help="Calls finder: visitor checks all calls in one pass, legacy only statements level calls "
+            "(compatibility, default: visitor).",
+        )
+        option_manager.add_option(
+            long_option_name="--fcn_min_params",
+            default=0,
+            type=int,
+            parse_from_config=True,
+            help="Require keywords only for project callees which take more than this number of parameters, "
+            "from the project signatures index (default: 0, index not used).",
+        )
 
     @classmethod
     def parse_options(cls, options):
-        cls.exclude_functions = options.fcn_exclude_functions + [*__builtins__] + cls.get_builtins_sub_functions()
+        cls.engine = options.fcn_engine
+        cls.min_params = options.fcn_min_params
+        cls.result_options = (options.fcn_engine, tuple(options.fcn_exclude_functions))
+        cls.exclude_functions = ExcludeMatcher(
+            entries=[*options.fcn_exclude_functions, *__builtins__, *cls.get_builtins_sub_functions()]
+        )
 
     @classmethod
     def get_builtins_sub_functions(cls):
@@ -76,20 +104,14 @@ class FunctionCallForceNames:
                 yield elm_func_attr
 
         if isinstance(elm, ast.With):
-            _line = self.lines[elm.lineno - 1]
-            #  If ( not in line this is not a function call.
-            if "(" not in _line:
+            calls = [item.context_expr for item in elm.items if isinstance(item.context_expr, ast.Call)]
+            # Not a function call.
+            if not calls:
                 return
 
-            def _parse_name(lineno):
-                name = re.findall(r"[a-z].*\(|[A-Z].*\(", lineno.strip())
-                if not name:
-                    _parse_name(lineno=self.lines[elm.lineno])
-                return name
-
-            name = _parse_name(lineno=_line)
+            name = resolve_callee_name(func=calls[0].func)
             if name:
-                yield name[0].strip("(").strip("with ")
+                yield name
 
             for elm_body in elm.body:
                 if isinstance(elm_body, (ast.Call, ast.Expr, ast.Assign)):
@@ -123,15 +145,11 @@ class FunctionCallForceNames:
             return name
 
     def _skip_function_from_check(self, elm):
-        name = self._get_func_name(elm=elm)
-        if name not in self.exclude_functions:
-            if name and isinstance(name, str):
-                for _name in name.split("."):
-                    if _name in self.exclude_functions:
-                        return True
-            return self._get_func_name(elm=elm, attr=True) in self.exclude_functions
+        # The matcher checks the name dotted parts and memoizes its decisions per name.
+        if self.exclude_functions.match(name=self._get_func_name(elm=elm)):
+            return True
 
-        return name in self.exclude_functions
+        return self.exclude_functions.match(name=self._get_func_name(elm=elm, attr=True))
 
     def _get_args(self, elm):
         def _find_args(elm):
@@ -165,6 +183,7 @@ class FunctionCallForceNames:
         return res
 
     def _missing_keywords(self, elm):
+        count(counter="calls_checked")
         if self._skip_function_from_check(elm=elm):
             return
 
@@ -183,6 +202,17 @@ class FunctionCallForceNames:
                 if self._skip_function_from_check(elm=elm_key):
                     continue
 
+                if (
+                    self.resolver
+                    and isinstance(elm_key, ast.Call)
+                    and keywords_optional(
+                        signatures=self.resolver.resolve(call=elm_key),
+                        positional_args=len(elm_key.args),
+                        min_params=self.min_params,
+                    )
+                ):
+                    continue
+
                 args_to_process = []
                 for _arg_key in args_key:
                     # Skip only functions.
@@ -230,6 +260,33 @@ class FunctionCallForceNames:
                 for if_elm in elm.orelse:
                     yield from self._get_elm_call(elm=if_elm)
 
+    @measured
     def run(self):
-        for elm in self._get_func_call():
-            yield from self._missing_keywords(elm=elm)
+        if self.min_params:
+            # Findings depend on the signatures of the whole project, they are not cached.
+            # Loaded in run (not in __init__) so the time it takes is measured with the plugin.
+            self.signatures = get_signature_index()
+            yield from self._check()
+            return
+
+        yield from get_file_result(plugin=self, compute=lambda: list(self._check()), options=self.result_options)
+
+    def _check(self):
+        if self.engine == "legacy":
+            if self.signatures:
+                self.resolver = CalleeResolver(tree=self.tree, index=self.signatures, filename=self.filename)
+
+            for elm in self._get_func_call():
+                yield from self._missing_keywords(elm=elm)
+
+            return
+
+        checker = CallsChecker(
+            tree=self.tree,
+            exclude_functions=self.exclude_functions,
+            signatures=self.signatures,
+            min_params=self.min_params,
+            filename=self.filename,
+        )
+        for lineno, col_offset, message in checker.run():
+            yield lineno, col_offset, message, self.name
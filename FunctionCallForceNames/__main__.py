@@ -0,0 +1,53 @@
+"""
+Rewrite the positional arguments of the calls FCN reports as keywords arguments.
+
+python -m FunctionCallForceNames [--diff] [--jobs N] [--exclude-functions NAMES] [--min-params N] [paths ...]
+"""
+
+import argparse
+import sys
+import types
+
+from FunctionCallForceNames import FunctionCallForceNames
+from FunctionCallForceNames.fix import fix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m FunctionCallForceNames", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("paths", nargs="*", default=["."], help="Directories or files to fix.")
+    parser.add_argument("--diff", action="store_true", help="Print the changes as a diff, don't write the files.")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of processes, all cores by default.")
+    parser.add_argument(
+        "--exclude-functions", default="", help="Comma separated functions to exclude (same as fcn_exclude_functions)."
+    )
+    parser.add_argument("--min-params", type=int, default=0, help="Same as fcn_min_params.")
+    args = parser.parse_args(args=argv)
+
+    # Same exclusions as the flake8 plugin.
+    FunctionCallForceNames.parse_options(
+        options=types.SimpleNamespace(
+            fcn_exclude_functions=[name for name in args.exclude_functions.split(",") if name],
+            fcn_engine="visitor",
+            fcn_min_params=args.min_params,
+        )
+    )
+    files, calls = 0, 0
+    for _, diff, file_calls in fix(
+        paths=args.paths,
+        exclude_functions=FunctionCallForceNames.exclude_functions,
+        min_params=args.min_params,
+        dry_run=args.diff,
+        processes=args.jobs,
+    ):
+        sys.stdout.write(diff)
+        files += 1
+        calls += file_calls
+
+    action = "Would fix" if args.diff else "Fixed"
+    sys.stderr.write(f"{action} {calls} calls in {files} files\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Single pass FCN engine.
+
+All calls of the tree (bodies, else branches, handlers, match cases, decorators, lambdas, comprehensions, nested
+calls) come from the shared node index, built in one iterative walk, so long fluent call chains are safe.
+A callee name is resolved once per call node and cached, the cache serves the exclusion check, the message and
+the calls passed as values.
+"""
+
+import ast
+
+from FunctionCallForceNames.signatures import CalleeResolver, keywords_optional
+from PluginsUtils.metrics import count
+from PluginsUtils.nodes import get_node_index
+
+FCN001 = "FCN001: [{f_name}] function should be called with keywords arguments. {values}"
+
+
+def _last_name(node):
+    """
+    Get the last name of a callee expression, `b` for `a.b`, `a.b()` or `a.b[0]`.
+    """
+    while True:
+        if isinstance(node, ast.Attribute):
+            return node.attr
+
+        if isinstance(node, ast.Name):
+            return node.id
+
+        if isinstance(node, ast.Call):
+            node = node.func
+
+        elif isinstance(node, ast.Subscript):
+            node = node.value
+
+        else:
+            return None
+
+
+def resolve_callee_name(func):
+    """
+    Get the dotted name of a called expression: `a.b.c` for `a.b.c(...)`.
+
+    A call or a subscript in the chain contributes its last name only (`b.c` for `a.b().c(...)`), so names of long
+    fluent chains don't grow with the chain.
+    """
+    parts = []
+    node = func
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    root = node.id if isinstance(node, ast.Name) else _last_name(node=node)
+    if root:
+        parts.append(root)
+
+    return ".".join(reversed(parts)) or None
+
+
+def resolve_callee_path(func):
+    """
+    Get the own dotted path of a called expression, without the names of the calls or subscripts it is chained on:
+    `a.b.c` for `a.b.c(...)`, `c` for `a.b().c(...)` or `a[0].c(...)`.
+    """
+    parts = []
+    node = func
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+
+    return ".".join(reversed(parts)) or None
+
+
+class CallsChecker:
+    """
+    Find the calls of a tree with positional arguments.
+    """
+
+    def __init__(self, tree, exclude_functions, signatures=None, min_params=0, filename=None):
+        self.tree = tree
+        self.exclude_functions = exclude_functions
+        # Project signatures index (see signatures.py), None to check all calls.
+        self.signatures = signatures
+        self.min_params = min_params
+        self.resolver = CalleeResolver(tree=tree, index=signatures, filename=filename) if signatures else None
+        # id(call node) -> callee name
+        self.callee_names = {}
+
+    def callee_name(self, call):
+        key = id(call)
+        if key not in self.callee_names:
+            self.callee_names[key] = resolve_callee_name(func=call.func)
+
+        return self.callee_names[key]
+
+    def _value_name(self, value):
+        while True:
+            if isinstance(value, ast.Call):
+                return self.callee_name(call=value)
+
+            if isinstance(value, ast.Name):
+                return value.id
+
+            if isinstance(value, ast.Attribute):
+                return value.attr
+
+            if isinstance(value, ast.Constant):
+                return value.value if isinstance(value.value, str) else None
+
+            if isinstance(value, ast.Dict):
+                return "dict"
+
+            if isinstance(value, (ast.Subscript, ast.Starred, ast.Await)):
+                value = value.value
+
+            else:
+                return None
+
+    def _get_values(self, args_):
+        return "".join(
+            f"value: {self._value_name(value=arg)} (line:{arg.lineno} column:{arg.col_offset})" for arg in args_
+        )
+
+    def iter_reported_calls(self):
+        """
+        Get (call node, callee name, positional arguments) of the calls with positional arguments.
+        """
+        calls = get_node_index(tree=self.tree).calls
+        count(counter="calls_checked", value=len(calls))
+        for call in calls:
+            args_ = [arg for arg in call.args if not isinstance(arg, (ast.Starred, ast.JoinedStr))]
+            if not args_:
+                continue
+
+            # Excluded by the callee own path, the names of the calls it is chained on are not the callee.
+            if self.exclude_functions.match(name=resolve_callee_path(func=call.func)):
+                continue
+
+            if self.resolver and keywords_optional(
+                signatures=self.resolver.resolve(call=call),
+                positional_args=len(call.args),
+                min_params=self.min_params,
+            ):
+                continue
+
+            yield call, self.callee_name(call=call), args_
+
+    def run(self):
+        """
+        Get (line, column, message) of the calls with positional arguments.
+        """
+        for call, name, args_ in self.iter_reported_calls():
+            yield call.lineno, call.col_offset, FCN001.format(f_name=name, values=self._get_values(args_=args_))
@@ -0,0 +1,265 @@
+"""
+Rewrite the positional arguments of the calls FCN reports as keywords arguments.
+
+Calls are found by the FCN engine and their callee is resolved like FCN does (module definitions and imports of
+the file), a call is fixed only when its parameters names are known for sure:
+- the callee is defined in the module or imported from a project module (a function, a class or a function of an
+  imported module), or a `self.`/`cls.` method of the enclosing class or a `super().` method of its single base,
+- all the signatures of the callee agree on the names of the parameters the arguments go to,
+- no argument goes to `*args` and no argument is unpacked (`*values`).
+Arguments in positional only slots are kept positional.
+Edits are `name=` insertions at the first token of the arguments, so formatting and comments are kept, each file
+is read and written once with all its edits applied in one pass.
+"""
+
+import ast
+import bisect
+import difflib
+import io
+import os
+import tokenize
+
+from FunctionCallForceNames.engine import CallsChecker
+from FunctionCallForceNames.signatures import (
+    CalleeResolver,
+    SignatureIndex,
+    extract_file_signatures,
+    get_signature_index,
+    merge_signatures,
+)
+from PluginsUtils.files import iter_python_files
+from PluginsUtils.git import get_tracked_blobs, is_git_repository
+from PluginsUtils.parallel import parallel_imap, parallel_map
+
+# Set before the files are processed, inherited by the forked workers.
+FIXER = None
+
+# Tokens which are not code.
+SKIP_TOKENS = frozenset((
+    tokenize.NL,
+    tokenize.NEWLINE,
+    tokenize.COMMENT,
+    tokenize.INDENT,
+    tokenize.DEDENT,
+    tokenize.ENDMARKER,
+))
+
+
+class Tokens:
+    """
+    The code tokens of a source, searchable by position.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.tokens = [
+            token for token in tokenize.generate_tokens(readline=iter(lines).__next__) if token.type not in SKIP_TOKENS
+        ]
+        self.starts = [token.start for token in self.tokens]
+
+    def position(self, lineno, col_offset):
+        # AST columns are UTF-8 bytes offsets, tokens columns are characters offsets.
+        line = self.lines[lineno - 1]
+        return lineno, len(line.encode()[:col_offset].decode(errors="ignore"))
+
+    def index_at(self, lineno, col_offset):
+        """
+        Get the index of the first token at or after an AST position.
+        """
+        return bisect.bisect_left(a=self.starts, x=self.position(lineno=lineno, col_offset=col_offset))
+
+    def get(self, index):
+        return self.tokens[index] if index < len(self.tokens) else None
+
+
+class CallsFixer:
+    """
+    Compute and apply the edits of the calls FCN reports in a source.
+    """
+
+    def __init__(self, signatures, exclude_functions, min_params=0, dry_run=False):
+        self.signatures = signatures
+        self.exclude_functions = exclude_functions
+        self.min_params = min_params
+        self.dry_run = dry_run
+
+    def get_keywords(self, call, resolver):
+        """
+        Get the parameters names of the call arguments (None for positional only slots), None if it can't be fixed.
+        """
+        if any(isinstance(arg, ast.Starred) for arg in call.args):
+            return None
+
+        signatures = resolver.resolve(call=call)
+        if not signatures:
+            return None
+
+        candidates = set()
+        for positional, posonly, _, _, _, names in signatures:
+            if len(call.args) > positional:
+                return None
+
+            candidates.add((posonly, names[posonly : len(call.args)]))
+
+        if len(candidates) != 1:
+            return None
+
+        posonly, names = candidates.pop()
+        if not names or {keyword.arg for keyword in call.keywords}.intersection(names):
+            return None
+
+        return [None] * posonly + list(names)
+
+    def _argument_start(self, call, index, tokens):
+        """
+        Get the position of the first token of an argument, from the `(` or `,` before it, None if not found.
+        """
+        if index:
+            previous = call.args[index - 1]
+            token_index = tokens.index_at(lineno=previous.end_lineno, col_offset=previous.end_col_offset)
+            # Only closing parentheses of the previous argument until its comma.
+            while (token := tokens.get(index=token_index)) is not None and token.string == ")":
+                token_index += 1
+
+            separator = ","
+        else:
+            token_index = tokens.index_at(lineno=call.func.end_lineno, col_offset=call.func.end_col_offset)
+            separator = "("
+
+        token = tokens.get(index=token_index)
+        if token is None or token.type != tokenize.OP or token.string != separator:
+            return None
+
+        start = tokens.get(index=token_index + 1)
+        arg = call.args[index]
+        if start is None or start.start > tokens.position(lineno=arg.lineno, col_offset=arg.col_offset):
+            return None
+
+        # `f(x for x in y)` and `f(y := 1)` need parentheses to be keywords arguments.
+        if isinstance(arg, (ast.GeneratorExp, ast.NamedExpr)) and start.string != "(":
+            return None
+
+        return start.start
+
+    def get_call_edits(self, call, resolver, tokens):
+        keywords = self.get_keywords(call=call, resolver=resolver)
+        if not keywords:
+            return []
+
+        edits = []
+        for index, keyword in enumerate(keywords):
+            if keyword is None:
+                continue
+
+            start = self._argument_start(call=call, index=index, tokens=tokens)
+            if start is None:
+                return []
+
+            edits.append((start, f"{keyword}="))
+
+        return edits
+
+    def fix_source(self, source, filename=None):
+        """
+        Get the fixed source and the number of fixed calls, relative imports are resolved from filename.
+        """
+        lines = io.StringIO(initial_value=source, newline="").readlines()
+        try:
+            tree = ast.parse(source)
+            tokens = Tokens(lines=lines)
+        except (SyntaxError, ValueError, tokenize.TokenError):
+            return source, 0
+
+        checker = CallsChecker(
+            tree=tree,
+            exclude_functions=self.exclude_functions,
+            signatures=self.signatures,
+            min_params=self.min_params,
+            filename=filename,
+        )
+        resolver = checker.resolver or CalleeResolver(tree=tree, index=self.signatures, filename=filename)
+        edits, calls = [], 0
+        for call, _, _ in checker.iter_reported_calls():
+            call_edits = self.get_call_edits(call=call, resolver=resolver, tokens=tokens)
+            if call_edits:
+                edits.extend(call_edits)
+                calls += 1
+
+        # From the end, so the positions of the edits not applied yet don't move.
+        for (row, col), text in sorted(edits, reverse=True):
+            lines[row - 1] = f"{lines[row - 1][:col]}{text}{lines[row - 1][col:]}"
+
+        return "".join(lines), calls
+
+    def fix_file(self, filename):
+        """
+        Get (filename, diff, number of fixed calls) of a file, the file is rewritten unless in dry run.
+        """
+        with open(filename, "rb") as fd:
+            data = fd.read()
+
+        try:
+            encoding, _ = tokenize.detect_encoding(readline=io.BytesIO(initial_bytes=data).readline)
+            source = data.decode(encoding)
+        except (SyntaxError, UnicodeDecodeError):
+            return filename, "", 0
+
+        fixed, calls = self.fix_source(source=source, filename=filename)
+        if not calls:
+            return filename, "", 0
+
+        if self.dry_run:
+            diff = "".join(
+                difflib.unified_diff(
+                    a=source.splitlines(keepends=True),
+                    b=fixed.splitlines(keepends=True),
+                    fromfile=filename,
+                    tofile=filename,
+                )
+            )
+            return filename, diff, calls
+
+        with open(filename, "wb") as fd:
+            fd.write(fixed.encode(encoding))
+
+        return filename, "", calls
+
+
+def _fix_file(filename):
+    return FIXER.fix_file(filename=filename)
+
+
+def get_fix_signatures(filenames):
+    """
+    Get the signatures index of the project plus the signatures of the files to fix which are not tracked.
+    """
+    tracked = set()
+    signatures = {}
+    if is_git_repository():
+        tracked = {os.path.abspath(filename) for filename in get_tracked_blobs()}
+        signatures = get_signature_index().signatures
+
+    untracked = [filename for filename in filenames if os.path.abspath(filename) not in tracked]
+    return SignatureIndex(
+        signatures=merge_signatures(
+            fragments=[signatures, *parallel_map(func=extract_file_signatures, items=untracked)]
+        )
+    )
+
+
+def fix(paths, exclude_functions, min_params=0, dry_run=False, processes=None):
+    """
+    Fix the python files of paths, yield (filename, diff, number of fixed calls) of the fixed files.
+    """
+    global FIXER
+
+    filenames = list(iter_python_files(paths=paths))
+    FIXER = CallsFixer(
+        signatures=get_fix_signatures(filenames=filenames),
+        exclude_functions=exclude_functions,
+        min_params=min_params,
+        dry_run=dry_run,
+    )
+    for filename, diff, calls in parallel_imap(func=_fix_file, items=filenames, processes=processes):
+        if calls:
+            yield filename, diff, calls
@@ -0,0 +1,108 @@
+"""
+Compiled matcher of the functions excluded from FCN checks.
+
+Plain names are kept in a frozenset, a name is excluded if it or one of its dotted parts is in it.
+Dotted entries (`module.sub`) are kept in a trie and exclude the names they are a prefix of (`module.sub.func`).
+Entries with glob characters (`assert_*`, `mock.*.call_*`) are matched with fnmatch, against the name and its parts
+for plain patterns and part by part in the trie for dotted ones.
+Decisions are memoized per name, the same callees are looked up for every call.
+"""
+
+import fnmatch
+
+GLOB_CHARS = frozenset("*?[")
+
+
+def is_glob(entry):
+    return not GLOB_CHARS.isdisjoint(entry)
+
+
+class _TrieNode:
+    def __init__(self):
+        self.children = {}
+        self.patterns = []
+        self.terminal = False
+
+    def child(self, part):
+        if is_glob(entry=part):
+            for pattern, node in self.patterns:
+                if pattern == part:
+                    return node
+
+            node = _TrieNode()
+            self.patterns.append((part, node))
+            return node
+
+        return self.children.setdefault(part, _TrieNode())
+
+
+class ExcludeMatcher:
+    """
+    Match callee names against the excluded functions entries.
+    """
+
+    def __init__(self, entries):
+        names, patterns = set(), []
+        self.trie = _TrieNode()
+        for entry in entries:
+            entry = entry.strip()
+            if not entry:
+                continue
+
+            if "." in entry:
+                node = self.trie
+                for part in entry.split("."):
+                    node = node.child(part=part)
+
+                node.terminal = True
+
+            elif is_glob(entry=entry):
+                patterns.append(entry)
+
+            else:
+                names.add(entry)
+
+        self.names = frozenset(names)
+        self.patterns = tuple(patterns)
+        self._memo = {}
+
+    def __contains__(self, name):
+        return self.match(name=name)
+
+    def match(self, name):
+        if not isinstance(name, str):
+            return False
+
+        excluded = self._memo.get(name)
+        if excluded is None:
+            excluded = self._memo[name] = self._match(name=name)
+
+        return excluded
+
+    def _match_part(self, part):
+        return part in self.names or any(fnmatch.fnmatchcase(name=part, pat=pattern) for pattern in self.patterns)
+
+    def _match(self, name):
+        parts = name.split(".")
+        if name in self.names or any(self._match_part(part=part) for part in parts):
+            return True
+
+        return self._match_trie(node=self.trie, parts=parts)
+
+    def _match_trie(self, node, parts):
+        if node.terminal:
+            return True
+
+        if not parts:
+            return False
+
+        part, rest = parts[0], parts[1:]
+        child = node.children.get(part)
+        if child and self._match_trie(node=child, parts=rest):
+            return True
+
+        return any(
+            self._match_trie(node=child, parts=rest)
+            for pattern, child in node.patterns
+            if fnmatch.fnmatchcase(name=part, pat=pattern)
+        )
@@ -0,0 +1,344 @@
+"""
+Project functions and methods signatures index for FCN.
+
+Every tracked python file is parsed into module qualified name -> signatures of the functions, classes (their
+`__init__`) and classes methods it defines (`pkg.mod.func`, `pkg.mod.Klass`, `pkg.mod.Klass.method`).
+A signature is (positional parameters, positional only, keyword only, *args, **kwargs, positional parameters
+names), without self/cls for methods.
+A callee is resolved from the definitions of its module and its import records, a name which is not defined in
+the module nor imported from a project module has no signatures, so it is always checked.
+Files signatures are cached by file path and git blob SHA and the merged index by the SHAs of the whole tree,
+a warm run only loads the index and checks are dictionary lookups.
+"""
+
+import ast
+import hashlib
+import os
+
+from PluginsUtils.cache import dump_pickle, file_lock, get_project_cache_dir, load_pickle
+from PluginsUtils.git import get_tracked_blobs, is_git_repository
+from PluginsUtils.imports import extract_import_records, module_name
+from PluginsUtils.metrics import count
+from PluginsUtils.nodes import DEFS, get_node_index
+from PluginsUtils.parallel import parallel_map
+
+SIGNATURES_VERSION = 3
+SIGNATURES = None
+
+
+def _is_staticmethod(func):
+    return any(getattr(deco, "id", None) == "staticmethod" for deco in func.decorator_list)
+
+
+def get_signature(args, method=False):
+    """
+    Get the signature of a function arguments, without the first (self/cls) parameter for methods.
+    """
+    positional = [*args.posonlyargs, *args.args]
+    posonly = len(args.posonlyargs)
+    if method and positional:
+        positional = positional[1:]
+        posonly = max(posonly - 1, 0)
+
+    return (
+        len(positional),
+        posonly,
+        len(args.kwonlyargs),
+        args.vararg is not None,
+        args.kwarg is not None,
+        tuple(arg.arg for arg in positional),
+    )
+
+
+def extract_signatures(tree, module=None):
+    """
+    Get qualified name -> signatures of the module level functions, classes (from `__init__`) and classes methods,
+    names are qualified by module if given (`func`, `Klass`, `Klass.method` otherwise).
+    """
+    prefix = f"{module}." if module else ""
+    signatures = {}
+    for elm in tree.body:
+        if isinstance(elm, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            signatures.setdefault(f"{prefix}{elm.name}", set()).add(get_signature(args=elm.args))
+
+        elif isinstance(elm, ast.ClassDef):
+            for item in elm.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    signature = get_signature(args=item.args, method=not _is_staticmethod(func=item))
+                    signatures.setdefault(f"{prefix}{elm.name}.{item.name}", set()).add(signature)
+                    if item.name == "__init__":
+                        signatures.setdefault(f"{prefix}{elm.name}", set()).add(signature)
+
+    return {name: frozenset(_signatures) for name, _signatures in signatures.items()}
+
+
+def extract_file_signatures(filename):
+    try:
+        with open(filename, "rb") as fd:
+            tree = ast.parse(fd.read(), filename=filename)
+
+    except (OSError, SyntaxError, ValueError):
+        return {}
+
+    return extract_signatures(tree=tree, module=module_name(filename=filename))
+
+
+class SignatureIndex:
+    """
+    Lookup of the project signatures by qualified name.
+
+    A module is also found by its dotted suffixes (`utils.func` for `tests.utils.func`), for imports relative to a
+    directory on sys.path (`import utils` from `tests/test_a.py`), a suffix of several project names is ambiguous
+    and has no signatures.
+    """
+
+    def __init__(self, signatures):
+        self.signatures = signatures
+        suffixes = {}
+        for name in signatures:
+            parts = name.split(".")
+            for index in range(1, len(parts) - 1):
+                suffixes.setdefault(".".join(parts[index:]), set()).add(name)
+
+        self.suffixes = {
+            suffix: names.pop() for suffix, names in suffixes.items() if len(names) == 1 and suffix not in signatures
+        }
+
+    def __bool__(self):
+        return bool(self.signatures)
+
+    def get(self, name):
+        """
+        Get the signatures of a qualified name, None if it is not a project callee or is ambiguous.
+        """
+        if name in self.signatures:
+            return self.signatures[name]
+
+        suffix_name = self.suffixes.get(name)
+        return self.signatures[suffix_name] if suffix_name else None
+
+
+class CalleeResolver:
+    """
+    Resolve the callees of a module to their signatures.
+
+    Names defined in the module are looked up in its own signatures, imported names in the index through the
+    module import records (relative imports only with a filename). `self.`/`cls.` methods are looked up in the
+    enclosing class, `super().` methods in the single base of the enclosing class. Anything else (builtins,
+    parameters, star imports, attributes of objects) is not resolved.
+    """
+
+    def __init__(self, tree, index, filename=None):
+        self.tree = tree
+        self.index = index
+        self.local = extract_signatures(tree=tree)
+        self.defs = {elm.name for elm in tree.body if isinstance(elm, (ast.FunctionDef, ast.AsyncFunctionDef))}
+        self.classes = {elm.name: elm for elm in tree.body if isinstance(elm, ast.ClassDef)}
+        # id(function) -> names local to the function (parameters and assigned names)
+        self._locals = {}
+        # name -> imported qualified name
+        self.bindings = {}
+        for record in extract_import_records(tree=tree, filename=filename or "."):
+            if record.dynamic or not record.module or record.name == "*" or (record.level and not filename):
+                continue
+
+            if record.name is None:
+                # `import a.b` binds `a`, `import a.b as c` binds `c` to `a.b`.
+                root = record.module if record.asname else record.module.split(".")[0]
+                self.bindings[record.asname or root] = root
+
+            else:
+                self.bindings[record.asname or record.name] = record.target
+
+    def _qualified(self, name, rest=()):
+        """
+        Get the signatures of name (a module level name) followed by the rest attributes.
+        """
+        attributes = "".join(f".{part}" for part in rest)
+        if name in self.defs or name in self.classes:
+            return self.local.get(f"{name}{attributes}")
+
+        if name in self.bindings:
+            return self.index.get(f"{self.bindings[name]}{attributes}")
+
+        return None
+
+    def _function_locals(self, func):
+        key = id(func)
+        if key not in self._locals:
+            args = func.args
+            names = {
+                arg.arg for arg in (*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg) if arg
+            }
+            for node in ast.walk(func):
+                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                    names.add(node.id)
+
+                elif isinstance(node, DEFS) and node is not func:
+                    names.add(node.name)
+
+            self._locals[key] = names
+
+        return self._locals[key]
+
+    def _is_local(self, name, node):
+        """
+        Check if name is a local name (parameter, assigned name) of a function node is in, not a module level name.
+        """
+        index = get_node_index(tree=self.tree)
+        scope = index.scope(node=node)
+        while scope is not self.tree:
+            if isinstance(scope, (ast.FunctionDef, ast.AsyncFunctionDef)) and name in self._function_locals(func=scope):
+                return True
+
+            scope = index.scope(node=scope)
+
+        return False
+
+    def _enclosing_class(self, node):
+        index = get_node_index(tree=self.tree)
+        scope = index.scope(node=node)
+        while scope is not self.tree and not isinstance(scope, ast.ClassDef):
+            scope = index.scope(node=scope)
+
+        return None if scope is self.tree else scope
+
+    def resolve(self, call):
+        """
+        Get the signatures of the callee of a call, None if it can't be known for sure.
+        """
+        func = call.func
+        parts = []
+        while isinstance(func, ast.Attribute):
+            parts.append(func.attr)
+            func = func.value
+
+        parts.reverse()
+        if isinstance(func, ast.Name):
+            if func.id in ("self", "cls") and len(parts) == 1:
+                klass = self._enclosing_class(node=call)
+                # Only classes of the module level, a method inherited from a base class is not resolved.
+                if klass is None or self.classes.get(klass.name) is not klass:
+                    return None
+
+                return self.local.get(f"{klass.name}.{parts[0]}")
+
+            if self._is_local(name=func.id, node=call):
+                return None
+
+            return self._qualified(name=func.id, rest=parts)
+
+        if isinstance(func, ast.Call) and getattr(func.func, "id", None) == "super" and len(parts) == 1:
+            klass = self._enclosing_class(node=call)
+            if klass is None or len(klass.bases) != 1:
+                return None
+
+            base = klass.bases[0]
+            base_parts = []
+            while isinstance(base, ast.Attribute):
+                base_parts.append(base.attr)
+                base = base.value
+
+            if not isinstance(base, ast.Name):
+                return None
+
+            return self._qualified(name=base.id, rest=[*reversed(base_parts), parts[0]])
+
+        return None
+
+
+def keywords_required(signature, positional_args, min_params):
+    """
+    Check if a call with positional_args positional arguments to a callee with signature must use keywords.
+
+    Arguments in positional only slots can't be passed as keywords, callees which take min_params parameters or
+    less don't require keywords.
+    """
+    positional, posonly, kwonly, *_ = signature
+    if positional_args <= posonly:
+        return False
+
+    return positional + kwonly > min_params
+
+
+def keywords_optional(signatures, positional_args, min_params):
+    """
+    Check if a call to a callee with signatures (None for a callee which is not resolved to a project callee) can
+    skip keywords: none of its signatures require keywords.
+    """
+    if not signatures:
+        return False
+
+    return not any(
+        keywords_required(signature=signature, positional_args=positional_args, min_params=min_params)
+        for signature in signatures
+    )
+
+
+def merge_signatures(fragments):
+    """
+    Merge files signatures, a qualified name defined in several places gets all their signatures.
+    """
+    index = {}
+    for signatures in fragments:
+        for name, _signatures in signatures.items():
+            index[name] = index.get(name, frozenset()) | _signatures
+
+    return index
+
+
+def update_signature_index(index_dir):
+    """
+    Get the project signatures, parsing only files which changed since the last run.
+    """
+    index_path = os.path.join(index_dir, "fcn-signatures-index.pickle")
+    files_path = os.path.join(index_dir, "fcn-signatures-files.pickle")
+    tracked = {filename: sha for filename, sha in get_tracked_blobs().items() if filename.endswith(".py")}
+    key = hashlib.sha1(string=repr((SIGNATURES_VERSION, sorted(tracked.items()))).encode()).hexdigest()
+
+    with file_lock(path=os.path.join(index_dir, "fcn-signatures.lock")):
+        cached = load_pickle(path=index_path, default={})
+        if cached.get("key") == key:
+            count(counter="cache_hits")
+            return cached["index"]
+
+        count(counter="cache_misses")
+
+        files = load_pickle(path=files_path, default={})
+        if files.get("version") != SIGNATURES_VERSION:
+            files = {"version": SIGNATURES_VERSION, "files": {}}
+
+        # Signatures are module qualified, they are cached by path and content.
+        cached_files = files["files"]
+        missing = [file_key for file_key in tracked.items() if file_key not in cached_files]
+        for file_key, signatures in zip(
+            missing, parallel_map(func=extract_file_signatures, items=[filename for filename, _ in missing])
+        ):
+            cached_files[file_key] = signatures
+
+        used_files = set(tracked.items())
+        files["files"] = {
+            file_key: signatures for file_key, signatures in cached_files.items() if file_key in used_files
+        }
+        index = merge_signatures(fragments=files["files"].values())
+
+        if missing:
+            dump_pickle(path=files_path, obj=files)
+
+        dump_pickle(path=index_path, obj={"key": key, "index": index})
+
+    return index
+
+
+def get_signature_index():
+    """
+    Get the project SignatureIndex, loaded once per process, empty out of a git repository.
+    """
+    global SIGNATURES
+
+    if SIGNATURES is None:
+        SIGNATURES = SignatureIndex(
+            signatures=update_signature_index(index_dir=get_project_cache_dir()) if is_git_repository() else {}
+        )
+
+    return SIGNATURES
@@ -0,0 +1,83 @@
+import re
+from subprocess import PIPE, Popen
+
+engine_content = """
+import helpers
+
+
+@helpers.decorate(1)
+def function(value):
+    if value:
+        helpers.in_body(1)
+    else:
+        helpers.in_orelse(2)
+
+    try:
+        helpers.in_try(3)
+    except ValueError:
+        helpers.in_handler(4)
+    finally:
+        helpers.in_finalbody(5)
+
+    match value:
+        case 1:
+            helpers.in_match(6)
+
+    callback = lambda: helpers.in_lambda(7)
+    values = [helpers.in_comprehension(item) for item in value]
+    helpers.outer(helpers.nested(8))
+    helpers.group_map.get(value, helpers)._add_action(value)
+    return callback, values
+"""
+
+
+def check_engine(cwd, engine):
+    out, _ = Popen(
+        args=["flake8", "--enable-extensions=FCN", "--select=FCN", f"--fcn_engine={engine}", "module.py"],
+        stdout=PIPE,
+        stderr=PIPE,
+        cwd=str(cwd),
+    ).communicate()
+    return out.decode("utf-8")
+
+
+def test_visitor_engine_finds_all_calls(tmpdir):
+    tmpdir.join("module.py").write(engine_content)
+
+    out = check_engine(cwd=tmpdir, engine="visitor")
+    reported = re.findall(r"^module\.py:(\d+):\d+: FCN001: \[(\S+)\]", out, flags=re.MULTILINE)
+    # Calls in decorators, else branches, handlers, finally blocks, match cases, lambdas, comprehensions and nested
+    # calls, a call chained on an excluded call (`get`) is checked.
+    assert reported == [
+        ("5", "helpers.decorate"),
+        ("8", "helpers.in_body"),
+        ("10", "helpers.in_orelse"),
+        ("13", "helpers.in_try"),
+        ("15", "helpers.in_handler"),
+        ("17", "helpers.in_finalbody"),
+        ("21", "helpers.in_match"),
+        ("23", "helpers.in_lambda"),
+        ("24", "helpers.in_comprehension"),
+        ("25", "helpers.outer"),
+        ("25", "helpers.nested"),
+        ("26", "get._add_action"),
+    ]
+
+
+def test_legacy_engine_findings(tmpdir):
+    tmpdir.join("module.py").write(engine_content)
+
+    # The findings of the statements level check, before the visitor engine.
+    out = check_engine(cwd=tmpdir, engine="legacy")
+    reported = re.findall(
+        r"^module\.py:(\d+):(\d+): FCN001: \[(\S+)\] function should be called with keywords arguments\. (.*)$",
+        out,
+        flags=re.MULTILINE,
+    )
+    assert reported == [
+        ("8", "9", "helpers", "value: None (line:8 column:24)"),
+        ("10", "9", "helpers", "value: None (line:10 column:26)"),
+        ("13", "9", "helpers", "value: None (line:13 column:23)"),
+        ("25", "5", "helpers", "value: nested (line:25 column:18)"),
+        ("26", "5", "group_map", "value: value (line:26 column:54)"),
+    ]
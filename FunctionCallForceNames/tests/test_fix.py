@@ -0,0 +1,177 @@
+from subprocess import PIPE, Popen
+
+fix_content = """
+import os
+import helpers as hp
+
+
+def add_numbers(first, second):
+    return first + second
+
+
+def only_positional(a, b, /, c):
+    return a, b, c
+
+
+def with_args(a, *rest):
+    return a, rest
+
+
+class Klass:
+    def __init__(self, value, other=None):
+        self.value = value
+
+    def method(self, x, y):
+        return self.other(x, y)  # the comment is kept
+
+    def other(self, x, y):
+        return x, y
+
+
+total = add_numbers(
+    1,  # the first
+    (2 + 3),
+)
+only_positional(1, 2, 3)
+with_args(1, 2)
+with_args(1)
+Klass(add_numbers(1, 2)).method(1, 2)
+hp.helper_func("é", 2)
+os.path.join("a", "b")
+unknown(1)
+add_numbers(*[1, 2])
+sum(x for x in [1, 2])
+with_args(x for x in [1, 2])
+with_args((x for x in [1, 2]))
+"""
+
+fixed_content = """
+import os
+import helpers as hp
+
+
+def add_numbers(first, second):
+    return first + second
+
+
+def only_positional(a, b, /, c):
+    return a, b, c
+
+
+def with_args(a, *rest):
+    return a, rest
+
+
+class Klass:
+    def __init__(self, value, other=None):
+        self.value = value
+
+    def method(self, x, y):
+        return self.other(x=x, y=y)  # the comment is kept
+
+    def other(self, x, y):
+        return x, y
+
+
+total = add_numbers(
+    first=1,  # the first
+    second=(2 + 3),
+)
+only_positional(1, 2, c=3)
+with_args(1, 2)
+with_args(a=1)
+Klass(value=add_numbers(first=1, second=2)).method(1, 2)
+hp.helper_func(a="é", b=2)
+os.path.join("a", "b")
+unknown(1)
+add_numbers(*[1, 2])
+sum(x for x in [1, 2])
+with_args(x for x in [1, 2])
+with_args(a=(x for x in [1, 2]))
+"""
+
+helpers_content = """
+def helper_func(a, b):
+    return a, b
+"""
+
+
+def fix_calls(cwd, args):
+    return Popen(
+        args=["python", "-m", "FunctionCallForceNames", *args], stdout=PIPE, stderr=PIPE, cwd=str(cwd)
+    ).communicate()
+
+
+def test_fix_calls(tmpdir):
+    test_file = tmpdir.join("module.py")
+    test_file.write_text(data=fix_content, encoding="utf-8")
+    tmpdir.join("helpers.py").write(helpers_content)
+
+    _, err = fix_calls(cwd=tmpdir, args=["."])
+    assert test_file.read_text(encoding="utf-8") == fixed_content
+    assert err.decode("utf-8") == "Fixed 8 calls in 1 files\n"
+
+
+def test_fix_calls_idempotent(tmpdir):
+    test_file = tmpdir.join("module.py")
+    test_file.write_text(data=fix_content, encoding="utf-8")
+    tmpdir.join("helpers.py").write(helpers_content)
+
+    fix_calls(cwd=tmpdir, args=["."])
+    out, err = fix_calls(cwd=tmpdir, args=["."])
+    assert test_file.read_text(encoding="utf-8") == fixed_content
+    assert not out
+    assert err.decode("utf-8") == "Fixed 0 calls in 0 files\n"
+
+
+def test_fix_calls_diff(tmpdir):
+    test_file = tmpdir.join("module.py")
+    test_file.write_text(data=fix_content, encoding="utf-8")
+    tmpdir.join("helpers.py").write(helpers_content)
+
+    out, err = fix_calls(cwd=tmpdir, args=["--diff", "."])
+    diff = out.decode("utf-8")
+    assert test_file.read_text(encoding="utf-8") == fix_content
+    assert "-        return self.other(x, y)  # the comment is kept" in diff
+    assert "+        return self.other(x=x, y=y)  # the comment is kept" in diff
+    assert "+only_positional(1, 2, c=3)" in diff
+    assert err.decode("utf-8") == "Would fix 8 calls in 1 files\n"
+
+
+shadowing_helpers_content = """
+def loads(data):
+    return data
+
+
+def request(method, url):
+    return method, url
+"""
+
+shadowing_content = """
+from json import loads
+
+from requests import Session
+
+import helpers
+
+
+class Client(Session):
+    def fetch(self):
+        return self.request("GET", "url")
+
+
+loads("{}")
+helpers.loads("{}")
+"""
+
+
+def test_fix_calls_shadowed_names(tmpdir):
+    # Names imported from other modules and methods inherited from other classes are not the project callees of the
+    # same name, only the call to the project function is fixed.
+    test_file = tmpdir.join("module.py")
+    test_file.write(shadowing_content)
+    tmpdir.join("helpers.py").write(shadowing_helpers_content)
+
+    _, err = fix_calls(cwd=tmpdir, args=["."])
+    assert test_file.read() == shadowing_content.replace('helpers.loads("{}")', 'helpers.loads(data="{}")')
+    assert err.decode("utf-8") == "Fixed 1 calls in 1 files\n"
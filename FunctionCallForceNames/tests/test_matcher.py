@@ -0,0 +1,57 @@
+import ast
+
+from FunctionCallForceNames.engine import resolve_callee_path
+from FunctionCallForceNames.matcher import ExcludeMatcher
+
+
+def test_exact_names():
+    matcher = ExcludeMatcher(entries=["print", " log ", ""])
+    assert "print" in matcher
+    assert "log" in matcher
+    # A name is excluded by any of its dotted parts.
+    assert "logger.log" in matcher
+    assert "log.info" in matcher
+    assert "printer" not in matcher
+    assert "" not in matcher
+    assert not matcher.match(name=None)
+
+
+def test_dotted_prefixes():
+    matcher = ExcludeMatcher(entries=["module.sub", "mock.patch.object"])
+    assert "module.sub" in matcher
+    assert "module.sub.func" in matcher
+    assert "module.other" not in matcher
+    assert "sub.func" not in matcher
+    assert "mock.patch.object" in matcher
+    assert "mock.patch" not in matcher
+
+
+def test_glob_patterns():
+    matcher = ExcludeMatcher(entries=["assert_*", "mock.*.call_*"])
+    assert "assert_called" in matcher
+    assert "self.assert_equal" in matcher
+    assert "mock.client.call_count" in matcher
+    assert "mock.client.method" not in matcher
+    assert "other.client.call_count" not in matcher
+    assert "check_assert" not in matcher
+
+
+def test_memoized_decisions():
+    matcher = ExcludeMatcher(entries=["print", "module.sub"])
+    assert matcher.match(name="module.sub.func")
+    assert not matcher.match(name="module.func")
+    assert matcher._memo == {"module.sub.func": True, "module.func": False}
+
+    # Decisions are served from the memo.
+    matcher._memo["module.func"] = True
+    assert matcher.match(name="module.func")
+
+
+def test_chained_call_own_path():
+    # The names of the calls a callee is chained on are not matched, `get` doesn't exclude `_add_action`.
+    matcher = ExcludeMatcher(entries=["get"])
+    call = ast.parse(source="group_map.get(action, self)._add_action(action)").body[0].value
+    assert resolve_callee_path(func=call.func) == "_add_action"
+    assert resolve_callee_path(func=call.func.value.func) == "group_map.get"
+    assert not matcher.match(name=resolve_callee_path(func=call.func))
+    assert matcher.match(name=resolve_callee_path(func=call.func.value.func))
@@ -0,0 +1,79 @@
+import re
+from subprocess import PIPE, Popen, run
+
+helpers_content = """
+def loads(data):
+    return data
+
+
+def fetch(url, params):
+    return url, params
+
+
+class Runner:
+    def __init__(self, first, second):
+        self.first = first
+
+    def execute(self, first, second):
+        return first, second
+
+    def execute_twice(self, first, second):
+        return self.execute(first, second), self.execute(first, second)
+"""
+
+module_content = """
+import json
+from json import loads
+
+import api_client
+
+import helpers
+from helpers import loads as helpers_loads
+from helpers import Runner
+
+
+def project_calls(data):
+    helpers_loads(data)
+    helpers.fetch(data, data)
+    Runner(data, data)
+
+
+def shadowed_calls(data, runner):
+    loads(data)
+    json.loads(data)
+    api_client.fetch(data, data)
+    runner.execute_twice(data, data)
+
+
+def local_name(fetch):
+    fetch(1, 2)
+"""
+
+
+def check_min_params(cwd):
+    run(args=["git", "init", "-q"], cwd=str(cwd), check=True)
+    run(args=["git", "add", "."], cwd=str(cwd), check=True)
+    out, _ = Popen(
+        args=["flake8", "--enable-extensions=FCN", "--select=FCN", "--fcn_min_params=3", "module.py", "helpers.py"],
+        stdout=PIPE,
+        stderr=PIPE,
+        cwd=str(cwd),
+    ).communicate()
+    return out.decode("utf-8")
+
+
+def test_min_params_project_callees(tmpdir):
+    tmpdir.join("helpers.py").write(helpers_content)
+    tmpdir.join("module.py").write(module_content)
+
+    out = check_min_params(cwd=tmpdir)
+    reported = re.findall(r"^(\S+):(\d+):\d+: FCN001: \[(\S+)\]", out, flags=re.MULTILINE)
+    # Project callees resolved through the imports (and self methods) take 2 parameters, they don't need keywords,
+    # callees with the name of a project callee which are not it are checked.
+    assert reported == [
+        ("module.py", "19", "loads"),
+        ("module.py", "20", "json.loads"),
+        ("module.py", "21", "api_client.fetch"),
+        ("module.py", "22", "runner.execute_twice"),
+        ("module.py", "26", "fetch"),
+    ]
@@ -0,0 +1,57 @@
+import ast
+import inspect
+
+from FunctionCallForceNames import FunctionCallForceNames
+from FunctionCallForceNames.matcher import ExcludeMatcher
+
+with_content = """
+import helpers
+
+
+def function(path):
+    with helpers.opener(path) as first, helpers.locker(path):
+        with helpers.inner(path):
+            helpers.body(path)
+"""
+
+
+def tree_only_plugin(monkeypatch, engine):
+    # The options flake8 sets with parse_options.
+    options = {
+        "engine": engine,
+        "min_params": 0,
+        "result_options": (engine, ()),
+        "exclude_functions": ExcludeMatcher(entries=[*__builtins__]),
+    }
+    for name, value in options.items():
+        monkeypatch.setattr(target=FunctionCallForceNames, name=name, value=value, raising=False)
+
+    return FunctionCallForceNames(tree=ast.parse(source=with_content))
+
+
+def test_plugin_takes_only_the_tree():
+    # flake8 passes the plugin the arguments of its signature, the source lines are not read.
+    parameters = inspect.signature(obj=FunctionCallForceNames).parameters
+    assert "tree" in parameters
+    assert "lines" not in parameters
+
+
+def test_with_callees_from_context_expr(monkeypatch):
+    plugin = tree_only_plugin(monkeypatch=monkeypatch, engine="visitor")
+    reported = [(lineno, message.split(" ")[1]) for lineno, _, message, _ in plugin.run()]
+    # All the items of a multi items `with` and the nested `with` items are found.
+    assert reported == [
+        (6, "[helpers.opener]"),
+        (6, "[helpers.locker]"),
+        (7, "[helpers.inner]"),
+        (8, "[helpers.body]"),
+    ]
+
+
+def test_legacy_with_callee_from_context_expr(monkeypatch):
+    plugin = tree_only_plugin(monkeypatch=monkeypatch, engine="legacy")
+    outer = plugin.tree.body[1].body[0]
+    inner = outer.body[0]
+    # The callee of a `with` is its first context_expr call, the nested `with` has its own.
+    assert plugin._get_func_name(elm=outer) == "helpers.opener"
+    assert plugin._get_func_name(elm=inner) == "helpers.inner"
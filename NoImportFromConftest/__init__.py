@@ -2,9 +2,21 @@
 flake8 extension to check import from conftest.py..
 """
 
+from PluginsUtils.imports import get_import_records, iter_import_statements
+from PluginsUtils.metrics import measured
+from PluginsUtils.results import get_file_result
+
 NIC001 = "NIC001: Import from conftest.py is not allowed."
 
 
+def is_conftest_import(record):
+    """
+    Check if a record imports conftest or a name from it (`import conftest`, `from tests.conftest import x`,
+    `from . import conftest`).
+    """
+    return "conftest" in {*(record.target or "").split("."), *record.written.split("."), record.name}
+
+
 class NoImportFromConftest:
     """
     flake8 extension to check import from conftest.py..
@@ -14,20 +26,24 @@ class NoImportFromConftest:
     name = "NoImportFromConftest"
     version = "1.0.0"
 
-    def __init__(self, tree, lines):
+    def __init__(self, tree, filename, lines=None):
         self.tree = tree
+        self.filename = filename
         self.lines = lines
 
+    @measured
     def run(self):
         """
         Check if file import from conftest.py
         """
-        imports = [line for line in self.lines if "conftest" in line and line.startswith(("import", "from"))]
-
-        for _import in imports:
-            yield (
-                self.lines.index(_import) + 1,
-                1,
-                NIC001,
-                self.name,
-            )
+        yield from get_file_result(plugin=self, compute=lambda: list(self._check()))
+
+    def _check(self):
+        for records in iter_import_statements(records=get_import_records(tree=self.tree, filename=self.filename)):
+            if any(is_conftest_import(record=record) for record in records):
+                yield (
+                    records[0].lineno,
+                    records[0].col_offset,
+                    NIC001,
+                    self.name,
+                )
@@ -3,9 +3,21 @@ flake8 extension to check import from conftest.py..
 """
 
 import ast
-import re
+
+from NoImportFromTests.import_graph import (
+    get_import_graph,
+    get_test_chain,
+    is_test_module,
+    module_name,
+    resolve_import,
+)
+from NoImportFromTests.paths import FilePath
+from PluginsUtils.imports import get_import_records, iter_import_statements
+from PluginsUtils.metrics import measured
+from PluginsUtils.results import get_file_result
 
 NIT001 = "NIT001: Import from tests is not allowed."
+NIT002 = "NIT002: Import from tests is not allowed, through {chain}."
 
 
 class NoImportFromTests:
@@ -17,10 +29,11 @@ class NoImportFromTests:
     name = "NoImportFromTests"
     version = "1.0.0"
 
-    def __init__(self, tree, lines, filename):
+    def __init__(self, tree, filename, lines=None):
         self.tree = tree
-        self.lines = lines
         self.filename = filename
+        self.lines = lines
+        self.path = FilePath(filename=filename)
 
     @classmethod
     def add_options(cls, option_manager):
@@ -31,72 +44,92 @@ class NoImportFromTests:
             comma_separated_list=True,
             help="Import to exclude from checking.",
         )
+        option_manager.add_option(
+            long_option_name="--nit_transitive",
+            default="False",
+            parse_from_config=True,
+            help="Report (NIT002) non test modules which import tests through other modules, from the project "
+            "import graph.",
+        )
 
     @classmethod
     def parse_options(cls, options):
-        cls.exclude_imports = options.nit_exclude_imports
+        cls.exclude_imports = frozenset(options.nit_exclude_imports)
+        cls.transitive = ast.literal_eval(options.nit_transitive)
 
-    @staticmethod
-    def _is_import(_import):
-        if isinstance(_import, (ast.Import, ast.ImportFrom)):
-            return _import
+    def _import_in_exclude(self, imports):
+        return not self.exclude_imports.isdisjoint(imports)
 
-    def _all_imports(self):
-        for _import in self.tree.body:
-            if self._is_import(_import=_import):
-                yield _import
+    def _is_import_from_tests(self, import_name):
+        base_import_path, _, import_from = import_name.partition(".")
+        import_from = import_from.split(".", 1)[0]
+        if self._import_in_exclude(imports=(import_name, import_from) if import_from else (import_name,)):
+            return False
 
-    def _import_in_exclude(self, imports):
-        return any(_imp for _imp in imports if _imp in self.exclude_imports)
+        base_file_name_path = self.path.component_after(root=base_import_path)
+        if base_file_name_path is None:
+            return False
 
-    def run(self):
+        if import_name.rpartition(".")[2].startswith("test_") or base_import_path == "tests":
+            return not import_from or import_from != base_file_name_path
+
+        return False
+
+    def _test_chain(self, records, graph):
         """
-        Check if file import from tests
+        Get the shortest chain from the modules imported by a statement to a test module, [] if they reach none.
         """
-        for _import in self._all_imports():
-            import_name = None
-            if isinstance(_import, ast.ImportFrom):
-                import_name = _import.module
-                if not import_name:
-                    import_name = _import.names[-1].name
-            elif isinstance(_import, ast.Import):
-                import_name = _import.names[-1].name
-
-            split_import_name = import_name.split(".")
-            _base_import_path = split_import_name[0]
-            import_from = split_import_name[1:]
-            _imports_to_check_for_excluding = [import_name]
-            if import_from:
-                _imports_to_check_for_excluding.append(import_from[0])
-            if self._import_in_exclude(imports=_imports_to_check_for_excluding):
+        module = module_name(filename=self.filename)
+        chains = []
+        for record in records:
+            if self._import_in_exclude(imports=[record.target, record.module]):
                 continue
 
-            split_seq = 1
-            base_import_path = re.findall(rf"/{_base_import_path}/", self.filename)
-            if not base_import_path:
-                split_seq = 1
-                base_import_path = re.findall(rf"^{_base_import_path}/", self.filename)
+            imported = resolve_import(name=record.target, modules=graph["modules"]) if record.module else None
+            if imported and imported != module:
+                chain = get_test_chain(module=imported, graph=graph)
+                if chain:
+                    chains.append(chain)
 
-            if not base_import_path:
-                continue
+        return min(chains, key=len, default=[])
 
-            base_import_path = base_import_path[0]
-            _base_file_name_path = self.filename.split(f"{base_import_path}", split_seq)[-1].split("/")
-            base_file_name_path = list(filter(lambda x: x, _base_file_name_path))
-            import_name_end = import_name.split(".")[-1]
-            if import_name_end.startswith("test_") or _base_import_path == "tests":
-                if import_from and base_file_name_path:
-                    if import_from[0] != base_file_name_path[0]:
-                        yield (
-                            _import.lineno,
-                            _import.col_offset,
-                            NIT001,
-                            self.name,
-                        )
-                else:
+    @measured
+    def run(self):
+        """
+        Check if file import from tests
+        """
+        yield from get_file_result(
+            plugin=self, compute=lambda: list(self._check_imports()), options=sorted(self.exclude_imports)
+        )
+        # Transitive imports depend on the whole project, they are not cached.
+        if self.transitive and not is_test_module(module=module_name(filename=self.filename)):
+            yield from self._check_transitive_imports()
+
+    def _iter_statements(self):
+        return iter_import_statements(records=get_import_records(tree=self.tree, filename=self.filename))
+
+    def _check_imports(self):
+        for records in self._iter_statements():
+            for record in records:
+                # The module of `from a import b`, the name of a relative import above the top level package.
+                import_name = record.module or record.written.lstrip(".") or record.name
+                if self._is_import_from_tests(import_name=import_name):
                     yield (
-                        _import.lineno,
-                        _import.col_offset,
+                        records[0].lineno,
+                        records[0].col_offset,
                         NIT001,
                         self.name,
                     )
+                    break
+
+    def _check_transitive_imports(self):
+        graph = get_import_graph()
+        for records in self._iter_statements():
+            chain = self._test_chain(records=records, graph=graph)
+            if chain:
+                yield (
+                    records[0].lineno,
+                    records[0].col_offset,
+                    NIT002.format(chain=" -> ".join(chain)),
+                    self.name,
+                )
@@ -0,0 +1,167 @@
+"""
+Project modules import graph for NoImportFromTests.
+
+Every tracked python file is parsed into the names it imports (from the shared import records), cached by file
+path and git blob SHA. Imported names are resolved to project modules (the longest dotted prefix which is a
+project module) and the resolved edges are cached as well, they are resolved again only for changed files, or
+for all files when files are added or removed.
+From the graph, a breadth first search from the test modules over the reversed edges gives for every production
+module which reaches a test module the next module of its shortest chain to it. The result is cached by the SHAs
+of the whole tree, a warm run only loads it.
+"""
+
+import ast
+import collections
+import hashlib
+import os
+
+from PluginsUtils.cache import dump_pickle, file_lock, get_project_cache_dir, load_pickle
+from PluginsUtils.git import get_tracked_blobs, is_git_repository
+from PluginsUtils.imports import extract_import_records, module_name
+from PluginsUtils.metrics import count
+from PluginsUtils.parallel import parallel_map
+
+IMPORT_GRAPH_VERSION = 1
+IMPORT_GRAPH = None
+
+
+def is_test_module(module):
+    parts = module.split(".")
+    return parts[0] == "tests" or parts[-1].startswith("test_")
+
+
+def iter_imported_names(records):
+    for record in records:
+        if record.module:
+            yield record.target
+
+
+def extract_file_imports(filename):
+    try:
+        with open(filename, "rb") as fd:
+            tree = ast.parse(fd.read(), filename=filename)
+
+    except (OSError, SyntaxError, ValueError):
+        return frozenset()
+
+    return frozenset(iter_imported_names(records=extract_import_records(tree=tree, filename=filename)))
+
+
+def resolve_import(name, modules):
+    """
+    Get the project module of an imported name, the longest prefix of it which is a module, None if it is not
+    a project module.
+    """
+    parts = name.split(".")
+    for index in range(len(parts), 0, -1):
+        module = ".".join(parts[:index])
+        if module in modules:
+            return module
+
+    return None
+
+
+def get_test_routes(edges):
+    """
+    Get module -> next module of its shortest import chain to a test module, for the modules which reach one
+    (None for the test modules).
+    """
+    importers = {}
+    for module, imported in edges.items():
+        for imported_module in imported:
+            importers.setdefault(imported_module, set()).add(module)
+
+    routes = {module: None for module in edges if is_test_module(module=module)}
+    queue = collections.deque(iterable=sorted(routes))
+    while queue:
+        module = queue.popleft()
+        for importer in sorted(importers.get(module, ())):
+            if importer not in routes:
+                routes[importer] = module
+                queue.append(importer)
+
+    return routes
+
+
+def update_import_graph(index_dir):
+    """
+    Get the project modules and test routes, parsing only files which changed since the last run.
+    """
+    graph_path = os.path.join(index_dir, "nit-import-graph.pickle")
+    imports_path = os.path.join(index_dir, "nit-import-graph-files.pickle")
+    tracked = {filename: sha for filename, sha in get_tracked_blobs().items() if filename.endswith(".py")}
+    key = hashlib.sha1(string=repr((IMPORT_GRAPH_VERSION, sorted(tracked.items()))).encode()).hexdigest()
+
+    with file_lock(path=os.path.join(index_dir, "nit-import-graph.lock")):
+        cached = load_pickle(path=graph_path, default={})
+        if cached.get("key") == key:
+            count(counter="cache_hits")
+            return cached["graph"]
+
+        count(counter="cache_misses")
+
+        files = load_pickle(path=imports_path, default={})
+        if files.get("version") != IMPORT_GRAPH_VERSION:
+            files = {"version": IMPORT_GRAPH_VERSION, "imports": {}, "modules_key": None, "edges": {}}
+
+        # Relative imports are resolved from the file path, a file is cached by path and content.
+        current = {(filename, sha) for filename, sha in tracked.items()}
+        modules = {module_name(filename=filename): (filename, sha) for filename, sha in tracked.items()}
+        imports = files["imports"]
+        missing = [file for file in current if file not in imports]
+        for file, imported in zip(
+            missing, parallel_map(func=extract_file_imports, items=[file[0] for file in missing])
+        ):
+            imports[file] = imported
+
+        modules_key = hashlib.sha1(string=repr(sorted(modules)).encode()).hexdigest()
+        edges = files["edges"] if files["modules_key"] == modules_key else {}
+        for file in current:
+            if file not in edges:
+                resolved = (resolve_import(name=name, modules=modules) for name in imports[file])
+                edges[file] = frozenset(module for module in resolved if module)
+
+        files = {
+            "version": IMPORT_GRAPH_VERSION,
+            "imports": {file: imported for file, imported in imports.items() if file in current},
+            "modules_key": modules_key,
+            "edges": {file: imported for file, imported in edges.items() if file in current},
+        }
+        dump_pickle(path=imports_path, obj=files)
+
+        routes = get_test_routes(edges={module: files["edges"][file] for module, file in modules.items()})
+        graph = {"modules": frozenset(modules), "routes": routes}
+        dump_pickle(path=graph_path, obj={"key": key, "graph": graph})
+
+    return graph
+
+
+def get_import_graph():
+    """
+    Get the project import graph, loaded once per process, empty out of a git repository.
+    """
+    global IMPORT_GRAPH
+
+    if IMPORT_GRAPH is None:
+        IMPORT_GRAPH = (
+            update_import_graph(index_dir=get_project_cache_dir())
+            if is_git_repository()
+            else {"modules": frozenset(), "routes": {}}
+        )
+
+    return IMPORT_GRAPH
+
+
+def get_test_chain(module, graph):
+    """
+    Get the shortest import chain from module to a test module, [] if there is none.
+    """
+    routes = graph["routes"]
+    if module not in routes:
+        return []
+
+    chain = [module]
+    while routes[chain[-1]] is not None:
+        chain.append(routes[chain[-1]])
+
+    return chain
@@ -0,0 +1,65 @@
+"""
+Memoized path components of the checked files directories for NoImportFromTests.
+
+NIT looks for the directory of an import root package (`tests` for `tests.network.utils`) in the checked file
+path and compares the directory after it with the imported sub package.
+Directories are split and indexed once, sibling files share them, so finding a root is a dictionary lookup
+(no regex built from module names).
+"""
+
+# directory -> DirectoryPath
+DIRECTORIES = {}
+
+
+class DirectoryPath:
+    """
+    A directory split to its components, roots maps a component to its first position.
+
+    Like a `/{root}/` search, a component which follows a "/" is preferred to the first component of a relative
+    path.
+    """
+
+    def __init__(self, directory):
+        self.parts = directory.split("/") if directory else []
+        self.roots = {}
+        for index, part in enumerate(self.parts[1:], start=1):
+            self.roots.setdefault(part, index)
+
+        if self.parts:
+            self.roots.setdefault(self.parts[0], 0)
+
+    def component_after(self, root, basename):
+        """
+        Get the path component after the root directory (the file basename if it is the last one), None if the
+        path has no root directory.
+        """
+        index = self.roots.get(root)
+        if index is None:
+            return None
+
+        for part in self.parts[index + 1 :]:
+            if part:
+                return part
+
+        return basename
+
+
+def get_directory_path(directory):
+    directory_path = DIRECTORIES.get(directory)
+    if directory_path is None:
+        directory_path = DIRECTORIES[directory] = DirectoryPath(directory=directory)
+
+    return directory_path
+
+
+class FilePath:
+    """
+    The path of a checked file, split once.
+    """
+
+    def __init__(self, filename):
+        directory, _, self.basename = filename.rpartition("/")
+        self.directory = get_directory_path(directory=directory)
+
+    def component_after(self, root):
+        return self.directory.component_after(root=root, basename=self.basename)
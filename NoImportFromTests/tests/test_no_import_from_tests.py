@@ -0,0 +1,83 @@
+import re
+from subprocess import PIPE, Popen, run
+
+test_storage_content = """
+from tests.network.utils import helper
+from tests.storage.utils import own
+from tests.conftest import shared
+
+from ..network import utils
+from . import utils as storage_utils
+
+
+def test_storage():
+    assert helper() and own() and utils and storage_utils and shared
+"""
+
+project_files = {
+    "tests/__init__.py": "",
+    "tests/conftest.py": "def shared():\n    return 1\n",
+    "tests/network/__init__.py": "",
+    "tests/network/utils.py": "def helper():\n    return 1\n",
+    "tests/storage/__init__.py": "",
+    "tests/storage/utils.py": "def own():\n    return 1\n",
+    "tests/storage/test_storage.py": test_storage_content,
+}
+
+
+def create_project(cwd, files):
+    for path, content in files.items():
+        cwd.join(path).write(content, ensure=True)
+
+    run(args=["git", "init", "-q"], cwd=str(cwd), check=True)
+    run(args=["git", "add", "."], cwd=str(cwd), check=True)
+
+
+def check_imports(cwd, args):
+    out, _ = Popen(
+        args=["flake8", "--enable-extensions=NIC,NIT", "--select=NIC,NIT", *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        cwd=str(cwd),
+    ).communicate()
+    return re.findall(r"^(\S+):(\d+):\d+: (NI[CT]\d+): (.*)$", out.decode("utf-8"), flags=re.MULTILINE)
+
+
+def test_import_from_other_tests_directory(tmpdir):
+    create_project(cwd=tmpdir, files=project_files)
+
+    # Absolute and relative imports from another tests directory, imports of the same directory are allowed.
+    assert check_imports(cwd=tmpdir, args=["tests/storage/test_storage.py"]) == [
+        ("tests/storage/test_storage.py", "2", "NIT001", "Import from tests is not allowed."),
+        ("tests/storage/test_storage.py", "4", "NIC001", "Import from conftest.py is not allowed."),
+        ("tests/storage/test_storage.py", "4", "NIT001", "Import from tests is not allowed."),
+        ("tests/storage/test_storage.py", "6", "NIT001", "Import from tests is not allowed."),
+    ]
+
+
+transitive_files = {
+    **project_files,
+    "app/__init__.py": "",
+    "app/helpers.py": "from tests.network.utils import helper\n\n\ndef assist():\n    return helper()\n",
+    "app/service.py": "import os\n\nfrom app.helpers import assist\n\n\ndef serve():\n    return assist(), os\n",
+}
+
+
+def test_transitive_import_from_tests(tmpdir):
+    create_project(cwd=tmpdir, files=transitive_files)
+    args = ["--nit_transitive=True", "app/service.py"]
+    reported = [
+        (
+            "app/service.py",
+            "3",
+            "NIT002",
+            "Import from tests is not allowed, through app.helpers -> tests.network.utils.",
+        )
+    ]
+    assert check_imports(cwd=tmpdir, args=args) == reported
+    # Warm run from the cached import graph.
+    assert check_imports(cwd=tmpdir, args=args) == reported
+
+    # A changed file is resolved again.
+    tmpdir.join("app/helpers.py").write("def assist():\n    return 1\n")
+    assert check_imports(cwd=tmpdir, args=args) == []
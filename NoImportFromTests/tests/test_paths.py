@@ -0,0 +1,19 @@
+from NoImportFromTests.paths import FilePath
+
+
+def test_component_after_root():
+    assert FilePath(filename="./tests/network/test_net.py").component_after(root="tests") == "network"
+    assert FilePath(filename="tests/test_net.py").component_after(root="tests") == "test_net.py"
+    assert FilePath(filename="./app/service.py").component_after(root="tests") is None
+
+
+def test_component_after_root_prefers_a_directory_after_slash():
+    # Like a `/tests/` search, a relative path first component is used only if no later component matches.
+    assert FilePath(filename="tests/unit/tests/network/test_net.py").component_after(root="tests") == "network"
+    assert FilePath(filename="tests/unit/test_unit.py").component_after(root="tests") == "unit"
+
+
+def test_sibling_files_share_directory():
+    first = FilePath(filename="./tests/network/test_first.py")
+    second = FilePath(filename="./tests/network/test_second.py")
+    assert first.directory is second.directory
@@ -0,0 +1,99 @@
+"""
+On-disk cache location and helpers shared by the plugins.
+
+The cache lives under $FLAKE8_PLUGINS_CACHE_DIR, defaults to $XDG_CACHE_HOME/flake8-plugins (~/.cache/flake8-plugins).
+"""
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CACHE_DIR_ENV = "FLAKE8_PLUGINS_CACHE_DIR"
+
+
+def get_cache_dir():
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(xdg_cache, "flake8-plugins")
+
+    return cache_dir
+
+
+def get_project_cache_dir():
+    """
+    Get the cache directory of the project flake8 runs on (the current directory).
+    """
+    project = hashlib.sha1(string=os.path.abspath(os.getcwd()).encode()).hexdigest()[:16]
+    return os.path.join(get_cache_dir(), "projects", project)
+
+
+def load_pickle(path, default=None):
+    """
+    Load a pickle written by dump_pickle, default if it is missing or unreadable.
+    """
+    try:
+        with open(path, "rb") as fd:
+            return pickle.load(file=fd)
+
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, ValueError):
+        return default
+
+
+def dump_bytes(path, data):
+    """
+    Atomically write data to path, readers see either the old or the new file.
+
+    Cache is best effort, returns False if it could not be written.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(name=os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd=fd, mode="wb") as tmp_file:
+            tmp_file.write(data)
+
+        os.replace(tmp_path, path)
+        return True
+
+    except OSError:
+        if tmp_path:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+        return False
+
+
+def dump_pickle(path, obj):
+    """
+    Atomically write obj to path, see dump_bytes.
+    """
+    return dump_bytes(path=path, data=pickle.dumps(obj=obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """
+    Exclusive lock between processes (flake8 --jobs workers) on path, no-op where flock is missing.
+    """
+    try:
+        os.makedirs(name=os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        yield
+        return
+
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+        yield
+    finally:
+        os.close(fd=fd)
@@ -0,0 +1,120 @@
+"""
+pytest decorators resolution shared by the plugins.
+
+The imports of a module are read once to know the names pytest, `pytest.fixture` and `pytest.mark` are bound to
+(`import pytest as pt`, `from pytest import fixture`, `from pytest import mark as m`), then every decorator is
+classified by its resolved name: "fixture", "mark.polarion", "mark.parametrize", "mark.usefixtures"...
+Called (`@pytest.fixture(scope="module")`) and bare (`@pytest.fixture`) decorators are the same kind.
+The resolver is cached on the tree, all the plugins checking a file share it and its classified decorators.
+"""
+
+import ast
+
+from PluginsUtils.metrics import count
+from PluginsUtils.nodes import get_node_index
+
+# Attribute of the tree the resolver is cached in.
+RESOLVER_ATTRIBUTE = "_pytest_decorators_resolver"
+
+
+class Decorator:
+    """
+    A classified decorator, kind is None for decorators which are not from pytest.
+
+    call is the decorator call node (None for a bare decorator), args and keywords are its arguments.
+    """
+
+    def __init__(self, node, kind):
+        self.node = node
+        self.kind = kind
+        self.call = node if isinstance(node, ast.Call) else None
+        self.args = self.call.args if self.call else []
+        self.keywords = {keyword.arg: keyword.value for keyword in self.call.keywords} if self.call else {}
+
+    def keyword(self, name, default=None):
+        return self.keywords.get(name, default)
+
+
+def _dotted_parts(node):
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    if not isinstance(node, ast.Name):
+        return None
+
+    parts.append(node.id)
+    return parts[::-1]
+
+
+class DecoratorResolver:
+    """
+    Classify the decorators of a module.
+    """
+
+    def __init__(self, tree):
+        # name -> the pytest object it is bound to, "" for the pytest module itself.
+        self.names = {"pytest": ""}
+        for node in get_node_index(tree=tree).imports:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name == "pytest":
+                        self.names[alias.asname or alias.name] = ""
+
+            elif isinstance(node, ast.ImportFrom) and node.module == "pytest" and not node.level:
+                for alias in node.names:
+                    self.names[alias.asname or alias.name] = alias.name
+
+        # id(decorator node) -> (node, Decorator)
+        self._decorators = {}
+
+    def resolve_kind(self, node):
+        """
+        Get the kind of a decorator expression (the pytest name it resolves to without `pytest.`), None if it is
+        not from pytest.
+        """
+        parts = _dotted_parts(node=node.func if isinstance(node, ast.Call) else node)
+        if not parts or parts[0] not in self.names:
+            return None
+
+        base = self.names[parts[0]]
+        return ".".join([*([base] if base else []), *parts[1:]]) or None
+
+    def resolve(self, node):
+        key = id(node)
+        if key not in self._decorators:
+            count(counter="decorators_examined")
+            self._decorators[key] = node, Decorator(node=node, kind=self.resolve_kind(node=node))
+
+        return self._decorators[key][1]
+
+    def iter_decorators(self, node, kind=None):
+        """
+        Get the classified decorators of a function or class, only the ones of kind if given.
+        """
+        for deco in node.decorator_list:
+            decorator = self.resolve(node=deco)
+            if kind is None or decorator.kind == kind:
+                yield decorator
+
+    def find(self, node, kind):
+        """
+        Get the first decorator of kind of a function or class, None if it has none.
+        """
+        return next(self.iter_decorators(node=node, kind=kind), None)
+
+    def is_fixture(self, node):
+        return self.find(node=node, kind="fixture") is not None
+
+
+def get_decorator_resolver(tree):
+    """
+    Get the decorators resolver of a module, created once per tree.
+    """
+    resolver = getattr(tree, RESOLVER_ATTRIBUTE, None)
+    if resolver is None:
+        resolver = DecoratorResolver(tree=tree)
+        setattr(tree, RESOLVER_ATTRIBUTE, resolver)
+
+    return resolver
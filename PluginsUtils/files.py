@@ -0,0 +1,29 @@
+"""
+Python files lookup for the tools which run on directories (not through flake8).
+"""
+
+import os
+
+SKIP_DIRS = {"__pycache__", "venv", "node_modules"}
+
+
+def is_test_file(filename):
+    name = os.path.basename(filename)
+    return name.startswith("test_") or name.endswith("_test.py")
+
+
+def iter_python_files(paths, match=None):
+    """
+    Get python files in paths (files or directories), match filters the files found in directories by name.
+    Hidden directories (.git, .tox, .venv...) are skipped.
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.normpath(path)
+            continue
+
+        for root, dirs, files in os.walk(top=path):
+            dirs[:] = sorted(_dir for _dir in dirs if _dir not in SKIP_DIRS and not _dir.startswith("."))
+            names = sorted(name for name in files if name.endswith(".py"))
+            for name in names if match is None else filter(match, names):
+                yield os.path.normpath(os.path.join(root, name))
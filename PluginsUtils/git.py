@@ -0,0 +1,98 @@
+"""
+Git helpers, all paths are relative to the current directory like git itself reports them.
+"""
+
+import hashlib
+import os
+import subprocess
+
+from PluginsUtils.metrics import count
+
+
+def git_output(args):
+    """
+    Run git with args and return its stdout, None if git failed (not a git repository, git is missing).
+    """
+    count(counter="subprocesses")
+    try:
+        res = subprocess.run(args=["git", *args], capture_output=True, check=False)
+    except OSError:
+        return None
+
+    if res.returncode != 0:
+        return None
+
+    return res.stdout
+
+
+def is_git_repository():
+    return git_output(args=["rev-parse", "--git-dir"]) is not None
+
+
+def _split_z(output):
+    for elm in output.split(b"\0"):
+        if elm:
+            yield os.fsdecode(filename=elm)
+
+
+def iter_tracked_files():
+    """
+    Get all files tracked by git under the current directory
+    """
+    output = git_output(args=["ls-files", "-z"])
+    if output:
+        yield from _split_z(output=output)
+
+
+def hash_blob(data):
+    """
+    Get the git blob SHA of data, same as `git hash-object`.
+    """
+    sha = hashlib.sha1(string=f"blob {len(data)}\0".encode())
+    sha.update(data)
+    return sha.hexdigest()
+
+
+def hash_file_blob(filename):
+    try:
+        with open(filename, "rb") as fd:
+            return hash_blob(data=fd.read())
+
+    except OSError:
+        return None
+
+
+def get_tracked_blobs():
+    """
+    Get tracked file -> git blob SHA of its content in the working tree.
+
+    SHAs are taken from the git index, only files modified in the working tree are hashed.
+    Files deleted from the working tree are omitted.
+    """
+    output = git_output(args=["ls-files", "-s", "-z"])
+    if not output:
+        return {}
+
+    blobs = {}
+    for entry in output.split(b"\0"):
+        if not entry:
+            continue
+
+        # <mode> <sha> <stage>\t<file>
+        info, filename = entry.split(b"\t", 1)
+        mode, sha, _ = info.split(b" ")
+        # Skip submodules.
+        if mode == b"160000":
+            continue
+
+        blobs[os.fsdecode(filename=filename)] = sha.decode()
+
+    modified = git_output(args=["ls-files", "-m", "-z"]) or b""
+    for filename in _split_z(output=modified):
+        sha = hash_file_blob(filename=filename)
+        if sha:
+            blobs[filename] = sha
+        else:
+            blobs.pop(filename, None)
+
+    return blobs
@@ -0,0 +1,208 @@
+"""
+Normalised import records of a module, shared by the imports plugins.
+
+Every imported module or name of a file is one record: `import` statements at any level (functions, `try`,
+`if TYPE_CHECKING`), `from ... import ...` with relative imports resolved to absolute modules from the file
+path, and `importlib.import_module("...")`/`__import__("...")` calls with a literal name.
+Records are extracted once per file, the plugins which check the same tree share them.
+"""
+
+import ast
+import os
+
+from PluginsUtils.metrics import count
+from PluginsUtils.nodes import get_node_index
+
+# (tree, filename, records) of the last extracted tree, flake8 runs the plugins of a file one after the other.
+_LAST = None
+
+DYNAMIC_IMPORTS = frozenset(("import_module", "__import__"))
+
+
+class ImportRecord:
+    """
+    An import of a module (name is None) or of a name from a module.
+
+    module is the absolute module, None for a relative import which goes above the top level package, written is
+    the module as written in the file (`..a.b`).
+    """
+
+    def __init__(self, module, written, name, asname, level, lineno, col_offset, dynamic=False):
+        self.module = module
+        self.written = written
+        self.name = name
+        self.asname = asname
+        self.level = level
+        self.lineno = lineno
+        self.col_offset = col_offset
+        self.dynamic = dynamic
+
+    @property
+    def target(self):
+        """
+        The imported dotted name, `a.b` for `from a import b`.
+        """
+        if self.name is None:
+            return self.module
+
+        return f"{self.module}.{self.name}" if self.module else self.name
+
+    @property
+    def location(self):
+        return self.lineno, self.col_offset
+
+    def __repr__(self):
+        return (
+            f"ImportRecord(module={self.module!r}, written={self.written!r}, name={self.name!r}, "
+            f"asname={self.asname!r}, level={self.level}, lineno={self.lineno}, col_offset={self.col_offset}, "
+            f"dynamic={self.dynamic})"
+        )
+
+
+def get_package(filename):
+    """
+    Get the package of a file from its path relative to the current directory, None if it is out of it.
+    """
+    directory = os.path.dirname(os.path.relpath(filename))
+    parts = [part for part in directory.split(os.sep) if part and part != "."]
+    if ".." in parts:
+        return None
+
+    return ".".join(parts)
+
+
+def module_name(filename):
+    """
+    Get the module of a file from its path relative to the current directory (`a.b` for `a/b/__init__.py`).
+    """
+    module = os.path.splitext(os.path.relpath(filename))[0].replace(os.sep, ".")
+    return module.removesuffix(".__init__")
+
+
+def resolve_module(module, level, package):
+    """
+    Get the absolute module of a `from {"." * level}{module} import ...` in package.
+    """
+    if not level:
+        return module
+
+    if package is None:
+        return None
+
+    parts = package.split(".") if package else []
+    if level - 1 > len(parts):
+        return None
+
+    base = parts[: len(parts) - (level - 1)]
+    return ".".join([*base, *([module] if module else [])]) or None
+
+
+def _dynamic_import(call):
+    """
+    Get the record of an `import_module("a.b")`/`__import__("a.b")` call, None if the name is not a literal.
+    """
+    func_name = call.func.attr if isinstance(call.func, ast.Attribute) else getattr(call.func, "id", None)
+    if func_name not in DYNAMIC_IMPORTS:
+        return None
+
+    keywords = {keyword.arg: keyword.value for keyword in call.keywords}
+    name = call.args[0] if call.args else keywords.get("name")
+    if not isinstance(name, ast.Constant) or not isinstance(name.value, str):
+        return None
+
+    # A relative name is resolved from the `import_module` package argument, not from the file.
+    level = len(name.value) - len(name.value.lstrip("."))
+    package = None
+    if func_name == "import_module":
+        anchor = call.args[1] if len(call.args) > 1 else keywords.get("package")
+        package = anchor.value if isinstance(anchor, ast.Constant) and isinstance(anchor.value, str) else None
+
+    return ImportRecord(
+        module=resolve_module(module=name.value[level:], level=level, package=package),
+        written=name.value,
+        name=None,
+        asname=None,
+        level=level,
+        lineno=call.lineno,
+        col_offset=call.col_offset,
+        dynamic=True,
+    )
+
+
+def extract_import_records(tree, filename):
+    """
+    Get the import records of a module, in source order.
+    """
+    package = get_package(filename=filename)
+    index = get_node_index(tree=tree)
+    records = []
+    for node in index.imports:
+        if isinstance(node, ast.Import):
+            records.extend(
+                ImportRecord(
+                    module=alias.name,
+                    written=alias.name,
+                    name=None,
+                    asname=alias.asname,
+                    level=0,
+                    lineno=node.lineno,
+                    col_offset=node.col_offset,
+                )
+                for alias in node.names
+            )
+
+        elif isinstance(node, ast.ImportFrom):
+            module = resolve_module(module=node.module, level=node.level, package=package)
+            records.extend(
+                ImportRecord(
+                    module=module,
+                    written=f"{'.' * node.level}{node.module or ''}",
+                    name=alias.name,
+                    asname=alias.asname,
+                    level=node.level,
+                    lineno=node.lineno,
+                    col_offset=node.col_offset,
+                )
+                for alias in node.names
+            )
+
+    for node in index.calls:
+        record = _dynamic_import(call=node)
+        if record:
+            records.append(record)
+
+    records.sort(key=lambda record: record.location)
+    return records
+
+
+def get_import_records(tree, filename):
+    """
+    Get the import records of a checked file, extracted once for all the plugins checking it.
+    """
+    global _LAST
+
+    if _LAST is None or _LAST[0] is not tree or _LAST[1] != filename:
+        count(counter="cache_misses")
+        records = extract_import_records(tree=tree, filename=filename)
+        _LAST = tree, filename, records
+
+    else:
+        count(counter="cache_hits")
+
+    return _LAST[2]
+
+
+def iter_import_statements(records):
+    """
+    Get the records of each import statement (or dynamic import call) grouped, by location.
+    """
+    statement = []
+    for record in records:
+        if statement and statement[0].location != record.location:
+            yield statement
+            statement = []
+
+        statement.append(record)
+
+    if statement:
+        yield statement
@@ -0,0 +1,310 @@
+"""
+Opt-in timing and counters of the plugins work, exported when flake8 exits.
+
+Enabled with $FLAKE8_PLUGINS_METRICS set to a directory, flake8-plugins-metrics.json and
+flake8-plugins-metrics.prom (OpenMetrics text) are written in it when flake8 exits.
+The run of every plugin on every file is timed (wall and CPU time spent in the plugin `run`) and the plugins
+count their hot path work while they run: nodes visited, calls checked, decorators examined, subprocesses
+spawned, cache hits and misses. Work done out of a plugin run is counted as "unattributed".
+flake8 --jobs workers (and the processes the plugins start) write their metrics to a spool directory when they
+exit, the main process merges them with its own ones and exports the totals with the
+$FLAKE8_PLUGINS_METRICS_TOP (default: 10) slowest files.
+When disabled, plugins runs are not wrapped and counting is a global lookup.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+
+from PluginsUtils.cache import dump_bytes, dump_pickle, load_pickle
+
+METRICS_ENV = "FLAKE8_PLUGINS_METRICS"
+METRICS_TOP_ENV = "FLAKE8_PLUGINS_METRICS_TOP"
+METRICS_VERSION = 1
+# counter -> help
+COUNTERS = {
+    "nodes_visited": "AST nodes visited to build the node indexes.",
+    "calls_checked": "Calls checked by FCN.",
+    "decorators_examined": "Decorators classified by the pytest decorators resolver.",
+    "subprocesses": "Subprocesses spawned (git commands, workers of the process pools).",
+    "cache_hits": "In memory and on disk caches hits.",
+    "cache_misses": "In memory and on disk caches misses.",
+}
+UNATTRIBUTED = "unattributed"
+
+METRICS_DIR = os.environ.get(METRICS_ENV) or None
+METRICS = None
+
+
+class Metrics:
+    """
+    Metrics of one process.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.processes = 1
+        # Name of the plugin running, counters are attributed to it.
+        self.plugin = None
+        # (plugin, filename) -> [wall seconds, CPU seconds]
+        self.times = {}
+        # (plugin, counter) -> value
+        self.counters = {}
+
+    def count(self, counter, value=1):
+        key = self.plugin or UNATTRIBUTED, counter
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def add_time(self, plugin, filename, wall, cpu):
+        times = self.times.setdefault((plugin, filename), [0.0, 0.0])
+        times[0] += wall
+        times[1] += cpu
+
+    def merge(self, other):
+        self.processes += other.processes
+        for (plugin, filename), (wall, cpu) in other.times.items():
+            self.add_time(plugin=plugin, filename=filename, wall=wall, cpu=cpu)
+
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def __getstate__(self):
+        return {"processes": self.processes, "times": self.times, "counters": self.counters}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
+
+
+def _spool_dir():
+    return os.path.join(METRICS_DIR, ".spool")
+
+
+def _write_spool(metrics):
+    if metrics.times or metrics.counters:
+        dump_pickle(path=os.path.join(_spool_dir(), f"{metrics.pid}.pickle"), obj=metrics)
+
+
+def _pop_spool(load=True):
+    """
+    Get the metrics spooled by the child processes and remove them.
+    """
+    try:
+        names = sorted(os.listdir(path=_spool_dir()))
+    except OSError:
+        return
+
+    for name in names:
+        path = os.path.join(_spool_dir(), name)
+        metrics = load_pickle(path=path) if load else None
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+        if isinstance(metrics, Metrics):
+            yield metrics
+
+
+def is_main_process():
+    # flake8 --jobs workers and the plugins pools are multiprocessing children.
+    return multiprocessing.parent_process() is None
+
+
+def get_metrics():
+    """
+    Get the metrics of the current process, created on first use in a child process, which spools them when it
+    exits.
+    """
+    global METRICS
+
+    if METRICS is None or METRICS.pid != os.getpid():
+        METRICS = Metrics()
+        if not is_main_process():
+            multiprocessing.util.Finalize(obj=None, callback=_write_spool, args=(METRICS,), exitpriority=10)
+
+    return METRICS
+
+
+def count(counter, value=1):
+    """
+    Add value to counter (one of COUNTERS) of the running plugin, no-op when metrics are disabled.
+    """
+    if METRICS_DIR is not None:
+        get_metrics().count(counter=counter, value=value)
+
+
+def measured(run):
+    """
+    Time a plugin `run` and attribute the counters to the plugin while it runs, run is returned as is when
+    metrics are disabled.
+
+    Only the time spent in the plugin is measured, not the time flake8 spends handling its results.
+    """
+    if METRICS_DIR is None:
+        return run
+
+    @functools.wraps(wrapped=run)
+    def wrapper(self):
+        metrics = get_metrics()
+        results = run(self=self)
+        wall = cpu = 0.0
+        try:
+            while True:
+                previous, metrics.plugin = metrics.plugin, self.name
+                start, cpu_start = time.perf_counter(), time.process_time()
+                try:
+                    result = next(results)
+                except StopIteration:
+                    return
+                finally:
+                    wall += time.perf_counter() - start
+                    cpu += time.process_time() - cpu_start
+                    metrics.plugin = previous
+
+                yield result
+
+        finally:
+            metrics.add_time(plugin=self.name, filename=getattr(self, "filename", None), wall=wall, cpu=cpu)
+
+    return wrapper
+
+
+def get_report(metrics, top):
+    """
+    Get the JSON report of metrics: totals per plugin and the top slowest files.
+    """
+    plugins = {}
+    files = {}
+    for (plugin, filename), (wall, cpu) in metrics.times.items():
+        totals = plugins.setdefault(plugin, {"files": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "counters": {}})
+        totals["files"] += 1
+        totals["wall_seconds"] += wall
+        totals["cpu_seconds"] += cpu
+        if filename is not None:
+            file_totals = files.setdefault(filename, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "plugins": {}})
+            file_totals["wall_seconds"] += wall
+            file_totals["cpu_seconds"] += cpu
+            file_totals["plugins"][plugin] = file_totals["plugins"].get(plugin, 0.0) + wall
+
+    for (plugin, counter), value in metrics.counters.items():
+        totals = plugins.setdefault(plugin, {"files": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "counters": {}})
+        totals["counters"][counter] = value
+
+    slowest = sorted(files.items(), key=lambda item: (-item[1]["wall_seconds"], item[0]))[:top]
+    return {
+        "version": METRICS_VERSION,
+        "created": round(time.time()),
+        "processes": metrics.processes,
+        "plugins": dict(sorted(plugins.items())),
+        "slowest_files": [{"filename": filename, **totals} for filename, totals in slowest],
+    }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_openmetrics(report):
+    """
+    Get the report as an OpenMetrics text exposition.
+    """
+    lines = []
+
+    def family(name, kind, help_, samples, unit=None):
+        lines.append(f"# TYPE {name} {kind}")
+        if unit:
+            lines.append(f"# UNIT {name} {unit}")
+
+        lines.append(f"# HELP {name} {help_}")
+        suffix = "_total" if kind == "counter" else ""
+        for labels, value in samples:
+            labels = ",".join(f'{key}="{_label(value=label)}"' for key, label in labels.items())
+            lines.append(f"{name}{suffix}{{{labels}}} {value}" if labels else f"{name}{suffix} {value}")
+
+    plugins = report["plugins"]
+    family(
+        name="flake8_plugins_run_seconds",
+        kind="counter",
+        unit="seconds",
+        help_="Wall time spent in the plugins runs.",
+        samples=[({"plugin": plugin}, totals["wall_seconds"]) for plugin, totals in plugins.items()],
+    )
+    family(
+        name="flake8_plugins_run_cpu_seconds",
+        kind="counter",
+        unit="seconds",
+        help_="CPU time spent in the plugins runs.",
+        samples=[({"plugin": plugin}, totals["cpu_seconds"]) for plugin, totals in plugins.items()],
+    )
+    family(
+        name="flake8_plugins_files_checked",
+        kind="counter",
+        help_="Files checked by the plugins.",
+        samples=[({"plugin": plugin}, totals["files"]) for plugin, totals in plugins.items()],
+    )
+    for counter, help_ in COUNTERS.items():
+        family(
+            name=f"flake8_plugins_{counter}",
+            kind="counter",
+            help_=help_,
+            samples=[
+                ({"plugin": plugin}, totals["counters"][counter])
+                for plugin, totals in plugins.items()
+                if counter in totals["counters"]
+            ],
+        )
+
+    family(
+        name="flake8_plugins_slowest_file_seconds",
+        kind="gauge",
+        unit="seconds",
+        help_="Wall time of all the plugins on the slowest files.",
+        samples=[
+            ({"rank": rank, "filename": file["filename"]}, file["wall_seconds"])
+            for rank, file in enumerate(report["slowest_files"], start=1)
+        ],
+    )
+    family(
+        name="flake8_plugins_processes",
+        kind="gauge",
+        help_="Processes the metrics were collected in.",
+        samples=[({}, report["processes"])],
+    )
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def export():
+    """
+    Merge the metrics of the processes and write the reports, run at the main process exit.
+    """
+    metrics = get_metrics()
+    for child in _pop_spool():
+        metrics.merge(other=child)
+
+    try:
+        top = int(os.environ.get(METRICS_TOP_ENV, "10"))
+    except ValueError:
+        top = 10
+
+    report = get_report(metrics=metrics, top=top)
+    dump_bytes(
+        path=os.path.join(METRICS_DIR, "flake8-plugins-metrics.json"),
+        data=json.dumps(obj=report, indent=2).encode(),
+    )
+    dump_bytes(
+        path=os.path.join(METRICS_DIR, "flake8-plugins-metrics.prom"),
+        data=format_openmetrics(report=report).encode(),
+    )
+
+
+if METRICS_DIR is not None and is_main_process():
+    # Metrics left by an interrupted run.
+    for _ in _pop_spool(load=False):
+        pass
+
+    atexit.register(export)
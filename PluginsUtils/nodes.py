@@ -0,0 +1,149 @@
+"""
+Per file index of the nodes the plugins check, built in one traversal of the tree.
+
+The index lists the functions, classes, calls, imports and decorators of a module in source order, with the
+parent and the scope (enclosing function or class, the module at the top level) of each of them.
+It is cached on the tree, flake8 gives the same tree to all the plugins checking a file, so with all the plugins
+enabled a file is traversed once.
+"""
+
+import ast
+
+from PluginsUtils.metrics import count
+
+# Attribute of the tree the index is cached in.
+INDEX_ATTRIBUTE = "_plugins_node_index"
+
+# Nodes which can't have an indexed node below them, not traversed.
+LEAVES = (
+    ast.Name,
+    ast.Constant,
+    ast.expr_context,
+    ast.operator,
+    ast.unaryop,
+    ast.boolop,
+    ast.cmpop,
+    ast.alias,
+    ast.Pass,
+    ast.Break,
+    ast.Continue,
+    ast.Global,
+    ast.Nonlocal,
+)
+DEFS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+class NodeIndex:
+    """
+    The functions, classes, calls, imports and decorators (decorated node, decorator) of a module.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.functions = []
+        self.classes = []
+        self.calls = []
+        self.imports = []
+        self.decorators = []
+        # id(indexed node) -> parent node, scope node
+        self._parents = {}
+        self._scopes = {}
+        self._build()
+
+    def _build(self):
+        # (node, parent, scope), children are pushed in reverse so nodes are indexed in source order.
+        stack = [(self.tree, None, self.tree)]
+        while stack:
+            node, parent, scope = stack.pop()
+            if isinstance(node, DEFS):
+                (self.classes if isinstance(node, ast.ClassDef) else self.functions).append(node)
+                self.decorators.extend((node, deco) for deco in node.decorator_list)
+
+            elif isinstance(node, ast.Call):
+                self.calls.append(node)
+
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                self.imports.append(node)
+
+            if node is not self.tree:
+                self._parents[id(node)] = parent
+                self._scopes[id(node)] = scope
+
+            children = []
+            for field, value in ast.iter_fields(node):
+                # Only the body of a function or class is in its scope (not its decorators, defaults or bases).
+                child_scope = node if field == "body" and isinstance(node, DEFS) else scope
+                if isinstance(value, list):
+                    children.extend(
+                        (child, node, child_scope)
+                        for child in value
+                        if isinstance(child, ast.AST) and not isinstance(child, LEAVES)
+                    )
+
+                elif isinstance(value, ast.AST) and not isinstance(value, LEAVES):
+                    children.append((value, node, child_scope))
+
+            stack.extend(reversed(children))
+
+        count(counter="nodes_visited", value=len(self._parents) + 1)
+
+    def parent(self, node):
+        """
+        Get the parent of an indexed node (None for the module).
+        """
+        return self._parents.get(id(node))
+
+    def scope(self, node):
+        """
+        Get the enclosing function or class of an indexed node, the module at the top level.
+        """
+        return self._scopes.get(id(node), self.tree)
+
+    def module_functions(self):
+        """
+        Get the functions defined at the module level.
+        """
+        return [func for func in self.functions if self.parent(node=func) is self.tree]
+
+    def is_in_classes(self, node):
+        """
+        Check if a node is at the module level or only nested in classes bodies.
+        """
+        parent = self.parent(node=node)
+        while parent is not self.tree:
+            if not isinstance(parent, ast.ClassDef):
+                return False
+
+            parent = self.parent(node=parent)
+
+        return True
+
+    def enclosing_classes(self, node):
+        """
+        Get the classes a node is nested in, from the outermost.
+        """
+        classes = []
+        parent = self.parent(node=node)
+        while parent is not None and parent is not self.tree:
+            if isinstance(parent, ast.ClassDef):
+                classes.append(parent)
+
+            parent = self.parent(node=parent)
+
+        return tuple(reversed(classes))
+
+
+def get_node_index(tree):
+    """
+    Get the node index of a module, built once per tree.
+    """
+    index = getattr(tree, INDEX_ATTRIBUTE, None)
+    if index is None:
+        count(counter="cache_misses")
+        index = NodeIndex(tree=tree)
+        setattr(tree, INDEX_ATTRIBUTE, index)
+
+    else:
+        count(counter="cache_hits")
+
+    return index
@@ -0,0 +1,45 @@
+"""
+Run work on all cores when possible.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PluginsUtils.metrics import count
+
+# Not worth starting processes for less items than this.
+MIN_PARALLEL_ITEMS = 64
+
+
+def can_fork():
+    # flake8 --jobs workers are daemonic processes, which are not allowed to have children.
+    return not multiprocessing.current_process().daemon and (os.cpu_count() or 1) > 1
+
+
+def parallel_map(func, items, chunksize=32):
+    """
+    Same as list(map(func, items)) but on all cores, func and items must be picklable.
+    """
+    items = list(items)
+    if len(items) < MIN_PARALLEL_ITEMS or not can_fork():
+        return list(map(func, items))
+
+    count(counter="subprocesses", value=os.cpu_count())
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
+def parallel_imap(func, items, processes=None, chunksize=8):
+    """
+    Same as map(func, items) but on processes (all cores by default), results are yielded in order as soon as they
+    are ready so the caller can stream them, func and items must be picklable.
+    """
+    items = list(items)
+    if processes == 1 or len(items) < MIN_PARALLEL_ITEMS or not can_fork():
+        yield from map(func, items)
+        return
+
+    count(counter="subprocesses", value=processes or os.cpu_count())
+    with multiprocessing.Pool(processes=processes) as pool:
+        yield from pool.imap(func=func, iterable=items, chunksize=chunksize)
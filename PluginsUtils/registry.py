@@ -0,0 +1,204 @@
+"""
+Project wide registry of records (name, file, line) shared by flake8 --jobs workers.
+
+flake8 creates a plugin instance per file and runs files in several processes, so checks which need to
+see the whole project (duplicate names) can't keep their state in memory.
+Records are kept in a SQLite database in the project cache directory, before the first check in a process
+all project files (tracked by git) are synced into it, only files which changed since they were recorded
+are parsed again. Files which are not part of the project (not tracked) are recorded for the current flake8
+run only.
+"""
+
+import ast
+import contextlib
+import multiprocessing
+import os
+import sqlite3
+
+from PluginsUtils.cache import get_project_cache_dir
+from PluginsUtils.files import iter_python_files
+from PluginsUtils.git import is_git_repository, iter_tracked_files
+
+REGISTRY_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (filename TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, run_id INTEGER);
+CREATE TABLE IF NOT EXISTS records (
+    name TEXT NOT NULL, filename TEXT NOT NULL, lineno INTEGER NOT NULL, col_offset INTEGER NOT NULL, info TEXT
+);
+CREATE INDEX IF NOT EXISTS records_name ON records (name);
+CREATE INDEX IF NOT EXISTS records_filename ON records (filename);
+"""
+
+
+def normalize_filename(filename):
+    return os.path.relpath(filename)
+
+
+def _stat(filename):
+    try:
+        stat = os.stat(path=filename)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_run_id():
+    """
+    Get the pid of the flake8 main process, flake8 --jobs workers are its daemonic children.
+    """
+    return os.getppid() if multiprocessing.current_process().daemon else os.getpid()
+
+
+def iter_project_python_files():
+    """
+    Get the python files tracked by git, all python files under the current directory out of a git repository.
+    """
+    if is_git_repository():
+        for filename in iter_tracked_files():
+            if filename.endswith(".py"):
+                yield filename
+
+        return
+
+    for filename in iter_python_files(paths=["."]):
+        yield normalize_filename(filename=filename)
+
+
+class ProjectRegistry:
+    """
+    Registry of records extracted from the project python files.
+
+    extract is called with a parsed module and returns an iterable of (name, lineno, col_offset, info) records.
+    """
+
+    def __init__(self, name, extract, version=REGISTRY_VERSION):
+        self.extract = extract
+        self.synced = False
+        self.project_files = set()
+        path = os.path.join(get_project_cache_dir(), f"{name}-v{version}.sqlite")
+        try:
+            os.makedirs(name=os.path.dirname(path), exist_ok=True)
+            self.connection = self._connect(database=path)
+        except (OSError, sqlite3.Error):
+            # Cache directory is not usable, the registry is private to this process.
+            self.connection = self._connect(database=":memory:")
+
+    @staticmethod
+    def _connect(database):
+        # Autocommit mode, transactions are managed explicitly.
+        connection = sqlite3.connect(database=database, timeout=300, isolation_level=None)
+        with contextlib.suppress(sqlite3.Error):
+            connection.execute("PRAGMA journal_mode=WAL")
+
+        connection.executescript(SCHEMA)
+        return connection
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock upfront, concurrent workers wait for each other instead of failing.
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        else:
+            self.connection.execute("COMMIT")
+
+    def _extract_file(self, filename):
+        try:
+            with open(filename, "rb") as fd:
+                tree = ast.parse(fd.read(), filename=filename)
+
+        except (OSError, SyntaxError, ValueError):
+            return []
+
+        return list(self.extract(tree=tree))
+
+    @staticmethod
+    def _replace(connection, filename, stat, records, run_id=None):
+        connection.execute("DELETE FROM records WHERE filename = ?", (filename,))
+        connection.executemany(
+            "INSERT INTO records (name, filename, lineno, col_offset, info) VALUES (?, ?, ?, ?, ?)",
+            [(name, filename, lineno, col_offset, info) for name, lineno, col_offset, info in records],
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO files (filename, mtime_ns, size, run_id) VALUES (?, ?, ?, ?)",
+            (filename, *stat, run_id),
+        )
+
+    def sync(self):
+        """
+        Record all project files, parse only files which are new or changed, drop deleted files and files
+        out of the project recorded by previous runs.
+
+        Done once per process, the first flake8 worker does the work and the others wait for it.
+        """
+        if self.synced:
+            return
+
+        self.project_files = set(iter_project_python_files())
+        run_id = get_run_id()
+        with self._transaction() as connection:
+            recorded, run_ids = {}, {}
+            for filename, mtime_ns, size, file_run_id in connection.execute(
+                "SELECT filename, mtime_ns, size, run_id FROM files"
+            ):
+                recorded[filename] = (mtime_ns, size)
+                run_ids[filename] = file_run_id
+
+            for filename in self.project_files.union(recorded):
+                if filename in self.project_files:
+                    stat = _stat(filename=filename)
+                else:
+                    # Out of the project, keep it only if it was recorded by this run.
+                    stat = recorded[filename] if run_ids[filename] == run_id else None
+
+                if stat is None:
+                    connection.execute("DELETE FROM records WHERE filename = ?", (filename,))
+                    connection.execute("DELETE FROM files WHERE filename = ?", (filename,))
+
+                elif recorded.get(filename) != stat:
+                    self._replace(
+                        connection=connection,
+                        filename=filename,
+                        stat=stat,
+                        records=self._extract_file(filename=filename),
+                    )
+
+        self.synced = True
+
+    def record(self, filename, tree=None, records=None):
+        """
+        Record the file being checked from its already parsed tree, which is the source of truth for it.
+        Records already extracted by the caller can be passed instead of the tree.
+        """
+        self.sync()
+        filename = normalize_filename(filename=filename)
+        stat = _stat(filename=filename) or (None, None)
+        recorded = self.connection.execute(
+            "SELECT mtime_ns, size FROM files WHERE filename = ?", (filename,)
+        ).fetchone()
+        # Unchanged since sync recorded it.
+        if recorded == stat and None not in stat:
+            return
+
+        with self._transaction() as connection:
+            self._replace(
+                connection=connection,
+                filename=filename,
+                stat=stat,
+                records=list(self.extract(tree=tree)) if records is None else records,
+                run_id=None if filename in self.project_files else get_run_id(),
+            )
+
+    def locations(self, name):
+        """
+        Get all (filename, lineno, col_offset, info) records of name, sorted by location.
+        """
+        return self.connection.execute(
+            "SELECT filename, lineno, col_offset, info FROM records WHERE name = ? "
+            "ORDER BY filename, lineno, col_offset",
+            (name,),
+        ).fetchall()
@@ -0,0 +1,255 @@
+"""
+Content addressed cache of the per file results of the plugins.
+
+A result is keyed by the checked source (the lines flake8 gives to the plugin, the content of the file for plugins
+which only take the tree), the file path relative to the current directory, the plugin name, version and code, the
+python version, the plugin options and the other files it depends on. On a hit the plugin replays the stored result
+instead of walking the tree.
+Results are kept in a SQLite database directly under the cache directory (not per project), so checkouts of the
+same project on a host share it. Workers and concurrent runs write to it in WAL mode, entries are evicted least
+recently used first when the database goes over $FLAKE8_PLUGINS_RESULTS_CACHE_SIZE MiB (default: 512, 0 disables
+the cache). Results are stored as JSON (never unpickled from a file another process could write), the database is
+only readable by its owner.
+"""
+
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from PluginsUtils.cache import get_cache_dir
+from PluginsUtils.metrics import count
+
+RESULTS_CACHE_VERSION = 2
+RESULTS_CACHE_SIZE_ENV = "FLAKE8_PLUGINS_RESULTS_CACHE_SIZE"
+DEFAULT_RESULTS_CACHE_SIZE = 512
+# Last use of an entry is updated at most once per interval, a hit is a read most of the time.
+TOUCH_INTERVAL = 3600
+# The database size is checked every EVICT_EVERY writes of a process, and evicted down to EVICT_TO of its limit.
+EVICT_EVERY = 256
+EVICT_TO = 0.9
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+RESULTS_CACHE = None
+
+
+class ResultsCache:
+    """
+    Size bounded LRU store of JSON results, arrays are read back as tuples.
+    """
+
+    def __init__(self, path, max_size):
+        self.pid = os.getpid()
+        self.max_size = max_size
+        self.writes = 0
+        os.makedirs(name=os.path.dirname(path), mode=0o700, exist_ok=True)
+        # Created owner only before SQLite opens it, its -wal and -shm files get the same permissions.
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd=fd).st_mode & 0o077:
+                os.fchmod(fd=fd, mode=0o600)
+
+        finally:
+            os.close(fd=fd)
+
+        # Autocommit mode, every statement is its own transaction.
+        self.connection = sqlite3.connect(database=path, timeout=60, isolation_level=None)
+        with contextlib.suppress(sqlite3.Error):
+            self.connection.execute("PRAGMA journal_mode=WAL")
+
+        self.connection.executescript(SCHEMA)
+
+    def get(self, key):
+        """
+        Get the result stored for key, None if there is none.
+        """
+        try:
+            row = self.connection.execute("SELECT value, last_used FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, last_used = row
+            now = int(time.time())
+            if now - last_used > TOUCH_INTERVAL:
+                self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+
+            return _tuples(value=json.loads(s=value))
+
+        except (sqlite3.Error, ValueError, TypeError):
+            return None
+
+    def put(self, key, value):
+        data = json.dumps(obj=value, separators=(",", ":")).encode()
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), int(time.time())),
+            )
+            self.writes += 1
+            if self.writes % EVICT_EVERY == 1:
+                self.evict()
+
+        except sqlite3.Error:
+            # Cache is best effort.
+            pass
+
+    def evict(self):
+        """
+        Remove the least recently used entries while the results are over the size limit.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            excess = total - int(self.max_size * EVICT_TO)
+            if total > self.max_size:
+                keys = []
+                for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY last_used, rowid"):
+                    if excess <= 0:
+                        break
+
+                    keys.append((key,))
+                    excess -= size
+
+                self.connection.executemany("DELETE FROM results WHERE key = ?", keys)
+
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+        else:
+            self.connection.execute("COMMIT")
+
+
+def get_results_cache():
+    """
+    Get the results cache of the process, None if it is disabled or not usable.
+    """
+    global RESULTS_CACHE
+
+    if RESULTS_CACHE is None or (RESULTS_CACHE and RESULTS_CACHE.pid != os.getpid()):
+        # A connection is not shared with forked flake8 workers, every process opens its own.
+        try:
+            max_size = int(os.environ.get(RESULTS_CACHE_SIZE_ENV, DEFAULT_RESULTS_CACHE_SIZE)) * 2**20
+        except ValueError:
+            max_size = DEFAULT_RESULTS_CACHE_SIZE * 2**20
+
+        RESULTS_CACHE = False
+        if max_size > 0:
+            path = os.path.join(get_cache_dir(), f"results-v{RESULTS_CACHE_VERSION}.sqlite")
+            with contextlib.suppress(OSError, sqlite3.Error):
+                RESULTS_CACHE = ResultsCache(path=path, max_size=max_size)
+
+    return RESULTS_CACHE or None
+
+
+@functools.cache
+def get_code_digest(package):
+    """
+    Get the digest of the sources of a plugin package and of the shared utilities, results of a changed plugin
+    are not replayed even if its version was not bumped.
+    """
+    digest = hashlib.sha256()
+    for name in sorted({package, __package__}):
+        directory = os.path.dirname(sys.modules[name].__file__)
+        for filename in sorted(os.listdir(path=directory)):
+            if filename.endswith(".py"):
+                with open(os.path.join(directory, filename), "rb") as fd:
+                    digest.update(filename.encode())
+                    digest.update(fd.read())
+
+    return digest.hexdigest()
+
+
+def get_stat(filename):
+    """
+    Get the (mtime_ns, size) of a file a result depends on, None if it does not exist.
+    """
+    try:
+        stat = os.stat(path=filename)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _tuples(value):
+    """
+    Get a JSON value with its arrays as tuples, like the results were computed.
+    """
+    if isinstance(value, list):
+        return tuple(_tuples(value=item) for item in value)
+
+    return value
+
+
+def get_source(plugin):
+    """
+    Get the checked source of plugin: its lines, else the content of its file, None if it can't be read.
+    """
+    lines = getattr(plugin, "lines", None)
+    if lines is not None:
+        return "".join(lines).encode(errors="surrogatepass")
+
+    try:
+        with open(plugin.filename, "rb") as fd:
+            return fd.read()
+
+    except OSError:
+        return None
+
+
+def get_result_key(plugin, source, options=(), dependencies=()):
+    """
+    Get the key of the result of plugin on its file, source is the checked source (bytes).
+    """
+    package = type(plugin).__module__.split(".")[0]
+    digest = hashlib.sha256()
+    digest.update(
+        repr((
+            RESULTS_CACHE_VERSION,
+            plugin.name,
+            plugin.version,
+            get_code_digest(package=package),
+            sys.version_info[:2],
+            os.path.relpath(plugin.filename),
+            options,
+            dependencies,
+        )).encode()
+    )
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def get_file_result(plugin, compute, options=(), dependencies=()):
+    """
+    Get compute() for the file checked by plugin, replayed from the results cache when the source, the plugin and
+    its options did not change.
+
+    plugin needs a filename, the source is its lines or (for plugins which only take the tree) the content of the
+    file, without them (or with the cache disabled) compute is always called. The result must be made of JSON
+    values and tuples (replayed with tuples for all arrays) and must not depend on anything but the key parts.
+    """
+    cache = get_results_cache()
+    source = get_source(plugin=plugin) if cache is not None and plugin.filename else None
+    if source is None:
+        return compute()
+
+    key = get_result_key(plugin=plugin, source=source, options=options, dependencies=dependencies)
+    result = cache.get(key=key)
+    if result is not None:
+        count(counter="cache_hits")
+        return result
+
+    count(counter="cache_misses")
+    result = compute()
+    cache.put(key=key, value=result)
+    return result
@@ -0,0 +1,46 @@
+import json
+import os
+from subprocess import PIPE, Popen, run
+
+from PluginsUtils.metrics import METRICS_ENV
+
+first_content = """
+import os
+
+os.path.join("a", "b")
+"""
+
+second_content = """
+import os
+
+os.getenv("a", "b")
+os.getenv("c", "d")
+"""
+
+
+def test_metrics_parallel_run(tmpdir):
+    tmpdir.join("first.py").write(first_content)
+    tmpdir.join("second.py").write(second_content)
+    run(args=["git", "init", "-q"], cwd=str(tmpdir), check=True)
+    run(args=["git", "add", "."], cwd=str(tmpdir), check=True)
+    metrics_dir = tmpdir.join("metrics")
+    Popen(
+        args=["flake8", "--jobs=2", "--enable-extensions=FCN", "--select=FCN", "first.py", "second.py"],
+        stdout=PIPE,
+        stderr=PIPE,
+        cwd=str(tmpdir),
+        env={**os.environ, METRICS_ENV: str(metrics_dir)},
+    ).communicate()
+
+    # The counts of the workers are merged in the main process report.
+    report = json.loads(s=metrics_dir.join("flake8-plugins-metrics.json").read())
+    plugin = report["plugins"]["FunctionCallForceNames"]
+    assert plugin["files"] == 2
+    assert plugin["counters"]["calls_checked"] == 3
+    assert sorted(file["filename"] for file in report["slowest_files"]) == ["first.py", "second.py"]
+    assert not metrics_dir.join(".spool").check() or not metrics_dir.join(".spool").listdir()
+
+    openmetrics = metrics_dir.join("flake8-plugins-metrics.prom").read()
+    assert 'flake8_plugins_files_checked_total{plugin="FunctionCallForceNames"} 2\n' in openmetrics
+    assert 'flake8_plugins_calls_checked_total{plugin="FunctionCallForceNames"} 3\n' in openmetrics
+    assert openmetrics.endswith("# EOF\n")
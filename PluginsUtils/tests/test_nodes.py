@@ -0,0 +1,59 @@
+import ast
+
+from PluginsUtils.nodes import get_node_index
+
+module_content = """
+import os
+
+
+@decorator(arg=make())
+def function(value=default()):
+    def nested():
+        return os.getcwd()
+
+    return nested()
+
+
+class Outer:
+    class Inner:
+        def method(self):
+            from os import path
+
+            return path
+"""
+
+
+def test_node_index():
+    tree = ast.parse(source=module_content)
+    index = get_node_index(tree=tree)
+    function, nested, method = index.functions
+    outer, inner = index.classes
+
+    assert [func.name for func in index.functions] == ["function", "nested", "method"]
+    # Calls in the order of the tree fields (a function decorators after its body).
+    default, getcwd, nested_call, decorator, make = index.calls
+    assert [getattr(call.func, "id", getattr(call.func, "attr", None)) for call in index.calls] == [
+        "default",
+        "getcwd",
+        "nested",
+        "decorator",
+        "make",
+    ]
+    assert len(index.imports) == 2
+    assert [(node.name, deco.func.id) for node, deco in index.decorators] == [("function", "decorator")]
+    assert index.module_functions() == [function]
+    # Decorators and defaults are in the enclosing scope, the body in the function scope.
+    assert index.scope(node=make) is tree
+    assert index.scope(node=default) is tree
+    assert index.scope(node=nested_call) is function
+    assert index.scope(node=getcwd) is nested
+    assert index.parent(node=decorator) is function
+    assert index.is_in_classes(node=method)
+    assert not index.is_in_classes(node=nested)
+    assert index.enclosing_classes(node=method) == (outer, inner)
+
+
+def test_node_index_shared_by_plugins():
+    tree = ast.parse(source=module_content)
+    assert get_node_index(tree=tree) is get_node_index(tree=tree)
+    assert get_node_index(tree=ast.parse(source=module_content)) is not get_node_index(tree=tree)
@@ -0,0 +1,86 @@
+import os
+from subprocess import PIPE, Popen
+
+from PluginsUtils.cache import get_cache_dir
+from PluginsUtils.results import RESULTS_CACHE_VERSION, get_file_result
+
+
+class Plugin:
+    name = "Plugin"
+    version = "1.0.0"
+
+    def __init__(self, filename, lines=None):
+        self.filename = filename
+        self.lines = lines
+
+
+class TreePlugin:
+    name = "TreePlugin"
+    version = "1.0.0"
+
+    def __init__(self, filename):
+        self.filename = filename
+
+
+class Compute:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [(1, 0, "XXX001: finding", "Plugin")], [("ID-1", 1, 0, "test", (1, 0))]
+
+
+def test_results_cache_hit_and_invalidation(tmpdir):
+    filename = str(tmpdir.join("module.py"))
+    compute = Compute()
+    lines = ["import os\n"]
+
+    get_file_result(plugin=Plugin(filename=filename, lines=lines), compute=compute, options=("a",))
+    # Replayed with tuples for all arrays.
+    assert get_file_result(plugin=Plugin(filename=filename, lines=lines), compute=compute, options=("a",)) == (
+        ((1, 0, "XXX001: finding", "Plugin"),),
+        (("ID-1", 1, 0, "test", (1, 0)),),
+    )
+    assert compute.calls == 1
+
+    get_file_result(plugin=Plugin(filename=filename, lines=lines), compute=compute, options=("b",))
+    get_file_result(plugin=Plugin(filename=filename, lines=["import sys\n"]), compute=compute, options=("a",))
+    assert compute.calls == 3
+
+    path = os.path.join(get_cache_dir(), f"results-v{RESULTS_CACHE_VERSION}.sqlite")
+    assert os.stat(path=path).st_mode & 0o777 == 0o600
+
+
+def test_results_cache_tree_only_plugin(tmpdir):
+    module = tmpdir.join("module.py")
+    module.write("import os\n")
+    compute = Compute()
+
+    get_file_result(plugin=TreePlugin(filename=str(module)), compute=compute)
+    get_file_result(plugin=TreePlugin(filename=str(module)), compute=compute)
+    assert compute.calls == 1
+
+    # Keyed by the content of the file.
+    module.write("import sys\n")
+    get_file_result(plugin=TreePlugin(filename=str(module)), compute=compute)
+    assert compute.calls == 2
+
+
+def test_results_cache_options_change(tmpdir):
+    tmpdir.join("module.py").write('import os\n\nos.getenv("a", "b")\n')
+
+    def check_calls(args):
+        out, _ = Popen(
+            args=["flake8", "--enable-extensions=FCN", "--select=FCN", *args, "module.py"],
+            stdout=PIPE,
+            stderr=PIPE,
+            cwd=str(tmpdir),
+        ).communicate()
+        return out.decode("utf-8").count("FCN001")
+
+    assert check_calls(args=[]) == 1
+    assert check_calls(args=[]) == 1
+    # Findings cached with other options are not replayed.
+    assert check_calls(args=["--fcn_exclude_functions=getenv"]) == 0
+    assert check_calls(args=[]) == 1
@@ -5,76 +5,65 @@ flake8 extension check that every test has Polarion ID attach to it.
 import ast
 import re
 
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.metrics import measured
+from PluginsUtils.registry import ProjectRegistry, normalize_filename
+from PluginsUtils.results import get_file_result, get_stat
+from PolarionIds.catalog import PolarionCatalog, catalog_path
+from PolarionIds.fixtures import (  # noqa: F401
+    build_fixture_index,
+    find_func_in_tree,
+    get_conftest_fixture_indexes,
+    get_conftest_paths,
+    iter_fixture_polarion_ids,
+    iter_params_polarion_ids,
+    iter_polarion_ids_from_pytest_fixture,
+    resolve_fixture_params,
+)
+from PolarionIds.folding import ConstantFolder
+from PolarionIds.product import ParametrizeProduct, iter_tests
+
 PID001 = "PID001: [{f_name} ({params})], Polarion ID is missing"
 PID002 = "PID002: [{f_name} {pid}], Polarion ID is wrong"
-PID003 = "PID003: [{f_name} {pid}], Polarion ID is duplicate"
+PID003 = "PID003: [{f_name} {pid}], Polarion ID is duplicate, used in: {locations}"
 PID004 = "PID004: [{f_name} {pid}], Test have multiple Polarion IDs"
+PID005 = "PID005: [{f_name} {pid}], Polarion ID is {reason}"
+PID006 = (
+    "PID006: [{f_name} ({params})], Parametrize params are too many or too deep to fold, Polarion IDs are not checked"
+)
+POLARION_IDS = None
 
 
 def iter_test_functions(tree):
     """
     Get all test function from python file
     """
+    for _, func in iter_tests(tree=tree):
+        yield func
 
-    def is_test(elm):
-        return elm.name.startswith("test_")
-
-    def is_func(elm):
-        return isinstance(elm, ast.FunctionDef)
-
-    def test_func_in_class(elm):
-        for cls_elm in elm.body:
-            if isinstance(cls_elm, ast.ClassDef):
-                yield from test_func_in_class(elm=cls_elm)
-
-            if is_func(cls_elm) and is_test(cls_elm):
-                yield cls_elm
-
-    for elm in tree.body:
-        if isinstance(elm, ast.ClassDef):
-            func = test_func_in_class(elm=elm)
-            if func:
-                yield from func
-
-        elif is_func(elm) and is_test(elm):
-            yield elm
 
+def extract_polarion_ids(tree):
+    """
+    Get (polarion id, lineno, col_offset, test name) of all valid Polarion IDs in python file.
+    """
+    plugin = PolarionIds(tree=tree, filename=None)
+    for _ in plugin._check_tests():
+        continue
 
-def find_func_in_tree(tree, name):
-    for elm in tree.body:
-        if isinstance(elm, ast.FunctionDef) and elm.name == name:
-            return elm
+    for polarion_id, node, f in plugin.polarion_ids:
+        yield polarion_id, node.lineno, node.col_offset, f.name
 
 
-def iter_polarion_ids_from_pytest_fixture(tree, name):
-    func = find_func_in_tree(tree=tree, name=name)
-    if func:
-        if not func.decorator_list:
-            return None
+def get_polarion_ids_ledger():
+    """
+    Get the project Polarion IDs ledger, shared by all PolarionIds instances in the process.
+    """
+    global POLARION_IDS
 
-        for deco in func.decorator_list:
-            if not hasattr(deco, "func"):
-                continue
+    if POLARION_IDS is None:
+        POLARION_IDS = ProjectRegistry(name="pid-polarion-ids", extract=extract_polarion_ids)
 
-            if deco.func.value.id == "pytest" and deco.func.attr == "fixture":
-                for deco_keyword in deco.keywords:
-                    if deco_keyword.arg == "params":
-                        for deco_elts in deco_keyword.value.elts:
-                            has_polarion_id = False
-                            for deco_elts_keyword in deco_elts.keywords:
-                                if deco_elts_keyword.arg == "marks":
-                                    if isinstance(deco_elts_keyword.value, ast.Tuple):
-                                        for dekv in deco_elts_keyword.value.elts:
-                                            if dekv.func.attr == "polarion":
-                                                has_polarion_id = True
-                                                yield dekv.args[0]
-                                    else:
-                                        if deco_elts_keyword.value.func.attr == "polarion":
-                                            has_polarion_id = True
-                                            yield deco_elts_keyword.value.args[0]
-
-                            if not has_polarion_id:
-                                yield deco_elts
+    return POLARION_IDS
 
 
 class PolarionIds:
@@ -86,9 +75,15 @@ class PolarionIds:
     name = "PolarionIds"
     version = "1.0.0"
 
-    def __init__(self, tree):
+    def __init__(self, tree, filename, lines=None):
         self.tree = tree
+        self.filename = filename
+        self.lines = lines
+        self.fixture_index = None
+        self.folder = None
+        # (polarion id, polarion id node, test function) of all valid Polarion IDs in the file.
         self.polarion_ids = []
+        self.recorded_nodes = set()
 
     @classmethod
     def add_options(cls, option_manager):
@@ -99,10 +94,33 @@ class PolarionIds:
             comma_separated_list=False,
             help="Skip check for duplicate Polarion Ids.",
         )
+        option_manager.add_option(
+            long_option_name="--pid_catalog",
+            default="",
+            type=catalog_path,
+            parse_from_config=True,
+            help="Polarion catalog export (CSV, JSON or JSON Lines with id and status) to check that Polarion IDs "
+            "exist.",
+        )
+        option_manager.add_option(
+            long_option_name="--pid_catalog_obsolete_statuses",
+            default="obsolete,deleted",
+            parse_from_config=True,
+            comma_separated_list=True,
+            help="Catalog statuses of Polarion IDs which should not be used anymore.",
+        )
 
     @classmethod
     def parse_options(cls, options):
         cls.skip_duplicate_ids_check = ast.literal_eval(options.skip_duplicate_polarion_ids_check)
+        # Compiled and memory-mapped once in the main process, flake8 workers share the mapping.
+        cls.catalog = PolarionCatalog.from_export(path=options.pid_catalog) if options.pid_catalog else None
+        cls.catalog_obsolete_statuses = {status.lower() for status in options.pid_catalog_obsolete_statuses}
+        cls.result_options = (
+            options.pid_catalog,
+            get_stat(filename=options.pid_catalog) if options.pid_catalog else None,
+            sorted(cls.catalog_obsolete_statuses),
+        )
 
     def _non_decorated(self, f, params=""):
         yield (
@@ -124,24 +142,28 @@ class PolarionIds:
         yield (
             f.lineno,
             f.col_offset,
-            PID004.format(f_name=f.name, pid=[_arg.value for _arg in polarion_args]),
+            PID004.format(
+                f_name=f.name,
+                pid=[_arg.value if isinstance(_arg, ast.Constant) else ast.unparse(_arg) for _arg in polarion_args],
+            ),
             self.name,
         )
 
     def _if_bad_pid(self, f, polarion_id):
-        if not re.match(r"CNV-\d+", polarion_id):
+        if not re.match(r"CNV-\d+", polarion_id.value):
             yield (
                 f.lineno,
                 f.col_offset,
-                PID002.format(f_name=f.name, pid=polarion_id),
+                PID002.format(f_name=f.name, pid=polarion_id.value),
                 self.name,
             )
         else:
-            yield from self._is_polarion_id_duplicate(f=f, polarion_id=polarion_id)
+            yield from self._check_catalog(f=f, polarion_id=polarion_id.value, location=f)
+            self._record_polarion_id(f=f, polarion_id=polarion_id)
 
-    def _non_decorated_fixture(self, f, polarion_id):
+    def _non_decorated_fixture(self, f, polarion_id, location=None):
         param = ""
-        if isinstance(polarion_id, ast.Call):
+        if isinstance(polarion_id, ast.Call) and polarion_id.args:
             if isinstance(polarion_id.args[0], ast.Constant):
                 param = polarion_id.args[0].value
             if isinstance(polarion_id.args[0], ast.List):
@@ -149,141 +171,208 @@ class PolarionIds:
                     if isinstance(parg, ast.Constant):
                         param = parg.value
 
+        location = location or polarion_id
         yield (
-            polarion_id.lineno,
-            polarion_id.col_offset,
+            location.lineno,
+            location.col_offset,
             PID001.format(f_name=f.name, params=param),
             self.name,
         )
 
-    def _if_bad_pid_fixture(self, f, polarion_id):
+    def _if_bad_pid_fixture(self, f, polarion_id, location=None):
         if not re.match(r"CNV-\d+", polarion_id.value):
+            location = location or polarion_id
             yield (
-                polarion_id.lineno,
-                polarion_id.col_offset,
+                location.lineno,
+                location.col_offset,
                 PID002.format(f_name=f.name, pid=polarion_id.value),
                 self.name,
             )
         else:
-            yield from self._is_polarion_id_duplicate(f=f, polarion_id=polarion_id)
+            yield from self._check_catalog(f=f, polarion_id=polarion_id.value, location=location or polarion_id)
+            if not location:
+                self._record_polarion_id(f=f, polarion_id=polarion_id)
+
+    def _check_catalog(self, f, polarion_id, location):
+        if not self.catalog:
+            return
+
+        status = self.catalog.status(polarion_id=polarion_id)
+        if status is None or status in self.catalog_obsolete_statuses:
+            yield (
+                location.lineno,
+                location.col_offset,
+                PID005.format(
+                    f_name=f.name,
+                    pid=polarion_id,
+                    reason="not in the catalog" if status is None else f"{status} in the catalog",
+                ),
+                self.name,
+            )
+
+    def _get_folder(self):
+        # Parametrize params lists are folded once per module, see PolarionIds.folding.
+        if self.folder is None:
+            self.folder = ConstantFolder(tree=self.tree)
+
+        return self.folder
+
+    def _get_fixture_index(self):
+        # Built on first use and shared by all tests in the file.
+        if self.fixture_index is None:
+            self.fixture_index = build_fixture_index(tree=self.tree)
+
+        return self.fixture_index
+
+    def _get_fixture_polarion_ids(self, name):
+        """
+        Get the Polarion IDs of fixture name params and the conftest.py it is defined in (None for this module).
+        """
+        params, conftest = resolve_fixture_params(index=self._get_fixture_index(), filename=self.filename, name=name)
+        if params is None:
+            return (), None
+
+        return list(iter_params_polarion_ids(params=params)), conftest
 
     def _check_pytest_fixture_polarion_ids(self, f):
         exist = False
         for f_arg in f.args.args:
-            for polarion_id in iter_polarion_ids_from_pytest_fixture(self.tree, f_arg.arg):
+            polarion_ids, conftest = self._get_fixture_polarion_ids(name=f_arg.arg)
+            # Findings of fixtures from conftest.py are reported on the test,
+            # their IDs are not in the duplicates ledger.
+            location = f if conftest else None
+            for polarion_id in polarion_ids:
                 exist = True
                 if isinstance(polarion_id, ast.Constant):
-                    yield from self._if_bad_pid_fixture(f=f, polarion_id=polarion_id)
+                    yield from self._if_bad_pid_fixture(f=f, polarion_id=polarion_id, location=location)
                 else:
-                    yield from self._non_decorated_fixture(f=f, polarion_id=polarion_id)
+                    yield from self._non_decorated_fixture(f=f, polarion_id=polarion_id, location=location)
         if not exist:
             yield from self._non_decorated(f=f)
 
-    def _is_polarion_id_duplicate(self, f, polarion_id):
-        if self.skip_duplicate_ids_check:
-            return
+    def _record_polarion_id(self, f, polarion_id):
+        # Class level marks are checked with every test of the class, they are recorded once.
+        if id(polarion_id) not in self.recorded_nodes:
+            self.recorded_nodes.add(id(polarion_id))
+            self.polarion_ids.append((polarion_id.value, polarion_id, f))
 
-        if polarion_id in self.polarion_ids:
-            yield (
-                f.lineno,
-                f.col_offset,
-                PID003.format(f_name=f.name, pid=polarion_id),
-                self.name,
-            )
-        else:
-            self.polarion_ids.append(polarion_id)
+    def _check_duplicate_polarion_ids(self, polarion_ids):
+        """
+        Check that Polarion IDs are unique in the whole project.
 
+        Polarion IDs of all project files are kept in a ledger shared by flake8 workers,
+        every use of an ID except the first one (by file and line) is reported with all the places it is used in.
+        """
+        ledger = get_polarion_ids_ledger()
+        ledger.record(
+            filename=self.filename,
+            records=[(pid, lineno, col_offset, test) for pid, lineno, col_offset, test, _ in polarion_ids],
+        )
+        filename = normalize_filename(filename=self.filename)
+        for polarion_id, lineno, col_offset, test, test_location in polarion_ids:
+            locations = ledger.locations(name=polarion_id)
+            if len(locations) > 1 and locations[0][:3] != (filename, lineno, col_offset):
+                yield (
+                    *test_location,
+                    PID003.format(
+                        f_name=test,
+                        pid=polarion_id,
+                        locations=", ".join(
+                            f"{_filename}:{lineno} ({test})" for _filename, lineno, _, test in locations
+                        ),
+                    ),
+                    self.name,
+                )
+
+    @measured
     def run(self):
         """
         Check that every test has a Polarion ID
         """
-        for f in iter_test_functions(self.tree):
-            sorted_doce_list = []
-            polarion_mark_exists = False
-            if not f.decorator_list:
+        findings, polarion_ids = get_file_result(
+            plugin=self, compute=self._check_file, options=self.result_options, dependencies=self._conftest_stats()
+        )
+        yield from findings
+        if not self.skip_duplicate_ids_check:
+            yield from self._check_duplicate_polarion_ids(polarion_ids=polarion_ids)
+
+    def _check_file(self):
+        """
+        Get the findings of the file checks and (polarion id, lineno, col_offset, test name, test location) of its
+        valid Polarion IDs, the project wide duplicates check is not part of them.
+        """
+        findings = list(self._check_tests())
+        polarion_ids = [
+            (pid, node.lineno, node.col_offset, f.name, (f.lineno, f.col_offset)) for pid, node, f in self.polarion_ids
+        ]
+        return findings, polarion_ids
+
+    def _conftest_stats(self):
+        # Fixtures Polarion IDs are looked up in the conftest.py files above the file.
+        if not self.filename:
+            return []
+
+        return [(conftest, get_stat(filename=conftest)) for conftest in get_conftest_paths(filename=self.filename)]
+
+    def _check_polarion_mark(self, f, mark):
+        if len(mark.args) > 1:
+            yield from self._multiple_ids(f=f, polarion_args=mark.args)
+
+        if not mark.args:
+            yield from self._non_decorated(f=f)
+
+        elif isinstance(mark.args[0], ast.Constant):
+            yield from self._if_bad_pid(f=f, polarion_id=mark.args[0])
+
+    def _missing_param_id(self, f, axis, param, items, size):
+        params = f"{axis.name}={param.param_id}"
+        if items > 1:
+            params = f"{params}, {items} of {size} items"
+
+        # Params without keywords are reported on the param, params with other marks on the test.
+        if not isinstance(param.node, ast.Call) or not param.node.keywords:
+            yield from self._non_decorated_elt(f=f, elt=param.node, params=params)
+        else:
+            yield from self._non_decorated(f=f, params=params)
+
+    def _over_budget(self, f, axis):
+        yield (
+            axis.deco.lineno,
+            axis.deco.col_offset,
+            PID006.format(f_name=f.name, params=axis.name),
+            self.name,
+        )
+
+    def _check_tests(self):
+        for classes, f in iter_tests(tree=self.tree):
+            product = ParametrizeProduct.from_test(
+                func=f, classes=classes, folder=self._get_folder(), resolver=get_decorator_resolver(tree=self.tree)
+            )
+            for axis in product.over_budget_axes:
+                yield from self._over_budget(f=f, axis=axis)
+
+            if not product.marks and not product.carrying_axes():
+                if product.over_budget_axes:
+                    # The IDs may be in the params which were not folded.
+                    continue
+
                 # Test is missing Polarion ID, check if test use parametrize fixture
                 # with Polarion ID.
                 yield from self._check_pytest_fixture_polarion_ids(f=f)
                 continue
 
-            for deco in f.decorator_list:
-                if not hasattr(deco, "func"):
-                    continue
+            for mark in product.marks:
+                yield from self._check_polarion_mark(f=f, mark=mark)
 
-                if deco.func.value.value.id == "pytest" and deco.func.value.attr == "mark":
-                    if deco.func.attr == "polarion":
-                        sorted_doce_list.insert(0, deco)
-
-                    elif deco.func.attr == "parametrize":
-                        sorted_doce_list.append(deco)
-
-            for deco in sorted_doce_list:
-                if deco.func.attr == "polarion":
-                    polarion_mark_exists = True
-                    if len(deco.args) > 1:
-                        yield from self._multiple_ids(f=f, polarion_args=deco.args)
-                    if deco.args:
-                        yield from self._if_bad_pid(f=f, polarion_id=deco.args[0].value)
-                    else:
-                        yield from self._non_decorated(f=f)
-                    break
-
-                elif deco.func.attr == "parametrize":
-                    if deco.args:
-                        for arg in deco.args:
-                            if not isinstance(arg, ast.List):
-                                continue
-
-                            for elt in arg.elts:
-                                if isinstance(elt, ast.Dict):
-                                    continue
-
-                                if not isinstance(elt, ast.Call):
-                                    yield from self._non_decorated_elt(f=f, elt=elt, params=elt.value)
-                                    continue
-
-                                if not elt.keywords:
-                                    yield from self._non_decorated_elt(f=f, elt=elt)
-
-                                for pk in elt.keywords:
-                                    # In case parametrize have id=
-                                    if pk.arg == "id":
-                                        continue
-
-                                    # In case of multiple marks on test param
-                                    if isinstance(pk.value, (ast.Tuple, ast.List)):
-                                        for elt_val in pk.value.elts:
-                                            if not hasattr(elt_val, "args") or not hasattr(elt_val, "func"):
-                                                continue
-
-                                            if isinstance(elt_val, ast.Attribute):
-                                                continue
-
-                                            if len(elt_val.args) > 1:
-                                                yield from self._multiple_ids(
-                                                    f=f,
-                                                    polarion_args=elt_val.args,
-                                                )
-
-                                            if elt_val.func.attr == "polarion":
-                                                polarion_mark_exists = True
-                                                yield from self._if_bad_pid(
-                                                    f=f,
-                                                    polarion_id=elt_val.args[0].value,
-                                                )
-
-                                    # In case one mark on test param
-                                    elif pk.arg == "marks" and pk.value.func.attr == "polarion":
-                                        if len(pk.value.args) > 1:
-                                            yield from self._multiple_ids(f=f, polarion_args=pk.value.args)
-                                        polarion_mark_exists = True
-                                        yield from self._if_bad_pid(f=f, polarion_id=pk.value.args[0].value)
-
-                                    else:
-                                        # In case no mark on test param
-                                        yield from self._non_decorated(f=f, params=elt.args[0].value)
-                else:
-                    yield from self._non_decorated(f=f)
+            for axis in product.axes:
+                for param in axis.params:
+                    for mark in param.polarion_marks:
+                        yield from self._check_polarion_mark(f=f, mark=mark)
+
+            # Items are checked per axis, the product of the axes is never enumerated.
+            size = product.size()
+            for axis, param, items in product.iter_missing():
+                yield from self._missing_param_id(f=f, axis=axis, param=param, items=items, size=size)
 
-            if not polarion_mark_exists:
-                yield from self._non_decorated(f=f)
+            if product.max_ids() > 1:
+                yield from self._multiple_ids(f=f, polarion_args=[mark.args[0] for mark in product.max_ids_item()])
@@ -0,0 +1,28 @@
+"""
+Export the tests Polarion IDs map as JSON Lines, one record per Polarion ID.
+
+python -m PolarionIds [-o OUTPUT] [--jobs N] [paths ...]
+"""
+
+import argparse
+import sys
+
+from PolarionIds.export import export
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m PolarionIds", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=["."], help="Tests directories or files.")
+    parser.add_argument("-o", "--output", default="-", help="Output file, standard output by default.")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of processes, all cores by default.")
+    args = parser.parse_args(args=argv)
+
+    if args.output == "-":
+        export(paths=args.paths, output=sys.stdout, processes=args.jobs)
+    else:
+        with open(args.output, "w", encoding="utf-8") as fd:
+            export(paths=args.paths, output=fd, processes=args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Local Polarion catalog (export of valid Polarion IDs and their status) lookup.
+
+The export (CSV, JSON or JSON Lines) is compiled once into a sorted binary file in the cache directory, the file is
+memory-mapped so all flake8 workers share the same pages, and IDs are looked up by binary search. Compiled files of
+an older version of the export are removed when it is compiled again.
+
+Compiled file layout:
+    header: magic, key width, records count, statuses count
+    statuses: for each status, its length (uint16) and its UTF-8 bytes
+    records: sorted by ID, the ID NUL padded to key width followed by its status index (uint8)
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+from PluginsUtils.cache import dump_bytes, get_cache_dir
+
+MAGIC = b"PIDCAT01"
+HEADER = struct.Struct("<8sIII")
+STATUS_LENGTH = struct.Struct("<H")
+ACTIVE_STATUS = "active"
+
+
+def catalog_path(value):
+    """
+    Type of the `--pid_catalog` option, the export must exist.
+    """
+    if value and not os.path.isfile(value):
+        raise argparse.ArgumentTypeError(f"file not found: {value}")
+
+    return value
+
+
+def _catalog_record(record):
+    return str(record["id"]), str(record.get("status") or ACTIVE_STATUS)
+
+
+def iter_catalog_records(path):
+    """
+    Get (polarion id, status) from a catalog export.
+
+    JSON exports are an array of objects and JSON Lines exports an object per line, with `id` and optional
+    `status` keys.
+    CSV files have a header with `id` and optional `status` columns, without it the first column is the ID
+    and the second the status.
+    """
+    with open(path, encoding="utf-8", newline="") as fd:
+        if path.endswith(".json"):
+            for record in json.load(fp=fd):
+                yield _catalog_record(record=record)
+
+            return
+
+        if path.endswith(".jsonl"):
+            for line in fd:
+                if line.strip():
+                    yield _catalog_record(record=json.loads(s=line))
+
+            return
+
+        rows = csv.reader(fd)
+        header = [column.strip().lower() for column in next(rows, [])]
+        id_column, status_column = 0, 1
+        if "id" in header:
+            id_column = header.index("id")
+            status_column = header.index("status") if "status" in header else None
+        elif header:
+            yield header[0], header[1] if len(header) > 1 and header[1] else ACTIVE_STATUS
+
+        for row in rows:
+            if len(row) > id_column and row[id_column].strip():
+                status = row[status_column].strip() if status_column is not None and len(row) > status_column else ""
+                yield row[id_column].strip(), status or ACTIVE_STATUS
+
+
+def compile_catalog(records):
+    """
+    Get the compiled catalog bytes of (polarion id, status) records, the last status of an ID wins.
+    """
+    catalog = {}
+    for polarion_id, status in records:
+        catalog[polarion_id.encode()] = status.lower()
+
+    statuses = sorted(set(catalog.values()))
+    if len(statuses) > 255:
+        raise ValueError(f"Polarion catalog has too many statuses ({len(statuses)}), at most 255 are supported")
+
+    status_index = {status: idx for idx, status in enumerate(statuses)}
+    key_width = max((len(key) for key in catalog), default=1)
+    chunks = [HEADER.pack(MAGIC, key_width, len(catalog), len(statuses))]
+    for status in statuses:
+        encoded = status.encode()
+        chunks.extend((STATUS_LENGTH.pack(len(encoded)), encoded))
+
+    for key in sorted(catalog):
+        chunks.extend((key.ljust(key_width, b"\0"), bytes((status_index[catalog[key]],))))
+
+    return b"".join(chunks)
+
+
+def remove_stale_catalogs(compiled_dir, path_key, keep):
+    """
+    Remove the compiled files of the older versions of an export, mappings other processes hold stay valid.
+    """
+    with contextlib.suppress(OSError):
+        for filename in os.listdir(path=compiled_dir):
+            compiled_path = os.path.join(compiled_dir, filename)
+            if filename.startswith(f"{path_key}-") and compiled_path != keep:
+                with contextlib.suppress(OSError):
+                    os.remove(path=compiled_path)
+
+
+class PolarionCatalog:
+    """
+    Compiled Polarion catalog, data is the memory-mapped compiled file.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        magic, self.key_width, self.count, statuses_count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a compiled Polarion catalog")
+
+        offset = HEADER.size
+        self.statuses = []
+        for _ in range(statuses_count):
+            (length,) = STATUS_LENGTH.unpack_from(self.data, offset)
+            offset += STATUS_LENGTH.size
+            self.statuses.append(self.data[offset : offset + length].decode())
+            offset += length
+
+        self.records_offset = offset
+        self.record_size = self.key_width + 1
+
+    @classmethod
+    def from_compiled(cls, compiled_path):
+        with open(compiled_path, "rb") as fd:
+            return cls(data=mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_export(cls, path):
+        """
+        Get the catalog of an export, compiling it only if the export changed since it was last compiled.
+        """
+        stat = os.stat(path=path)
+        # <export path hash>-<export version hash>.bin, the compiled files of other versions of the export are stale.
+        path_key = hashlib.sha1(string=f"{MAGIC}:{os.path.abspath(path)}".encode()).hexdigest()
+        version_key = hashlib.sha1(string=f"{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()
+        compiled_dir = os.path.join(get_cache_dir(), "pid-catalog")
+        compiled_path = os.path.join(compiled_dir, f"{path_key}-{version_key}.bin")
+        if not os.path.isfile(compiled_path):
+            compiled = compile_catalog(records=iter_catalog_records(path=path))
+            if not dump_bytes(path=compiled_path, data=compiled):
+                # Cache directory is not writable, keep the compiled catalog in an anonymous map.
+                data = mmap.mmap(-1, len(compiled))
+                data.write(compiled)
+                return cls(data=data)
+
+            remove_stale_catalogs(compiled_dir=compiled_dir, path_key=path_key, keep=compiled_path)
+
+        return cls.from_compiled(compiled_path=compiled_path)
+
+    def status(self, polarion_id):
+        """
+        Get the status of polarion_id, None if it is not in the catalog.
+        """
+        key = polarion_id.encode()
+        if len(key) > self.key_width:
+            return None
+
+        key = key.ljust(self.key_width, b"\0")
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            offset = self.records_offset + mid * self.record_size
+            mid_key = self.data[offset : offset + self.key_width]
+            if mid_key < key:
+                low = mid + 1
+            elif mid_key > key:
+                high = mid
+            else:
+                return self.statuses[self.data[offset + self.key_width]]
+
+        return None
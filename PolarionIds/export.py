@@ -0,0 +1,104 @@
+"""
+Static export of the tests Polarion IDs map, without importing or collecting the tests.
+
+Every Polarion ID PID finds is exported as a record:
+    module, class, test, param_id (None for a test level mark), fixture (for fixture params), polarion_id, line
+Test files are parsed in parallel and their records are streamed as JSON Lines as soon as a file is done.
+"""
+
+import ast
+import json
+
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.files import is_test_file, iter_python_files
+from PluginsUtils.imports import module_name
+from PluginsUtils.parallel import parallel_imap
+from PolarionIds.fixtures import build_fixture_index, resolve_fixture_params
+from PolarionIds.folding import ConstantFolder
+from PolarionIds.product import ParametrizeProduct, get_param_id, iter_tests
+
+
+def _polarion_id(mark):
+    """
+    Get the Polarion ID of a `pytest.mark.polarion(...)` call, None if it is not a literal string.
+    """
+    if mark.args and isinstance(mark.args[0], ast.Constant) and isinstance(mark.args[0].value, str):
+        return mark.args[0].value
+
+
+def _iter_test_polarion_ids(tree, filename, func, classes, folder, fixture_index):
+    """
+    Get (param id, fixture, polarion id) of a test, fixtures are resolved from the module fixture index and the
+    conftest.py indexes like the checks do.
+    """
+    product = ParametrizeProduct.from_test(
+        func=func, classes=classes, folder=folder, resolver=get_decorator_resolver(tree=tree)
+    )
+    for mark in product.marks:
+        polarion_id = _polarion_id(mark=mark)
+        if polarion_id:
+            yield None, None, polarion_id
+
+    for axis in product.axes:
+        for param in axis.params:
+            for mark in param.polarion_marks:
+                polarion_id = _polarion_id(mark=mark)
+                if polarion_id:
+                    yield param.param_id, None, polarion_id
+
+    for arg in func.args.args:
+        params, _ = resolve_fixture_params(index=fixture_index, filename=filename, name=arg.arg)
+        for index, (param, polarion_ids) in enumerate(params or []):
+            for polarion_id_node in polarion_ids:
+                if isinstance(polarion_id_node, ast.Constant):
+                    yield get_param_id(param=param, argnames=[arg.arg], index=index), arg.arg, polarion_id_node.value
+
+
+def iter_polarion_records(tree, filename):
+    """
+    Get the Polarion IDs records of a parsed test module.
+    """
+    module = module_name(filename=filename)
+    folder = ConstantFolder(tree=tree)
+    fixture_index = build_fixture_index(tree=tree)
+    for classes, func in iter_tests(tree=tree):
+        for param_id, fixture, polarion_id in _iter_test_polarion_ids(
+            tree=tree, filename=filename, func=func, classes=classes, folder=folder, fixture_index=fixture_index
+        ):
+            yield {
+                "module": module,
+                "class": "::".join(_class.name for _class in classes) or None,
+                "test": func.name,
+                "param_id": param_id,
+                "fixture": fixture,
+                "polarion_id": polarion_id,
+                "line": func.lineno,
+            }
+
+
+def export_file(filename):
+    """
+    Get the JSON Lines of a test module records, a file is the unit of work sent to the worker processes.
+    """
+    try:
+        with open(filename, "rb") as fd:
+            tree = ast.parse(fd.read(), filename=filename)
+
+    except (OSError, SyntaxError, ValueError):
+        return ""
+
+    return "".join(f"{json.dumps(obj=record)}\n" for record in iter_polarion_records(tree=tree, filename=filename))
+
+
+def export(paths, output, processes=None):
+    """
+    Write the Polarion IDs records of all test files in paths to output, return the number of test files.
+    """
+    count = 0
+    for lines in parallel_imap(
+        func=export_file, items=iter_python_files(paths=paths, match=is_test_file), processes=processes
+    ):
+        output.write(lines)
+        count += 1
+
+    return count
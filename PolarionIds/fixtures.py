@@ -0,0 +1,209 @@
+"""
+Parametrized fixtures Polarion IDs lookup, in the test module and in the conftest.py files above it.
+"""
+
+import ast
+import functools
+import hashlib
+import os
+
+from PluginsUtils.cache import dump_pickle, get_project_cache_dir, load_pickle
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.metrics import count
+from PluginsUtils.nodes import get_node_index
+
+CONFTEST_INDEX_VERSION = 3
+# conftest.py path -> ((mtime_ns, size), fixture index), shared by all files checked in the process.
+CONFTEST_INDEXES = {}
+
+
+def find_func_in_tree(tree, name):
+    for elm in get_node_index(tree=tree).module_functions():
+        if isinstance(elm, ast.FunctionDef) and elm.name == name:
+            return elm
+
+
+def _polarion_mark_ids(marks):
+    """
+    Get the Polarion IDs nodes of the `polarion` marks of a param marks, a mark without argument gives no ID.
+    """
+    for mark in marks.elts if isinstance(marks, ast.Tuple) else [marks]:
+        if getattr(getattr(mark, "func", None), "attr", None) == "polarion" and mark.args:
+            yield mark.args[0]
+
+
+def iter_fixture_params(func, resolver):
+    """
+    Get (param, Polarion IDs nodes in its marks) of a parametrized fixture params.
+    """
+    for deco in resolver.iter_decorators(node=func, kind="fixture"):
+        if deco.call:
+            for deco_keyword in deco.call.keywords:
+                if deco_keyword.arg == "params":
+                    for deco_elts in getattr(deco_keyword.value, "elts", []):
+                        polarion_ids = []
+                        for deco_elts_keyword in getattr(deco_elts, "keywords", []):
+                            if deco_elts_keyword.arg == "marks":
+                                polarion_ids.extend(_polarion_mark_ids(marks=deco_elts_keyword.value))
+
+                        yield deco_elts, polarion_ids
+
+
+def iter_params_polarion_ids(params):
+    """
+    Get the Polarion IDs of (param, Polarion IDs nodes) params, params without Polarion ID are returned as is.
+    """
+    for param, polarion_ids in params:
+        if polarion_ids:
+            yield from polarion_ids
+        else:
+            yield param
+
+
+def iter_fixture_polarion_ids(func, resolver):
+    """
+    Get the Polarion IDs of a parametrized fixture params, params without Polarion ID are returned as is.
+    """
+    yield from iter_params_polarion_ids(params=iter_fixture_params(func=func, resolver=resolver))
+
+
+def iter_polarion_ids_from_pytest_fixture(tree, name):
+    func = find_func_in_tree(tree=tree, name=name)
+    if func:
+        yield from iter_fixture_polarion_ids(func=func, resolver=get_decorator_resolver(tree=tree))
+
+
+def build_fixture_index(tree):
+    """
+    Get name -> (param, Polarion IDs nodes) of its params (see iter_fixture_params) for all module level functions,
+    the first definition of a name wins like in find_func_in_tree.
+    """
+    index = {}
+    resolver = get_decorator_resolver(tree=tree)
+    for elm in get_node_index(tree=tree).module_functions():
+        if isinstance(elm, ast.FunctionDef) and elm.name not in index:
+            index[elm.name] = list(iter_fixture_params(func=elm, resolver=resolver))
+
+    return index
+
+
+def _stat(filename):
+    try:
+        stat = os.stat(path=filename)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_conftest_fixture_index(conftest):
+    """
+    Get the fixture index (see build_fixture_index) of a conftest.py file.
+
+    Indexes are kept in memory for the process and on disk for the next runs, both are invalidated when the
+    conftest.py mtime or size change.
+    """
+    stat = _stat(filename=conftest)
+    cached = CONFTEST_INDEXES.get(conftest)
+    if cached and cached[0] == stat:
+        count(counter="cache_hits")
+        return cached[1]
+
+    cache_path = os.path.join(
+        get_project_cache_dir(),
+        f"pid-conftest-v{CONFTEST_INDEX_VERSION}",
+        f"{hashlib.sha1(string=conftest.encode()).hexdigest()}.pickle",
+    )
+    cached = load_pickle(path=cache_path)
+    count(counter="cache_hits" if cached and cached[0] == stat else "cache_misses")
+    if not cached or cached[0] != stat:
+        try:
+            with open(conftest, "rb") as fd:
+                index = build_fixture_index(tree=ast.parse(fd.read(), filename=conftest))
+
+        except (OSError, SyntaxError, ValueError):
+            index = {}
+
+        cached = (stat, index)
+        dump_pickle(path=cache_path, obj=cached)
+
+    CONFTEST_INDEXES[conftest] = cached
+    return cached[1]
+
+
+@functools.cache
+def _git_top_level(directory):
+    """
+    Get the nearest directory above (or at) directory with a `.git`, None out of a git repository.
+    """
+    if os.path.exists(os.path.join(directory, ".git")):
+        return directory
+
+    parent = os.path.dirname(directory)
+    return None if parent == directory else _git_top_level(directory=parent)
+
+
+def _is_project_root(directory):
+    """
+    Check if the conftest.py lookup stops at directory: the current directory (flake8 runs from the project root),
+    the git top level, or out of a git repository a directory whose parent is not a package nor has a conftest.py
+    (like pytest rootdir).
+    """
+    parent = os.path.dirname(directory)
+    if directory == os.getcwd() or parent == directory:
+        return True
+
+    top_level = _git_top_level(directory=directory)
+    if top_level:
+        return directory == top_level
+
+    return not any(os.path.isfile(os.path.join(parent, name)) for name in ("__init__.py", "conftest.py"))
+
+
+@functools.cache
+def _conftest_paths(directory):
+    """
+    Get the conftest.py files pytest loads for tests in directory, nearest first, up to the project root (see
+    _is_project_root). Cached per directory so sibling directories share the lookup of their parents.
+    """
+    conftests = ()
+    conftest = os.path.join(directory, "conftest.py")
+    if os.path.isfile(conftest):
+        conftests = (conftest,)
+
+    if _is_project_root(directory=directory):
+        return conftests
+
+    return conftests + _conftest_paths(directory=os.path.dirname(directory))
+
+
+def get_conftest_paths(filename):
+    """
+    Get the conftest.py files above filename, nearest first.
+    """
+    return _conftest_paths(directory=os.path.dirname(os.path.abspath(filename)))
+
+
+def get_conftest_fixture_indexes(filename):
+    """
+    Get (conftest.py path, fixture index) of all conftest.py files above filename, nearest first.
+    """
+    for conftest in get_conftest_paths(filename=filename):
+        yield conftest, get_conftest_fixture_index(conftest=conftest)
+
+
+def resolve_fixture_params(index, filename, name):
+    """
+    Get (params, conftest.py path) of fixture name the way pytest resolves it: index (of the test module) first,
+    then the conftest.py files above filename from the nearest. conftest is None for the test module, params is
+    None if the fixture is not found.
+    """
+    if name in index:
+        return index[name], None
+
+    if filename:
+        for conftest, conftest_index in get_conftest_fixture_indexes(filename=filename):
+            if name in conftest_index:
+                return conftest_index[name], conftest
+
+    return None, None
@@ -0,0 +1,377 @@
+"""
+Constant folding of parametrize argvalues built in module level constants, concatenations and comprehensions.
+
+A list is folded to the nodes of its elements (`pytest.param(...)` calls, literals), once per module:
+module level names are resolved from a symbol table and memoized, so tests sharing a params list don't fold it again.
+A name is resolved from the module level statements before the line it is used on, names bound more than once
+(other than by `+=`) are not statically known.
+Anything not statically known is not folded (None) and left unchecked, folding over the MAX_ELEMENTS or MAX_DEPTH
+budgets raises FoldingBudgetExceeded so the test is reported as not checked.
+"""
+
+import ast
+import itertools
+
+MAX_ELEMENTS = 100_000
+MAX_DEPTH = 32
+
+
+class FoldingBudgetExceeded(Exception):
+    pass
+
+
+def _iter_bound_names(node):
+    """
+    Get the names a module level statement binds, without the ones bound in nested scopes.
+    """
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        yield node.name
+        return
+
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        for alias in node.names:
+            yield (alias.asname or alias.name).split(".")[0]
+
+        return
+
+    if isinstance(node, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+        return
+
+    if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+        yield node.id
+
+    for child in ast.iter_child_nodes(node):
+        yield from _iter_bound_names(node=child)
+
+
+def _iter_loaded_names(node):
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+            yield child.id
+
+
+def _constant(value, node):
+    return ast.Constant(
+        value=value,
+        lineno=node.lineno,
+        col_offset=node.col_offset,
+        end_lineno=node.end_lineno,
+        end_col_offset=node.end_col_offset,
+    )
+
+
+def _fold_joined_str(node):
+    """
+    Get an f-string with only literal values as a Constant.
+    """
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.FormattedValue):
+            if value.conversion != -1 or value.format_spec or not isinstance(value.value, ast.Constant):
+                return node
+
+            value = value.value
+
+        if not isinstance(value, ast.Constant):
+            return node
+
+        parts.append(str(value.value))
+
+    return _constant(value="".join(parts), node=node)
+
+
+def _compile_template(node, names):
+    """
+    Get a function which returns a copy of node with names replaced by their value in the bindings it is called with.
+
+    Compiled once per comprehension, subtrees without any of names are shared by all the copies and only the
+    nodes above a name are rebuilt.
+    """
+    if isinstance(node, ast.Name) and node.id in names:
+        return lambda bindings: bindings[node.id]
+
+    fields = []
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            templates = [
+                _compile_template(node=_value, names=names) if isinstance(_value, ast.AST) else None for _value in value
+            ]
+            if any(templates):
+                fields.append((field, value, templates))
+
+        elif isinstance(value, ast.AST):
+            template = _compile_template(node=value, names=names)
+            if template:
+                fields.append((field, value, template))
+
+    if not fields:
+        return None
+
+    cls = type(node)
+
+    def build(bindings):
+        # Cheaper than copy.copy, this runs for every element of generated lists.
+        new = cls.__new__(cls)
+        new.__dict__.update(node.__dict__)
+        for field, value, template in fields:
+            if isinstance(template, list):
+                new.__dict__[field] = [
+                    _template(bindings=bindings) if _template else _value for _value, _template in zip(value, template)
+                ]
+            else:
+                new.__dict__[field] = template(bindings=bindings)
+
+        return _fold_joined_str(node=new) if cls is ast.JoinedStr else new
+
+    return build
+
+
+def _target_names(target):
+    if isinstance(target, ast.Name):
+        return [target.id]
+
+    if isinstance(target, (ast.Tuple, ast.List)):
+        names = []
+        for elt in target.elts:
+            target_names = _target_names(target=elt)
+            if target_names is None:
+                return None
+
+            names.extend(target_names)
+
+        return names
+
+    return None
+
+
+def _bind(target, value, bindings):
+    """
+    Bind a comprehension target to a folded value, False if the value can't be unpacked to the target.
+    """
+    if isinstance(target, ast.Name):
+        bindings[target.id] = value
+        return True
+
+    if not isinstance(value, (ast.Tuple, ast.List)) or len(value.elts) != len(target.elts):
+        return False
+
+    return all(_bind(target=elt, value=elt_value, bindings=bindings) for elt, elt_value in zip(target.elts, value.elts))
+
+
+class ConstantFolder:
+    """
+    Fold parametrize argvalues of a module.
+    """
+
+    def __init__(self, tree, max_elements=MAX_ELEMENTS, max_depth=MAX_DEPTH):
+        self.max_elements = max_elements
+        self.max_depth = max_depth
+        # name -> [(lineno, value, augmented), ...] of its module level bindings, value is None if it can't be known.
+        self.symbols = {}
+        # Names bound more than once (not counting `+=`), their value depends on the execution order.
+        self.rebound = set()
+        # node id -> (node, folded elements), (name, bindings count) -> folded elements, None if not foldable.
+        self._memo = {}
+        self._names = {}
+        for elm in tree.body:
+            if isinstance(elm, ast.Assign) and len(elm.targets) == 1 and isinstance(elm.targets[0], ast.Name):
+                self._bind_symbol(name=elm.targets[0].id, lineno=elm.lineno, value=elm.value)
+
+            elif isinstance(elm, ast.AnnAssign) and isinstance(elm.target, ast.Name):
+                if elm.value is not None:
+                    self._bind_symbol(name=elm.target.id, lineno=elm.lineno, value=elm.value)
+
+            elif isinstance(elm, ast.AugAssign) and isinstance(elm.target, ast.Name):
+                self.symbols.setdefault(elm.target.id, []).append((
+                    elm.lineno,
+                    elm.value if isinstance(elm.op, ast.Add) else None,
+                    True,
+                ))
+
+            else:
+                for name in set(_iter_bound_names(node=elm)):
+                    self._bind_symbol(name=name, lineno=elm.lineno, value=None)
+
+    def _bind_symbol(self, name, lineno, value):
+        bindings = self.symbols.setdefault(name, [])
+        if any(not augmented for _, _, augmented in bindings):
+            self.rebound.add(name)
+
+        bindings.append((lineno, value, False))
+
+    def fold(self, node):
+        """
+        Get the elements nodes of a params list expression, None if it is not statically known.
+
+        Raises FoldingBudgetExceeded if it is over the elements or depth budgets.
+        """
+        try:
+            return self._fold(node=node, depth=0, resolving=frozenset())
+        except RecursionError:
+            raise FoldingBudgetExceeded from None
+
+    def _check_size(self, elements):
+        if elements is not None and len(elements) > self.max_elements:
+            raise FoldingBudgetExceeded
+
+        return elements
+
+    def _fold(self, node, depth, resolving):
+        if depth > self.max_depth:
+            raise FoldingBudgetExceeded
+
+        # The node is kept in the memo so its id is not reused while the folder is alive.
+        key = id(node)
+        if key not in self._memo:
+            self._memo[key] = node, self._fold_node(node=node, depth=depth + 1, resolving=resolving)
+
+        return self._memo[key][1]
+
+    def _fold_name(self, name, lineno, depth, resolving):
+        """
+        Fold the value name has on lineno, from the module level statements before it.
+        """
+        # A name in a cycle (`A = B`, `B = A + [...]`) can't be folded, whatever name the fold starts from.
+        if name in self.rebound or name in resolving:
+            return None
+
+        bindings = [binding for binding in self.symbols.get(name, ()) if binding[0] < lineno]
+        key = name, len(bindings)
+        if key not in self._names:
+            elements = None
+            if bindings and not bindings[0][2] and all(value is not None for _, value, _ in bindings):
+                elements = []
+                for _, value, _ in bindings:
+                    value_elements = self._fold(node=value, depth=depth, resolving=resolving | {name})
+                    if value_elements is None:
+                        elements = None
+                        break
+
+                    elements.extend(value_elements)
+
+            self._names[key] = self._check_size(elements=elements)
+
+        return self._names[key]
+
+    def _fold_node(self, node, depth, resolving):
+        if isinstance(node, (ast.List, ast.Tuple)):
+            elements = []
+            for elt in node.elts:
+                if isinstance(elt, ast.Starred):
+                    starred = self._fold(node=elt.value, depth=depth, resolving=resolving)
+                    if starred is None:
+                        return None
+
+                    elements.extend(starred)
+                else:
+                    elements.append(elt)
+
+            return self._check_size(elements=elements)
+
+        if isinstance(node, ast.Name):
+            return self._fold_name(name=node.id, lineno=node.lineno, depth=depth, resolving=resolving)
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left = self._fold(node=node.left, depth=depth, resolving=resolving)
+            right = left is not None and self._fold(node=node.right, depth=depth, resolving=resolving)
+            return self._check_size(elements=left + right) if left is not None and right is not None else None
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+            sequence, times = node.left, node.right
+            if isinstance(sequence, ast.Constant):
+                sequence, times = times, sequence
+
+            if not isinstance(times, ast.Constant) or type(times.value) is not int:
+                return None
+
+            elements = self._fold(node=sequence, depth=depth, resolving=resolving)
+            if elements is None:
+                return None
+
+            if len(elements) * times.value > self.max_elements:
+                raise FoldingBudgetExceeded
+
+            return elements * max(times.value, 0)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            if node.func.id in ("list", "tuple") and len(node.args) == 1:
+                return self._fold(node=node.args[0], depth=depth, resolving=resolving)
+
+            if node.func.id == "range":
+                return self._fold_range(node=node)
+
+        if isinstance(node, (ast.ListComp, ast.GeneratorExp)):
+            return self._fold_comprehension(node=node, depth=depth, resolving=resolving)
+
+        return None
+
+    def _fold_range(self, node):
+        if not 1 <= len(node.args) <= 3 or not all(
+            isinstance(arg, ast.Constant) and type(arg.value) is int for arg in node.args
+        ):
+            return None
+
+        values = range(*(arg.value for arg in node.args))
+        if len(values) > self.max_elements:
+            raise FoldingBudgetExceeded
+
+        return [_constant(value=value, node=node) for value in values]
+
+    def _fold_comprehension(self, node, depth, resolving):
+        """
+        Fold `[elt for target in iterable ...]`, iterables must not depend on the other targets and filters
+        are not supported.
+        """
+        axes = []
+        names = set()
+        for generator in node.generators:
+            target_names = _target_names(target=generator.target)
+            if generator.ifs or generator.is_async or target_names is None:
+                return None
+
+            if names.intersection(_iter_loaded_names(node=generator.iter)):
+                return None
+
+            items = self._fold(node=generator.iter, depth=depth, resolving=resolving)
+            if items is None:
+                return None
+
+            names.update(target_names)
+            axes.append((generator.target, items))
+
+        size = 1
+        for _, items in axes:
+            size *= len(items)
+
+        if size > self.max_elements:
+            raise FoldingBudgetExceeded
+
+        template = _compile_template(node=node.elt, names=names)
+        elements = []
+        for values in itertools.product(*(items for _, items in axes)):
+            bindings = {}
+            for (target, _), value in zip(axes, values):
+                if not _bind(target=target, value=value, bindings=bindings):
+                    return None
+
+            elements.append(template(bindings=bindings) if template else node.elt)
+
+        return elements
+
+
+def get_parametrize_params(deco, folder):
+    """
+    Get the folded params of a `pytest.mark.parametrize(argnames, argvalues)` mark, [] if they are not statically
+    known.
+
+    Raises FoldingBudgetExceeded if they are over the folding budgets.
+    """
+    argvalues = deco.args[1] if len(deco.args) > 1 else None
+    for keyword in deco.keywords:
+        if keyword.arg == "argvalues":
+            argvalues = keyword.value
+
+    if argvalues is None:
+        return []
+
+    return folder.fold(node=argvalues) or []
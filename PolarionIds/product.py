@@ -0,0 +1,195 @@
+"""
+Lazy model of the items pytest generates for a test from its parametrize and polarion marks.
+
+Every parametrize mark of the test and of its classes is an axis, the test items are the cartesian product of the
+axes params and every item gets the Polarion IDs of the params it is made of plus the test and class level ones.
+The product is never enumerated, items Polarion IDs counts are computed per axis (min and max of the axis params),
+so a test with millions of items costs the number of its params.
+"""
+
+import ast
+import math
+
+from PluginsUtils.nodes import get_node_index
+from PolarionIds.folding import FoldingBudgetExceeded, get_parametrize_params
+
+
+def iter_polarion_marks(param):
+    """
+    Get the `polarion` marks calls in the marks of a `pytest.param(...)`.
+    """
+    for keyword in getattr(param, "keywords", []):
+        if keyword.arg == "marks":
+            marks = keyword.value.elts if isinstance(keyword.value, (ast.Tuple, ast.List)) else [keyword.value]
+            for mark in marks:
+                if getattr(getattr(mark, "func", None), "attr", None) == "polarion":
+                    yield mark
+
+
+def count_ids(marks):
+    # A `polarion` mark without argument gives no ID.
+    return sum(1 for mark in marks if mark.args)
+
+
+def iter_tests(tree):
+    """
+    Get (classes, test function) of all tests in a module, classes are the enclosing classes from the outermost.
+    """
+    index = get_node_index(tree=tree)
+    for func in index.functions:
+        if isinstance(func, ast.FunctionDef) and func.name.startswith("test_") and index.is_in_classes(node=func):
+            yield index.enclosing_classes(node=func), func
+
+
+def parametrize_argnames(deco):
+    argnames = deco.args[0] if deco.args else None
+    for keyword in deco.keywords:
+        if keyword.arg == "argnames":
+            argnames = keyword.value
+
+    if isinstance(argnames, ast.Constant) and isinstance(argnames.value, str):
+        return [argname.strip() for argname in argnames.value.split(",")]
+
+    return [getattr(elt, "value", "") for elt in getattr(argnames, "elts", [])]
+
+
+def get_param_id(param, argnames, index):
+    """
+    Get the pytest id of a param: its `id=`, else its values ids joined by "-", a value which is not a literal
+    gets its argument name and the param index (like pytest does).
+    """
+    for keyword in getattr(param, "keywords", []):
+        if keyword.arg == "id" and isinstance(keyword.value, ast.Constant):
+            return str(keyword.value.value)
+
+    values = param.args if isinstance(param, ast.Call) else [param]
+    return "-".join(
+        str(value.value) if isinstance(value, ast.Constant) else f"{argname}{index}"
+        for argname, value in zip(argnames, values)
+    )
+
+
+class AxisParam:
+    """
+    A param of an axis, polarion_marks are the `polarion` marks calls it carries.
+    """
+
+    def __init__(self, node, param_id, polarion_marks):
+        self.node = node
+        self.param_id = param_id
+        self.polarion_marks = polarion_marks
+        self.ids = count_ids(marks=polarion_marks)
+
+
+class Axis:
+    """
+    The params of a parametrize mark, name is its argnames, over_budget is True if its params were too many or
+    too deep to fold.
+    """
+
+    def __init__(self, deco, name, params, over_budget=False):
+        self.deco = deco
+        self.name = name
+        self.params = params
+        self.over_budget = over_budget
+
+    @classmethod
+    def from_parametrize(cls, deco, folder):
+        argnames = parametrize_argnames(deco=deco)
+        try:
+            params = get_parametrize_params(deco=deco, folder=folder)
+        except FoldingBudgetExceeded:
+            return cls(deco=deco, name=",".join(argnames), params=[], over_budget=True)
+
+        params = [
+            AxisParam(
+                node=param,
+                param_id=get_param_id(param=param, argnames=argnames, index=index),
+                polarion_marks=list(iter_polarion_marks(param=param)),
+            )
+            for index, param in enumerate(params)
+            # Dict params are not checked.
+            if not isinstance(param, ast.Dict)
+        ]
+        return cls(deco=deco, name=",".join(argnames), params=params)
+
+    @property
+    def carries_ids(self):
+        return any(param.ids for param in self.params)
+
+    def min_ids(self):
+        return min((param.ids for param in self.params), default=0)
+
+    def max_ids(self):
+        return max((param.ids for param in self.params), default=0)
+
+    def params_without_ids(self):
+        return [param for param in self.params if not param.ids]
+
+
+class ParametrizeProduct:
+    """
+    The items of a test, marks are the test and classes level `polarion` marks and axes its parametrize marks.
+    """
+
+    def __init__(self, marks, axes):
+        self.marks = marks
+        # Axes without params (not folded) generate no known items, they can't carry Polarion IDs.
+        self.axes = [axis for axis in axes if axis.params]
+        self.over_budget_axes = [axis for axis in axes if axis.over_budget]
+
+    @classmethod
+    def from_test(cls, func, classes, folder, resolver):
+        marks, axes = [], []
+        for node in [*classes, func]:
+            # Bare marks (`@pytest.mark.polarion`) have no argument, they give no ID and no param.
+            for deco in resolver.iter_decorators(node=node):
+                if deco.kind == "mark.polarion" and deco.call:
+                    marks.append(deco.call)
+
+                elif deco.kind == "mark.parametrize" and deco.call:
+                    axes.append(Axis.from_parametrize(deco=deco.call, folder=folder))
+
+        return cls(marks=marks, axes=axes)
+
+    def size(self):
+        return math.prod(len(axis.params) for axis in self.axes)
+
+    def carrying_axes(self):
+        return [axis for axis in self.axes if axis.carries_ids]
+
+    def min_ids(self):
+        return count_ids(marks=self.marks) + sum(axis.min_ids() for axis in self.axes)
+
+    def max_ids(self):
+        return count_ids(marks=self.marks) + sum(axis.max_ids() for axis in self.axes)
+
+    def iter_missing(self):
+        """
+        Get (axis, param, number of items) of the params which generate items without Polarion ID.
+
+        An item has no ID if all its params have none, so a param of a carrying axis misses IDs on its combinations
+        with the params without IDs of the other carrying axes (and all params of the other axes).
+        """
+        if self.min_ids():
+            return
+
+        carrying_axes = self.carrying_axes()
+        for axis in carrying_axes:
+            items = math.prod(
+                len(other.params_without_ids()) if other.carries_ids else len(other.params)
+                for other in self.axes
+                if other is not axis
+            )
+            for param in axis.params_without_ids():
+                yield axis, param, items
+
+    def max_ids_item(self):
+        """
+        Get the `polarion` marks (with an ID) of an item with the most Polarion IDs.
+        """
+        marks = list(self.marks)
+        for axis in self.axes:
+            marks.extend(max(axis.params, key=lambda param: param.ids).polarion_marks)
+
+        return [mark for mark in marks if mark.args]
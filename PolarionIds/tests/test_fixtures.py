@@ -0,0 +1,46 @@
+import ast
+
+import PolarionIds
+
+fixtures_content = """
+import pytest
+
+
+@pytest.fixture(params=[pytest.param(1, marks=(pytest.mark.polarion("CNV-1"))), pytest.param(2)])
+def params_fixture():
+    pass
+
+
+@pytest.fixture
+def plain_fixture():
+    pass
+
+
+@pytest.fixture(params=[pytest.param(3, marks=(pytest.mark.polarion("CNV-3")))])
+def params_fixture():
+    pass
+"""
+
+
+def test_fixture_index(monkeypatch):
+    calls = []
+    build_fixture_index = PolarionIds.build_fixture_index
+
+    def counted_build_fixture_index(tree):
+        calls.append(tree)
+        return build_fixture_index(tree=tree)
+
+    monkeypatch.setattr(target=PolarionIds, name="build_fixture_index", value=counted_build_fixture_index)
+    plugin = PolarionIds.PolarionIds(tree=ast.parse(source=fixtures_content), filename=None)
+
+    index = plugin._get_fixture_index()
+    # The first definition of a name wins.
+    assert sorted(index) == ["params_fixture", "plain_fixture"]
+    (first, first_ids), (second, second_ids) = index["params_fixture"]
+    assert [first.args[0].value, second.args[0].value] == [1, 2]
+    assert [node.value for node in first_ids] == ["CNV-1"]
+    assert second_ids == []
+    assert index["plain_fixture"] == []
+    # The module is indexed once for all the tests looking up their fixtures.
+    assert plugin._get_fixture_index() is index
+    assert len(calls) == 1
@@ -1,5 +1,6 @@
 # flake8: noqa PID001,PID002
 
+import json
 import os
 import re
 from subprocess import PIPE, Popen
@@ -205,6 +206,25 @@ def test_fixture_parameterized(params_fixture, dummy):
     pass
 """
 
+test_fixture_parameterized_empty_mark_content = """
+import pytest
+
+
+@pytest.fixture(
+    params=[
+        pytest.param("empty_mark", marks=pytest.mark.polarion()),
+        pytest.param("empty_mark_in_tuple", marks=(pytest.mark.polarion(),)),
+        pytest.param("with_polarion_id", marks=(pytest.mark.polarion("CNV-2073"))),
+    ],
+)
+def params_fixture():
+    pass
+
+
+def test_fixture_parameterized_empty_mark(params_fixture):
+    pass
+"""
+
 test_multiple_polarion_id_content = """
 import pytest
 
@@ -226,6 +246,219 @@ def test_parameterized_with_multiple_polarion_id(param):
     pass
 """
 
+test_duplicate_polarion_id_content = """
+import pytest
+
+
+@pytest.mark.polarion("CNV-999999")
+def test_duplicate_polarion_id():
+    pass
+"""
+
+# Polarion ID on parameterized fixture from conftest.py
+test_conftest_fixture_parameterized_conftest_content = """
+import pytest
+
+
+@pytest.fixture(
+    params=[
+        pytest.param("parametrize_with_polarion_id", marks=(pytest.mark.polarion("CNV-2072"))),
+        pytest.param("parametrize_wrong_polarion_id", marks=(pytest.mark.polarion("CNVV-2350"))),
+    ],
+)
+def params_fixture():
+    pass
+"""
+
+test_conftest_fixture_parameterized_content = """
+def test_conftest_fixture_parameterized(params_fixture):
+    pass
+"""
+
+# Polarion IDs checked against a catalog export
+test_catalog_polarion_ids_content = """
+import pytest
+
+
+@pytest.mark.polarion("CNV-1000")
+def test_catalog_active_polarion_id():
+    pass
+
+
+@pytest.mark.polarion("CNV-1001")
+def test_catalog_obsolete_polarion_id():
+    pass
+
+
+@pytest.mark.polarion("CNV-1002")
+def test_catalog_unknown_polarion_id():
+    pass
+"""
+
+test_catalog_csv = """id,status
+CNV-1000,Active
+CNV-1001,Obsolete
+"""
+
+test_catalog_json = """[
+    {"id": "CNV-1000", "status": "Active"},
+    {"id": "CNV-1001", "status": "Obsolete"}
+]
+"""
+
+# Module constants are folded from the statements before the test, deep concatenations are reported
+test_folded_order_content = """
+import pytest
+
+PARAMS = [pytest.param("first", marks=(pytest.mark.polarion("CNV-4100")))]
+PARAMS += [pytest.param("second")]
+
+
+@pytest.mark.parametrize("param", PARAMS)
+def test_folded_before(param):
+    pass
+
+
+PARAMS += [pytest.param("after", marks=(pytest.mark.polarion("CNVV-4101")))]
+REBOUND = [pytest.param("rebound", marks=(pytest.mark.polarion("CNVV-4102")))]
+
+
+@pytest.mark.parametrize("param", REBOUND)
+def test_folded_rebound(param):
+    pass
+
+
+REBOUND = []
+DEEP = {deep}
+
+
+@pytest.mark.parametrize("param", DEEP)
+def test_folded_too_deep(param):
+    pass
+"""
+
+# Parametrize params built in module constants, concatenations and comprehensions
+test_folded_parameterized_content = """
+import pytest
+
+BASE_PARAMS = [pytest.param("base", marks=(pytest.mark.polarion("CNV-4000")))]
+BASE_PARAMS += [pytest.param("added", marks=(pytest.mark.polarion("CNV-4001")))]
+CASES = [("first", "CNV-4002"), ("second", "CNVV-4003")]
+GENERATED_PARAMS = [pytest.param(value, marks=(pytest.mark.polarion(pid))) for value, pid in CASES]
+
+
+@pytest.mark.parametrize("param", BASE_PARAMS + GENERATED_PARAMS)
+def test_folded_parameterized(param):
+    pass
+
+
+@pytest.mark.parametrize("param", [*BASE_PARAMS, "no_polarion_id"])
+def test_folded_parameterized_no_polarion_id(param):
+    pass
+
+
+@pytest.mark.parametrize(
+    "param", [pytest.param(idx, marks=(pytest.mark.polarion(f"CNV-{idx}"))) for idx in range(5000, 55000)]
+)
+def test_folded_parameterized_generated(param):
+    pass
+"""
+
+# Stacked parametrize and class level marks
+test_stacked_parameterized_content = """
+import pytest
+
+IDS_PARAMS = [pytest.param(idx, marks=(pytest.mark.polarion(f"CNV-{idx}"))) for idx in range(6000, 8000)]
+
+
+@pytest.mark.parametrize("with_id", IDS_PARAMS)
+@pytest.mark.parametrize("without_id", list(range(1000)))
+@pytest.mark.parametrize("other", ["first", "second"])
+def test_stacked_parameterized(with_id, without_id, other):
+    pass
+
+
+@pytest.mark.parametrize("first", [pytest.param(1, marks=(pytest.mark.polarion("CNV-5000"))), 2])
+@pytest.mark.parametrize("second", [pytest.param(3, marks=(pytest.mark.polarion("CNV-5001"))), 4])
+def test_stacked_parameterized_ids_on_both_axes(first, second):
+    pass
+
+
+@pytest.mark.polarion("CNV-5002")
+class TestClassPolarionId:
+    @pytest.mark.parametrize("param", ["first", "second"])
+    def test_class_polarion_id(self, param):
+        pass
+
+    @pytest.mark.parametrize("param", [pytest.param(1, marks=(pytest.mark.polarion("CNV-5003")))])
+    def test_class_and_param_polarion_ids(self, param):
+        pass
+"""
+
+# Parametrize argnames and argvalues given as keywords
+test_keyword_parameterized_content = """
+import pytest
+
+CASES = [pytest.param(1, marks=(pytest.mark.polarion("CNV-5100"))), 2]
+
+
+@pytest.mark.parametrize(argnames="value", argvalues=CASES)
+def test_keyword_parameterized(value):
+    pass
+"""
+
+# Polarion IDs map export
+test_export_polarion_ids_content = """
+import pytest
+
+
+@pytest.mark.polarion("CNV-3000")
+def test_export_polarion_id():
+    pass
+
+
+class TestExport:
+    @pytest.mark.parametrize(
+        "param",
+        [
+            pytest.param("first", marks=(pytest.mark.polarion("CNV-3001"))),
+            pytest.param("second", id="second_id", marks=(pytest.mark.polarion("CNV-3002"),)),
+        ],
+    )
+    def test_export_parameterized(self, param):
+        pass
+
+
+def test_export_conftest_fixture_parameterized(params_fixture):
+    pass
+"""
+
+
+# Aliased pytest imports
+test_aliased_pytest_content = """
+import pytest as pt
+from pytest import fixture, mark
+
+
+@fixture(params=[pt.param("first", marks=pt.mark.polarion("CNV-6000")), pt.param("second")])
+def aliased_fixture(request):
+    return request.param
+
+
+@mark.polarion("CNV-6001")
+def test_aliased_mark():
+    pass
+
+
+@pt.mark.parametrize("param", [pt.param("no_polarion_id")])
+def test_aliased_parameterized(param):
+    pass
+
+
+def test_aliased_fixture(aliased_fixture):
+    pass
+"""
+
 
 def prepare_test_file(tmp_test_file, test_name, file_content):
     tmp_test_file.write(file_content.format(test_name=test_name))
@@ -241,9 +474,9 @@ def tmp_test_file(tmpdir):
     os.remove(test_file_name)
 
 
-def check_polarion_ids_plugin(test_file_name):
+def check_polarion_ids_plugin(test_file_name, *flake8_args):
     out, _ = Popen(
-        ["flake8", "--enable-extensions=PID", "--select=PID", test_file_name],
+        ["flake8", "--enable-extensions=PID", "--select=PID", *flake8_args, test_file_name],
         stdout=PIPE,
         stderr=PIPE,
     ).communicate()
@@ -258,10 +491,18 @@ def check_pid002(flake8_out):
     assert re.findall(r"PID002: .*, Polarion ID is wrong", flake8_out)
 
 
+def check_pid003(flake8_out):
+    assert re.findall(r"PID003: .*, Polarion ID is duplicate", flake8_out)
+
+
 def check_pid004(flake8_out):
     assert re.findall(r"PID004: .*, Test have multiple Polarion IDs", flake8_out)
 
 
+def check_pid005(flake8_out, reason):
+    assert re.findall(rf"PID005: .*, Polarion ID is {reason}", flake8_out)
+
+
 # Test function tests
 def test_empty_polarion_id(tmp_test_file):
     test_name = "test_empty_polarion_id"
@@ -401,3 +642,202 @@ def test_fixture_parameterized_as_list(tmp_test_file):
     check_pid001(out_lines[0])
     check_pid001(out_lines[1])
     check_pid002(out_lines[2])
+
+
+def test_fixture_parameterized_empty_mark(tmp_test_file):
+    test_name = "test_fixture_parameterized_empty_mark"
+    test_file_name = prepare_test_file(tmp_test_file, test_name, eval(f"{test_name}_content"))
+
+    # A polarion mark without argument gives no ID, its param is missing one.
+    out = check_polarion_ids_plugin(test_file_name)
+    out_lines = out.splitlines()
+    assert len(out_lines) == 2
+    assert "(empty_mark)" in out_lines[0]
+    check_pid001(out_lines[0])
+    assert "(empty_mark_in_tuple)" in out_lines[1]
+    check_pid001(out_lines[1])
+
+
+# Duplicate Polarion ID in different files
+def test_duplicate_polarion_id_in_different_files(tmpdir):
+    for test_file_name in ("test_file_a.py", "test_file_b.py"):
+        tmpdir.join(test_file_name).write(test_duplicate_polarion_id_content)
+
+    out = check_polarion_ids_plugin(str(tmpdir))
+    out_lines = out.splitlines()
+    assert len(out_lines) == 1
+    assert "test_file_b.py" in out_lines[0]
+    check_pid003(out_lines[0])
+
+
+def test_conftest_fixture_parameterized(tmpdir):
+    tmpdir.join("conftest.py").write(test_conftest_fixture_parameterized_conftest_content)
+    test_file = tmpdir.mkdir("tests").join("test_file.py")
+    test_file.write(test_conftest_fixture_parameterized_content)
+
+    out = check_polarion_ids_plugin(str(test_file))
+    out_lines = out.splitlines()
+    assert len(out_lines) == 1
+    assert ":2:1: " in out_lines[0]
+    check_pid002(out_lines[0])
+
+
+def test_conftest_above_project_root(tmpdir):
+    # conftest.py files above the project of a file checked out of the current directory are not loaded by pytest.
+    tmpdir.join("conftest.py").write(test_conftest_fixture_parameterized_conftest_content)
+    repository = tmpdir.mkdir("repository")
+    Popen(["git", "init", "-q"], cwd=str(repository)).communicate()
+    git_test_file = repository.mkdir("tests").join("test_file.py")
+    git_test_file.write(test_conftest_fixture_parameterized_content)
+    test_file = tmpdir.mkdir("project").mkdir("tests").join("test_file.py")
+    test_file.write(test_conftest_fixture_parameterized_content)
+
+    for filename in (git_test_file, test_file):
+        out = check_polarion_ids_plugin(str(filename))
+        out_lines = out.splitlines()
+        assert len(out_lines) == 1
+        check_pid001(out_lines[0])
+
+
+def test_catalog_polarion_ids(tmpdir):
+    catalog = tmpdir.join("catalog.csv")
+    catalog.write(test_catalog_csv)
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_catalog_polarion_ids_content)
+
+    out = check_polarion_ids_plugin(str(test_file), f"--pid_catalog={catalog}")
+    out_lines = out.splitlines()
+    assert len(out_lines) == 2
+    check_pid005(out_lines[0], reason="obsolete in the catalog")
+    check_pid005(out_lines[1], reason="not in the catalog")
+
+
+def test_catalog_json_polarion_ids(tmpdir):
+    catalog = tmpdir.join("catalog.json")
+    catalog.write(test_catalog_json)
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_catalog_polarion_ids_content)
+
+    out = check_polarion_ids_plugin(str(test_file), f"--pid_catalog={catalog}")
+    out_lines = out.splitlines()
+    assert len(out_lines) == 2
+    check_pid005(out_lines[0], reason="obsolete in the catalog")
+    check_pid005(out_lines[1], reason="not in the catalog")
+
+
+def test_catalog_not_found(tmpdir):
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_catalog_polarion_ids_content)
+
+    process = Popen(
+        ["flake8", "--enable-extensions=PID", "--select=PID", f"--pid_catalog={tmpdir}/missing.jsonl", str(test_file)],
+        stdout=PIPE,
+        stderr=PIPE,
+    )
+    _, err = process.communicate()
+    assert process.returncode == 2
+    assert f"--pid_catalog: file not found: {tmpdir}/missing.jsonl" in err.decode("utf-8")
+    assert "Traceback" not in err.decode("utf-8")
+
+
+def test_export_polarion_ids(tmpdir):
+    tmpdir.join("conftest.py").write(test_conftest_fixture_parameterized_conftest_content)
+    tmpdir.mkdir("tests").join("test_file.py").write(test_export_polarion_ids_content)
+
+    out, _ = Popen(["python", "-m", "PolarionIds", "tests"], stdout=PIPE, stderr=PIPE, cwd=str(tmpdir)).communicate()
+    records = [json.loads(line) for line in out.decode("utf-8").splitlines()]
+    assert [
+        (record["class"], record["test"], record["param_id"], record["fixture"], record["polarion_id"])
+        for record in records
+    ] == [
+        (None, "test_export_polarion_id", None, None, "CNV-3000"),
+        ("TestExport", "test_export_parameterized", "first", None, "CNV-3001"),
+        ("TestExport", "test_export_parameterized", "second_id", None, "CNV-3002"),
+        (
+            None,
+            "test_export_conftest_fixture_parameterized",
+            "parametrize_with_polarion_id",
+            "params_fixture",
+            "CNV-2072",
+        ),
+        (
+            None,
+            "test_export_conftest_fixture_parameterized",
+            "parametrize_wrong_polarion_id",
+            "params_fixture",
+            "CNVV-2350",
+        ),
+    ]
+    assert {record["module"] for record in records} == {"tests.test_file"}
+
+
+def test_folded_parameterized(tmpdir):
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_folded_parameterized_content)
+
+    out = check_polarion_ids_plugin(str(test_file), "--skip-duplicate-polarion-ids-check=True")
+    out_lines = out.splitlines()
+    assert len(out_lines) == 2
+    assert "CNVV-4003" in out_lines[0]
+    check_pid002(out_lines[0])
+    assert "no_polarion_id" in out_lines[1]
+    check_pid001(out_lines[1])
+
+
+def test_folded_order(tmpdir):
+    deep = " + ".join(['[pytest.param("deep", marks=(pytest.mark.polarion("CNV-4103")))]'] * 40)
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_folded_order_content.replace("{deep}", deep))
+
+    out = check_polarion_ids_plugin(str(test_file), "--skip-duplicate-polarion-ids-check=True")
+    out_lines = out.splitlines()
+    assert len(out_lines) == 3
+    assert "test_folded_before (param=second)" in out_lines[0]
+    check_pid001(out_lines[0])
+    # Not folded, checked like a test without Polarion ID.
+    assert "test_folded_rebound ()" in out_lines[1]
+    check_pid001(out_lines[1])
+    assert re.findall(
+        r"PID006: \[test_folded_too_deep \(param\)\], Parametrize params are too many or too deep", out_lines[2]
+    )
+
+
+def test_stacked_parameterized(tmpdir):
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_stacked_parameterized_content)
+
+    out = check_polarion_ids_plugin(str(test_file))
+    out_lines = out.splitlines()
+    assert len(out_lines) == 4
+    assert "first=2" in out_lines[0]
+    check_pid001(out_lines[0])
+    assert "second=4" in out_lines[1]
+    check_pid001(out_lines[1])
+    assert "test_stacked_parameterized_ids_on_both_axes ['CNV-5000', 'CNV-5001']" in out_lines[2]
+    check_pid004(out_lines[2])
+    assert "test_class_and_param_polarion_ids ['CNV-5002', 'CNV-5003']" in out_lines[3]
+    check_pid004(out_lines[3])
+
+
+def test_keyword_parameterized(tmpdir):
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_keyword_parameterized_content)
+
+    out = check_polarion_ids_plugin(str(test_file))
+    out_lines = out.splitlines()
+    assert len(out_lines) == 1
+    assert "test_keyword_parameterized (value=2)" in out_lines[0]
+    check_pid001(out_lines[0])
+
+
+def test_aliased_pytest(tmpdir):
+    test_file = tmpdir.join("test_file.py")
+    test_file.write(test_aliased_pytest_content)
+
+    out = check_polarion_ids_plugin(str(test_file), "--skip-duplicate-polarion-ids-check=True")
+    out_lines = out.splitlines()
+    assert len(out_lines) == 2
+    assert "test_aliased_fixture (second)" in out_lines[0]
+    check_pid001(out_lines[0])
+    assert "test_aliased_parameterized" in out_lines[1]
+    check_pid001(out_lines[1])
@@ -4,8 +4,52 @@ flake8 extension to check unique fixtures names.
 
 import ast
 
-UFN001 = "UFN001: [{f_name}], Fixture name is not unique."
-FIXTURES = []
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.metrics import measured
+from PluginsUtils.nodes import get_node_index
+from PluginsUtils.registry import ProjectRegistry, normalize_filename
+from PluginsUtils.results import get_file_result
+
+UFN001 = "UFN001: [{f_name}], Fixture name is not unique, first defined in {location}."
+FIXTURES = None
+
+
+def iter_fixtures(tree):
+    """
+    Get all fixtures from python file
+    """
+
+    def is_func(elm):
+        return isinstance(elm, ast.FunctionDef)
+
+    def is_test(elm):
+        return elm.name.startswith("test_")
+
+    resolver = get_decorator_resolver(tree=tree)
+    for elm in get_node_index(tree=tree).module_functions():
+        if is_func(elm=elm):
+            if is_test(elm=elm):
+                continue
+
+            if resolver.is_fixture(node=elm):
+                yield elm
+
+
+def extract_fixtures(tree):
+    for func in iter_fixtures(tree=tree):
+        yield func.name, func.lineno, func.col_offset, None
+
+
+def get_fixtures_registry():
+    """
+    Get the project fixtures registry, shared by all UniqueFixturesNames instances in the process.
+    """
+    global FIXTURES
+
+    if FIXTURES is None:
+        FIXTURES = ProjectRegistry(name="ufn-fixtures", extract=extract_fixtures)
+
+    return FIXTURES
 
 
 class UniqueFixturesNames:
@@ -17,45 +61,29 @@ class UniqueFixturesNames:
     name = "UniqueFixturesNames"
     version = "1.0.0"
 
-    def __init__(self, tree):
+    def __init__(self, tree, filename, lines=None):
         self.tree = tree
+        self.filename = filename
+        self.lines = lines
 
-    def _iter_functions(self):
-        """
-        Get all function from python file
-        """
-
-        def is_func(elm):
-            return isinstance(elm, ast.FunctionDef)
-
-        def is_test(elm):
-            return elm.name.startswith("test_")
-
-        for elm in self.tree.body:
-            if is_func(elm=elm):
-                if is_test(elm=elm):
-                    continue
-
-                yield elm
-
+    @measured
     def run(self):
         """
         Check if fixture name is unique.
+
+        Fixtures of all project files are kept in a registry shared by flake8 workers,
+        every definition but the first (by file and line) is reported.
         """
-        for func in self._iter_functions():
-            if func.decorator_list:
-                for deco in func.decorator_list:
-                    if not hasattr(deco, "func"):
-                        continue
-
-                    if getattr(deco.func, "attr", None) == "fixture" and deco.func.value.id == "pytest":
-                        name = func.name
-                        if name not in FIXTURES:
-                            FIXTURES.append(name)
-                        else:
-                            yield (
-                                func.lineno,
-                                func.col_offset,
-                                UFN001.format(f_name=func.name),
-                                self.name,
-                            )
+        fixtures = get_file_result(plugin=self, compute=lambda: list(extract_fixtures(tree=self.tree)))
+        registry = get_fixtures_registry()
+        registry.record(filename=self.filename, records=fixtures)
+        filename = normalize_filename(filename=self.filename)
+        for name, lineno, col_offset, _ in fixtures:
+            first_filename, first_lineno, _, _ = registry.locations(name=name)[0]
+            if (first_filename, first_lineno) != (filename, lineno):
+                yield (
+                    lineno,
+                    col_offset,
+                    UFN001.format(f_name=name, location=f"{first_filename}:{first_lineno}"),
+                    self.name,
+                )
@@ -0,0 +1,53 @@
+import re
+from subprocess import PIPE, Popen, run
+
+first_content = """
+import pytest
+
+
+@pytest.fixture
+def shared_fixture():
+    return 1
+
+
+@pytest.fixture
+def first_fixture():
+    return 2
+"""
+
+second_content = """
+import pytest
+
+
+@pytest.fixture
+def shared_fixture():
+    return 3
+
+
+@pytest.fixture()
+def second_fixture():
+    return 4
+"""
+
+
+def check_unique_fixtures_names(cwd, args):
+    run(args=["git", "init", "-q"], cwd=str(cwd), check=True)
+    run(args=["git", "add", "."], cwd=str(cwd), check=True)
+    out, _ = Popen(
+        args=["flake8", "--enable-extensions=UFN", "--select=UFN", *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        cwd=str(cwd),
+    ).communicate()
+    return re.findall(r"^(\S+):(\d+):\d+: UFN001: (.*)$", out.decode("utf-8"), flags=re.MULTILINE)
+
+
+def test_duplicate_fixture_names_parallel(tmpdir):
+    tmpdir.join("test_first.py").write(first_content)
+    tmpdir.join("test_second.py").write(second_content)
+
+    # Each worker checks one file, the duplicate is still found from the project registry.
+    reported = check_unique_fixtures_names(cwd=tmpdir, args=["--jobs=2", "test_first.py", "test_second.py"])
+    assert reported == [
+        ("test_second.py", "6", "[shared_fixture], Fixture name is not unique, first defined in test_first.py:6.")
+    ]
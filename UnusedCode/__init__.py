@@ -3,10 +3,17 @@ flake8 extension to check unique fixtures names.
 """
 
 import ast
-import subprocess
+
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.metrics import measured
+from PluginsUtils.nodes import get_node_index
+from UnusedCode.reference_graph import is_fixture_autouse, is_reachable
+from UnusedCode.usage import get_usage_count
 
 UUC001 = "UUC001: [{f_name}], Is not used anywhere in the code."
 
+ENGINES = ("grep", "graph")
+
 
 class UnusedCode:
     """
@@ -17,8 +24,9 @@ class UnusedCode:
     name = "UnusedCode"
     version = "1.0.0"
 
-    def __init__(self, tree):
+    def __init__(self, tree, filename=None):
         self.tree = tree
+        self.filename = filename
 
     @classmethod
     def add_options(cls, option_manager):
@@ -29,22 +37,29 @@ class UnusedCode:
             comma_separated_list=True,
             help="Import to exclude from checking.",
         )
+        option_manager.add_option(
+            long_option_name="--uuc_engine",
+            default=ENGINES[0],
+            parse_from_config=True,
+            choices=ENGINES,
+            help="How usages are found: grep - name appears in other lines of tracked files, "
+            "graph - function is reachable from tests, autouse fixtures and entry points.",
+        )
+        option_manager.add_option(
+            long_option_name="--uuc_entry_points",
+            default="",
+            parse_from_config=True,
+            comma_separated_list=True,
+            help="Functions which are used from outside the code (graph engine only).",
+        )
 
     @classmethod
     def parse_options(cls, options):
         cls.uuc_ignore_prefix = options.uuc_ignore_prefix
+        cls.uuc_engine = options.uuc_engine
+        cls.uuc_entry_points = options.uuc_entry_points
 
-    @staticmethod
-    def is_fixture_autouse(func):
-        if func.decorator_list:
-            for deco in func.decorator_list:
-                if not hasattr(deco, "func"):
-                    continue
-
-                if deco.func.attr == "fixture" and deco.func.value.id == "pytest":
-                    for _key in deco.keywords:
-                        if _key.arg == "autouse":
-                            return _key.value.value
+    is_fixture_autouse = staticmethod(is_fixture_autouse)
 
     def _iter_functions(self):
         """
@@ -57,13 +72,21 @@ class UnusedCode:
         def is_test(elm):
             return elm.name.startswith("test_")
 
-        for elm in self.tree.body:
+        for elm in get_node_index(tree=self.tree).module_functions():
             if is_func(elm=elm):
                 if is_test(elm=elm):
                     continue
 
                 yield elm
 
+    def _is_used(self, func):
+        if self.uuc_engine == "graph":
+            return is_reachable(name=func.name, filename=self.filename, entry_points=self.uuc_entry_points)
+
+        # Lines the name appears on in all tracked files, the definition itself is one of them.
+        return get_usage_count(name=func.name) > 1
+
+    @measured
     def run(self):
         """
         Check if fixture name is unique.
@@ -72,12 +95,10 @@ class UnusedCode:
             if [func.name for ignore_prefix in self.uuc_ignore_prefix if func.name.startswith(ignore_prefix)]:
                 continue
 
-            if self.is_fixture_autouse(func=func):
+            if self.is_fixture_autouse(func=func, resolver=get_decorator_resolver(tree=self.tree)):
                 continue
 
-            _used = subprocess.check_output(f"git grep {func.name} | wc -l", shell=True)
-            used = int(_used.strip())
-            if used < 2:
+            if not self._is_used(func=func):
                 yield (
                     func.lineno,
                     func.col_offset,
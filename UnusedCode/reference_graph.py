@@ -0,0 +1,317 @@
+"""
+AST based reference graph engine for UnusedCode.
+
+Every tracked python file is parsed into a fragment: the references of each top level function and class, the
+roots it defines (tests, test classes, autouse fixtures, pytest hooks), the fixtures it defines and the references
+of module level code. A function is used if it is reachable from a root, helpers only called by other unused
+helpers are unused as well.
+
+Graph nodes are module qualified (`tests.utils.helper`), names are resolved with the module definitions and its
+import records, so same named functions of different modules are different nodes. An imported module is matched
+by the dotted suffix of a project module as well (`import utils` from `tests/test_a.py` for `tests/utils.py`).
+Fixtures are requested by name: the arguments of tests and fixtures, `usefixtures` and `getfixturevalue` refer to
+the `fixture:<name>` node, which refers to all the fixtures of that name. Arguments of other functions and
+imports are not references.
+
+Fragments are cached by file path and git blob SHA and the reachable nodes by the SHAs of the whole tree,
+a warm run only loads the reachable nodes.
+"""
+
+import ast
+import hashlib
+import os
+
+from PluginsUtils.cache import dump_pickle, file_lock, get_project_cache_dir, load_pickle
+from PluginsUtils.decorators import get_decorator_resolver
+from PluginsUtils.git import get_tracked_blobs
+from PluginsUtils.imports import extract_import_records, module_name
+from PluginsUtils.metrics import count
+from PluginsUtils.parallel import parallel_map
+
+GRAPH_VERSION = 3
+# Calls with fixtures names as strings arguments.
+FIXTURE_NAME_CALLS = ("getfixturevalue", "usefixtures")
+FIXTURE_NODE = "fixture:{name}"
+REACHABLE = None
+
+
+def is_fixture_autouse(func, resolver):
+    fixture = resolver.find(node=func, kind="fixture")
+    if fixture:
+        return getattr(fixture.keyword(name="autouse"), "value", None)
+
+
+def _is_root(elm, resolver):
+    if isinstance(elm, ast.ClassDef):
+        return elm.name.startswith("Test")
+
+    return elm.name.startswith(("test_", "pytest_")) or bool(is_fixture_autouse(func=elm, resolver=resolver))
+
+
+def _fixture_name(func, resolver):
+    """
+    Get the name a fixture is requested by (its `name=` argument or the function name), None if func is not a
+    fixture.
+    """
+    fixture = resolver.find(node=func, kind="fixture")
+    if fixture is None:
+        return None
+
+    name = fixture.keyword(name="name")
+    if isinstance(name, ast.Constant) and isinstance(name.value, str):
+        return name.value
+
+    return func.name
+
+
+class NameResolver:
+    """
+    Resolve the names of a module to module qualified names, from its top level definitions and its imports.
+    """
+
+    def __init__(self, tree, filename):
+        self.module = module_name(filename=filename)
+        self.defs = {
+            elm.name for elm in tree.body if isinstance(elm, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        }
+        # name -> qualified name it is bound to by an import
+        self.bindings = {}
+        # modules imported with `from module import *`
+        self.star_modules = []
+        for record in extract_import_records(tree=tree, filename=filename):
+            if record.dynamic or not record.module:
+                continue
+
+            if record.name is None:
+                # `import a.b` binds `a`, `import a.b as c` binds `c` to `a.b`.
+                if record.asname:
+                    self.bindings[record.asname] = record.module
+                else:
+                    root = record.module.split(".")[0]
+                    self.bindings[root] = root
+
+            elif record.name == "*":
+                self.star_modules.append(record.module)
+
+            else:
+                self.bindings[record.asname or record.name] = record.target
+
+    def resolve_name(self, name):
+        if name in self.defs:
+            return [f"{self.module}.{name}"]
+
+        if name in self.bindings:
+            return [self.bindings[name]]
+
+        return [f"{module}.{name}" for module in self.star_modules]
+
+    def resolve(self, node):
+        """
+        Get the qualified names a Name or an Attribute chain (`module.func`) may refer to.
+        """
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+
+        if not isinstance(node, ast.Name):
+            return []
+
+        rest = "".join(f".{part}" for part in reversed(parts))
+        return [f"{qualified}{rest}" for qualified in self.resolve_name(name=node.id)]
+
+
+def _iter_fixture_requests(elm, resolver):
+    """
+    Get the fixtures names requested by the arguments of the tests and fixtures of elm.
+    """
+    for node in ast.walk(elm):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+            node.name.startswith("test_") or resolver.is_fixture(node=node)
+        ):
+            for arg in (*node.args.posonlyargs, *node.args.args, *node.args.kwonlyargs):
+                yield arg.arg
+
+
+def _iter_references(elm, names, resolver):
+    """
+    Get the qualified names and the fixtures nodes elm refers to.
+    """
+    for node in ast.walk(elm):
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            yield from names.resolve(node=node)
+
+        elif isinstance(node, ast.Call):
+            func_name = getattr(node.func, "attr", None) or getattr(node.func, "id", None)
+            if func_name in FIXTURE_NAME_CALLS:
+                for arg in node.args:
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                        yield FIXTURE_NODE.format(name=arg.value)
+
+    for name in _iter_fixture_requests(elm=elm, resolver=resolver):
+        yield FIXTURE_NODE.format(name=name)
+
+
+def _iter_all_names(elm, names):
+    """
+    Get the qualified names exported by `__all__ = [...]`
+    """
+    if not isinstance(elm, ast.Assign) or not isinstance(elm.value, (ast.List, ast.Tuple)):
+        return
+
+    if any(getattr(target, "id", None) == "__all__" for target in elm.targets):
+        for name in elm.value.elts:
+            if isinstance(name, ast.Constant) and isinstance(name.value, str):
+                yield from names.resolve_name(name=name.value)
+
+
+def extract_fragment(tree, filename):
+    """
+    Get the reference graph fragment of a module.
+
+    Returns dict with `defs` (qualified name -> names it refers to), `roots` (qualified names of the roots defined
+    in the module), `fixtures` (fixture name -> qualified names of the fixtures defined with it) and `module_refs`
+    (names referred to from module level code).
+    """
+    defs, roots, fixtures, module_refs = {}, set(), {}, set()
+    resolver = get_decorator_resolver(tree=tree)
+    names = NameResolver(tree=tree, filename=filename)
+    for elm in tree.body:
+        if isinstance(elm, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            qualified = f"{names.module}.{elm.name}"
+            defs.setdefault(qualified, set()).update(_iter_references(elm=elm, names=names, resolver=resolver))
+            if _is_root(elm=elm, resolver=resolver):
+                roots.add(qualified)
+
+            fixture_name = None if isinstance(elm, ast.ClassDef) else _fixture_name(func=elm, resolver=resolver)
+            if fixture_name:
+                fixtures.setdefault(fixture_name, set()).add(qualified)
+        else:
+            module_refs.update(_iter_references(elm=elm, names=names, resolver=resolver))
+            module_refs.update(_iter_all_names(elm=elm, names=names))
+
+    return {
+        "defs": {name: frozenset(refs) for name, refs in defs.items()},
+        "roots": frozenset(roots),
+        "fixtures": {name: frozenset(qualified) for name, qualified in fixtures.items()},
+        "module_refs": frozenset(module_refs),
+    }
+
+
+def extract_file_fragment(filename):
+    try:
+        with open(filename, "rb") as fd:
+            tree = ast.parse(fd.read(), filename=filename)
+
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    return extract_fragment(tree=tree, filename=filename)
+
+
+def _iter_suffixes(qualified):
+    """
+    Get the dotted suffixes a definition may be imported as, with at least one module part (`b.func` for
+    `a.b.func`).
+    """
+    parts = qualified.split(".")
+    for index in range(1, len(parts) - 1):
+        yield ".".join(parts[index:])
+
+
+def get_reachable(fragments, entry_points=()):
+    """
+    Get all qualified names reachable from the roots, module level code and entry_points of fragments.
+
+    An entry point is a qualified name or the name of a function of any module.
+    """
+    graph = {}
+    to_visit = []
+    for fragment in fragments:
+        for name, refs in fragment["defs"].items():
+            graph.setdefault(name, set()).update(refs)
+
+        for name, qualified in fragment["fixtures"].items():
+            graph.setdefault(FIXTURE_NODE.format(name=name), set()).update(qualified)
+
+        to_visit.extend(fragment["roots"])
+        to_visit.extend(fragment["module_refs"])
+
+    # Names which are not definitions: imports of a module by a shorter path and entry points names.
+    aliases = {}
+    for name in list(graph):
+        if not name.startswith(FIXTURE_NODE.format(name="")):
+            for suffix in _iter_suffixes(qualified=name):
+                aliases.setdefault(suffix, set()).add(name)
+
+    entry_points = set(entry_points)
+    to_visit.extend(name for name in graph if name in entry_points or name.rsplit(".", 1)[-1] in entry_points)
+    to_visit.extend(name for entry_point in entry_points for name in aliases.get(entry_point, ()))
+
+    reachable = set()
+    while to_visit:
+        name = to_visit.pop()
+        if name in reachable:
+            continue
+
+        reachable.add(name)
+        to_visit.extend(graph.get(name, ()))
+        if name not in graph:
+            to_visit.extend(aliases.get(name, ()))
+
+    return frozenset(reachable)
+
+
+def update_reference_graph(index_dir, entry_points=()):
+    """
+    Get the qualified names reachable in the project, parsing only files which changed since the last run.
+    """
+    fragments_path = os.path.join(index_dir, "uuc-graph-fragments.pickle")
+    reachable_path = os.path.join(index_dir, "uuc-graph-reachable.pickle")
+    tracked = {filename: sha for filename, sha in get_tracked_blobs().items() if filename.endswith(".py")}
+    key = hashlib.sha1(string=repr((GRAPH_VERSION, sorted(tracked.items()), sorted(entry_points))).encode()).hexdigest()
+
+    with file_lock(path=os.path.join(index_dir, "uuc-graph.lock")):
+        cached = load_pickle(path=reachable_path, default={})
+        if cached.get("key") == key:
+            count(counter="cache_hits")
+            return cached["reachable"]
+
+        count(counter="cache_misses")
+
+        fragments = load_pickle(path=fragments_path, default={})
+        if fragments.get("version") != GRAPH_VERSION:
+            fragments = {"version": GRAPH_VERSION, "files": {}}
+
+        # Fragments are module qualified, they are cached by path and content.
+        files = fragments["files"]
+        missing = [file_key for file_key in tracked.items() if file_key not in files]
+        for file_key, fragment in zip(
+            missing, parallel_map(func=extract_file_fragment, items=[filename for filename, _ in missing])
+        ):
+            files[file_key] = fragment
+
+        used_files = set(tracked.items())
+        fragments["files"] = {file_key: fragment for file_key, fragment in files.items() if file_key in used_files}
+        reachable = get_reachable(
+            fragments=[fragment for fragment in fragments["files"].values() if fragment],
+            entry_points=entry_points,
+        )
+        if missing:
+            dump_pickle(path=fragments_path, obj=fragments)
+
+        dump_pickle(path=reachable_path, obj={"key": key, "reachable": reachable})
+
+    return reachable
+
+
+def is_reachable(name, filename, entry_points=()):
+    """
+    Check if the function name of filename is reachable in the project.
+    """
+    global REACHABLE
+
+    if REACHABLE is None:
+        REACHABLE = update_reference_graph(index_dir=get_project_cache_dir(), entry_points=entry_points)
+
+    return f"{module_name(filename=filename)}.{name}" in REACHABLE
@@ -0,0 +1,109 @@
+import re
+from subprocess import PIPE, Popen, run
+
+helpers_content = """
+def used_helper():
+    return 1
+
+
+def unused_helper():
+    return 2
+
+
+def test_helpers():
+    assert used_helper()
+"""
+
+usage_content = """
+def call_unused_helper():
+    return unused_helper()
+"""
+
+graph_helpers_content = """
+def used_helper():
+    return inner_helper()
+
+
+def inner_helper():
+    return 1
+
+
+def dead_helper():
+    return dead_inner_helper()
+
+
+def dead_inner_helper():
+    return 2
+"""
+
+graph_tests_content = """
+import pytest
+
+from helpers import used_helper
+
+
+def inner_helper():
+    return 3
+
+
+@pytest.fixture
+def requested_fixture():
+    return 4
+
+
+@pytest.fixture
+def unrequested_fixture():
+    return 5
+
+
+def test_used(requested_fixture):
+    assert used_helper()
+"""
+
+
+def git_repository(cwd):
+    run(args=["git", "init", "-q"], cwd=str(cwd), check=True)
+    run(args=["git", "add", "."], cwd=str(cwd), check=True)
+
+
+def check_unused_code(cwd, args):
+    out, _ = Popen(
+        args=["flake8", "--enable-extensions=UUC", "--select=UUC", *args],
+        stdout=PIPE,
+        stderr=PIPE,
+        cwd=str(cwd),
+    ).communicate()
+    return re.findall(r"^(\S+):\d+:\d+: UUC001: \[(\w+)\]", out.decode("utf-8"), flags=re.MULTILINE)
+
+
+def test_unused_function(tmpdir):
+    tmpdir.join("helpers.py").write(helpers_content)
+    git_repository(cwd=tmpdir)
+
+    assert check_unused_code(cwd=tmpdir, args=["helpers.py"]) == [("helpers.py", "unused_helper")]
+
+
+def test_usage_index_rescans_changed_files(tmpdir):
+    tmpdir.join("helpers.py").write(helpers_content)
+    tmpdir.join("usage.py").write("")
+    git_repository(cwd=tmpdir)
+    assert check_unused_code(cwd=tmpdir, args=["helpers.py"]) == [("helpers.py", "unused_helper")]
+
+    # A tracked file changed in the working tree (not staged) is rescanned on the next run.
+    tmpdir.join("usage.py").write(usage_content)
+    assert check_unused_code(cwd=tmpdir, args=["helpers.py"]) == []
+
+
+def test_graph_reachability(tmpdir):
+    tmpdir.join("helpers.py").write(graph_helpers_content)
+    tmpdir.join("test_helpers.py").write(graph_tests_content)
+    git_repository(cwd=tmpdir)
+
+    # Helpers only called by unused helpers are unused, and a function of another module with the same name as a
+    # used one is not used by it, fixtures are used when a test requests them.
+    assert check_unused_code(cwd=tmpdir, args=["--uuc_engine=graph", "helpers.py", "test_helpers.py"]) == [
+        ("helpers.py", "dead_helper"),
+        ("helpers.py", "dead_inner_helper"),
+        ("test_helpers.py", "inner_helper"),
+        ("test_helpers.py", "unrequested_fixture"),
+    ]
@@ -0,0 +1,136 @@
+"""
+Identifiers usage table for UnusedCode.
+
+Every tracked file is scanned once and the number of lines each identifier appears on is counted,
+so checking if a function is used is a single dict lookup instead of a `git grep` per function.
+
+Counts are kept per git blob in an on-disk index, on the next run only files whose blob SHA changed are
+rescanned and the totals are patched in place.
+"""
+
+import mmap
+import os
+import re
+from collections import Counter
+
+from PluginsUtils.cache import dump_pickle, file_lock, get_project_cache_dir, load_pickle
+from PluginsUtils.git import get_tracked_blobs
+from PluginsUtils.metrics import count
+
+IDENTIFIER_RE = re.compile(rb"[A-Za-z_][A-Za-z0-9_]*")
+# Same heuristic as git, a NUL byte in the first 8000 bytes means the file is binary.
+BINARY_CHECK_SIZE = 8000
+INDEX_VERSION = 1
+USAGE_TABLE = None
+
+
+def count_identifiers(data, counter):
+    """
+    Count on how many lines each identifier appears in data.
+    """
+    if b"\0" in data[:BINARY_CHECK_SIZE]:
+        return counter
+
+    for line in iter(data.readline, b""):
+        identifiers = set(IDENTIFIER_RE.findall(string=line))
+        if identifiers:
+            counter.update(identifiers)
+
+    return counter
+
+
+def count_file_identifiers(filename, counter=None):
+    """
+    Count on how many lines each identifier appears in filename, the file is memory-mapped and read once.
+    """
+    counter = Counter() if counter is None else counter
+    try:
+        with open(filename, "rb") as fd:
+            if not os.fstat(fd=fd.fileno()).st_size:
+                return counter
+
+            with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return count_identifiers(data=data, counter=counter)
+
+    except (OSError, ValueError):
+        # Deleted, unreadable or not a regular file.
+        return counter
+
+
+def _subtract(totals, counter):
+    for name, lines in counter.items():
+        total = totals[name] - lines
+        if total > 0:
+            totals[name] = total
+        else:
+            del totals[name]
+
+
+def update_usage_index(index_dir):
+    """
+    Bring the usage index in index_dir up to date with the working tree and return the totals.
+
+    The index is two files, `totals` (file -> blob SHA and identifier totals) which is all a warm run loads,
+    and `blobs` (blob SHA -> identifier counts) which is only loaded when some file changed.
+    """
+    totals_path = os.path.join(index_dir, "uuc-usage-totals.pickle")
+    blobs_path = os.path.join(index_dir, "uuc-usage-blobs.pickle")
+    tracked = get_tracked_blobs()
+
+    # Serialize the update between flake8 --jobs workers, the first one updates, the others load its result.
+    with file_lock(path=os.path.join(index_dir, "uuc-usage.lock")):
+        index = load_pickle(path=totals_path)
+        if not index or index.get("version") != INDEX_VERSION:
+            index = {"version": INDEX_VERSION, "files": {}, "totals": Counter()}
+
+        files, totals = index["files"], index["totals"]
+        removed = {filename: sha for filename, sha in files.items() if tracked.get(filename) != sha}
+        added = {filename: sha for filename, sha in tracked.items() if files.get(filename) != sha}
+        if not removed and not added:
+            count(counter="cache_hits")
+            return totals
+
+        count(counter="cache_misses")
+
+        blobs = load_pickle(path=blobs_path, default={})
+        if any(sha not in blobs for sha in removed.values()):
+            # Counts of a removed blob are lost, totals can't be patched, rebuild them.
+            files.clear()
+            totals.clear()
+            removed, added = {}, tracked
+
+        for filename, sha in removed.items():
+            _subtract(totals=totals, counter=blobs.get(sha, Counter()))
+            del files[filename]
+
+        for filename, sha in added.items():
+            if sha not in blobs:
+                blobs[sha] = count_file_identifiers(filename=filename)
+
+            totals.update(blobs[sha])
+            files[filename] = sha
+
+        used_blobs = set(files.values())
+        blobs = {sha: counter for sha, counter in blobs.items() if sha in used_blobs}
+        dump_pickle(path=blobs_path, obj=blobs)
+        dump_pickle(path=totals_path, obj=index)
+
+    return totals
+
+
+def get_usage_table():
+    """
+    Get identifier -> number of lines it is used in, for all tracked files.
+
+    The table is loaded on first call and shared by all UnusedCode instances in the process.
+    """
+    global USAGE_TABLE
+
+    if USAGE_TABLE is None:
+        USAGE_TABLE = update_usage_index(index_dir=get_project_cache_dir())
+
+    return USAGE_TABLE
+
+
+def get_usage_count(name):
+    return get_usage_table().get(name.encode(), 0)
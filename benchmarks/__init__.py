@@ -0,0 +1,3 @@
+"""
+Plugins benchmarks, run from the repository root: python -m benchmarks.<name>
+"""
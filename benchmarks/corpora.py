@@ -0,0 +1,165 @@
+"""
+Synthetic corpora for the benchmarks, generated as {relative filename: source} and written to a git repository.
+
+Every generator takes the size of the corpus (tests, params, nesting depth, calls, fixtures or modules) and is
+deterministic, the same size always gives the same files.
+"""
+
+import os
+import subprocess
+
+# Files of the corpora which spread over several modules.
+FIXTURES_PER_FILE = 100
+FUNCTIONS_PER_MODULE = 5
+
+
+def _test(lines, num, indent="", fixture="", polarion=True):
+    args = ", ".join(arg for arg in ("self" if indent else "", fixture) if arg)
+    if polarion:
+        lines.append(f"{indent}@pytest.mark.polarion('CNV-{num}')")
+
+    lines.extend([
+        f"{indent}def test_{num}({args}):",
+        f"{indent}    assert check(value={num}, name=str({num}))",
+        "",
+    ])
+
+
+def tests_module(size):
+    """
+    One module with size tests, in test classes of 10 tests, a test in 20 without Polarion ID.
+    """
+    lines = ["import pytest", "from utilities.checks import check", ""]
+    for num in range(size):
+        if not num % 10:
+            lines.append(f"class TestGroup{num // 10}:")
+
+        _test(lines=lines, num=num, indent="    ", polarion=bool(num % 20))
+
+    return {"tests/test_generated.py": "\n".join(lines) + "\n"}
+
+
+def parametrize_module(size):
+    """
+    One test parametrized with size params, every param with its Polarion ID, built partly in a module constant.
+    """
+    half = size // 2
+    params = [f"    pytest.param({num}, marks=pytest.mark.polarion('CNV-{num}'))," for num in range(size)]
+    lines = [
+        "import pytest",
+        "",
+        "PARAMS = [",
+        *params[:half],
+        "]",
+        "",
+        "@pytest.mark.parametrize('value', [",
+        "    *PARAMS,",
+        *params[half:],
+        "])",
+        "def test_parametrized(value):",
+        "    assert value >= 0",
+        "",
+    ]
+    return {"tests/test_parametrized.py": "\n".join(lines) + "\n"}
+
+
+def nested_module(size):
+    """
+    One module with test classes nested size levels deep (python allows up to 100), with a test at every level.
+    """
+    lines = ["import pytest", "from utilities.checks import check", ""]
+    for depth in range(size):
+        indent = "    " * depth
+        lines.extend([f"{indent}@pytest.mark.usefixtures('fixture_{depth}')", f"{indent}class TestLevel{depth}:"])
+        _test(lines=lines, num=depth, indent=indent + "    ")
+
+    return {"tests/test_nested.py": "\n".join(lines) + "\n"}
+
+
+def calls_module(size):
+    """
+    One module with size call sites, 4 per statement: positional, nested, fluent chain and keywords calls.
+    """
+    lines = ["def func(value, other=None):", "    return value", ""]
+    for num in range(size // 4):
+        lines.append(f"result_{num} = func(func(value={num}), other=api.fetch(path).parse().select({num}))")
+
+    return {"utilities/calls.py": "\n".join(lines) + "\n"}
+
+
+def fixtures_modules(size):
+    """
+    size fixtures in conftest files of 100 fixtures, 1 in 100 names is defined twice, with tests using them.
+    """
+    files = {}
+    for start in range(0, size, FIXTURES_PER_FILE):
+        directory = f"tests/group_{start // FIXTURES_PER_FILE}"
+        lines = ["import pytest", ""]
+        for num in range(start, min(start + FIXTURES_PER_FILE, size)):
+            name = f"fixture_{num - 1 if num % 100 == 99 else num}"
+            scope = "module" if num % 2 else "function"
+            param = f"pytest.param({num}, marks=pytest.mark.polarion('CNV-{num}'))"
+            lines.extend([
+                f"@pytest.fixture(scope='{scope}', params=[{param}])",
+                f"def {name}(request):",
+                "    return request.param",
+                "",
+            ])
+
+        files[f"{directory}/conftest.py"] = "\n".join(lines) + "\n"
+        tests = ["import pytest", ""]
+        for num in range(start, min(start + FIXTURES_PER_FILE, size), 10):
+            _test(lines=tests, num=num, fixture=f"fixture_{num}")
+
+        files[f"{directory}/test_group.py"] = "\n".join(tests) + "\n"
+
+    return files
+
+
+def project_modules(size):
+    """
+    A project of size modules calling functions of the previous module, a test module for every 10 modules
+    and a utility module every 50 which imports from the tests.
+    """
+    files = {"pkg/__init__.py": ""}
+    for num in range(size):
+        lines = [f"from pkg import mod_{num - 1}", ""] if num else []
+        if num and not num % 50:
+            lines.insert(0, f"from tests import test_mod_{(num - 1) // 10}")
+
+        for func in range(FUNCTIONS_PER_MODULE):
+            # The last function of a module is never used, the others are called by the next module.
+            called = num and func < FUNCTIONS_PER_MODULE - 1
+            body = f"mod_{num - 1}.func_{num - 1}_{func}(value=value)" if called else "value"
+            lines.extend([f"def func_{num}_{func}(value):", f"    return {body}", ""])
+
+        files[f"pkg/mod_{num}.py"] = "\n".join(lines) + "\n"
+
+    for start in range(0, size, 10):
+        lines = ["import pytest", f"from pkg import mod_{start}", ""]
+        for func in range(FUNCTIONS_PER_MODULE - 1):
+            lines.extend([
+                f"@pytest.mark.polarion('CNV-{start}{func}')",
+                f"def test_func_{start}_{func}():",
+                f"    assert mod_{start}.func_{start}_{func}(value=1)",
+                "",
+            ])
+
+        files[f"tests/test_mod_{start // 10}.py"] = "\n".join(lines) + "\n"
+
+    return files
+
+
+def write_corpus(directory, files):
+    """
+    Write files under directory and track them in a new git repository (the plugins see the tracked files as
+    the project), nothing is committed so no git identity is needed.
+    """
+    for filename, source in files.items():
+        path = os.path.join(directory, filename)
+        os.makedirs(name=os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as fd:
+            fd.write(source)
+
+    subprocess.run(args=["git", "init", "-q"], cwd=directory, check=True)
+    subprocess.run(args=["git", "add", "-A"], cwd=directory, check=True)
@@ -0,0 +1,56 @@
+"""
+FCN engines scaling on generated files.
+
+python -m benchmarks.fcn_engine [--calls 1000 10000 100000] [--engines visitor legacy]
+
+Every generated statement holds 4 calls (a positional call with a nested call as argument, a fluent chain and a
+keywords only call), the time per call should stay flat when the number of calls grows.
+"""
+
+import argparse
+import ast
+import time
+import types
+
+from FunctionCallForceNames import ENGINES, FunctionCallForceNames
+
+CALLS_PER_STATEMENT = 4
+
+
+def generate_source(calls):
+    lines = ["def func(value, other=None):", "    return value", ""]
+    for idx in range(calls // CALLS_PER_STATEMENT):
+        lines.append(f"result_{idx} = func(func(value={idx}), other=api.fetch(path).parse().select({idx}))")
+
+    return "\n".join(lines) + "\n"
+
+
+def run_engine(engine, tree):
+    FunctionCallForceNames.parse_options(
+        options=types.SimpleNamespace(fcn_exclude_functions=[], fcn_engine=engine, fcn_min_params=0)
+    )
+    plugin = FunctionCallForceNames(tree=tree)
+    start = time.perf_counter()
+    findings = sum(1 for _ in plugin.run())
+    return time.perf_counter() - start, findings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.fcn_engine", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--calls", type=int, nargs="+", default=[1000, 10000, 100000], help="Calls per file.")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES), help="Engines to run.")
+    args = parser.parse_args(args=argv)
+
+    print(f"{'engine':<10} {'calls':>8} {'findings':>9} {'seconds':>9} {'us/call':>8}")
+    for calls in args.calls:
+        source = generate_source(calls=calls)
+        tree = ast.parse(source)
+        for engine in args.engines:
+            seconds, findings = run_engine(engine=engine, tree=tree)
+            print(f"{engine:<10} {calls:>8} {findings:>9} {seconds:>9.3f} {seconds / calls * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Run plugins on all the python files of the current git repository once and print the measures as JSON.
+
+python -m benchmarks.measure [--memory] PLUGIN [PLUGIN ...] [-- FLAKE8_OPTIONS]
+
+Used by benchmarks.suite, a fresh process per measure so every run starts without the plugins process state.
+Plugins are loaded and configured by flake8 (options defaults, `parse_options`) and called like flake8 calls
+them, files are parsed before the measure so only the plugins are measured.
+With --memory the peak of the memory allocated by the plugins is traced (tracemalloc, the plugins run slower),
+processes started by the plugins are not traced.
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from flake8.options.parse_args import parse_args
+
+from PluginsUtils.git import iter_tracked_files
+
+ALL_PLUGINS = ("FCN", "PID", "UFN", "NIC", "NIT", "UUC")
+
+
+def load_plugins(codes, flake8_args):
+    """
+    Get the flake8 loaded tree plugins of codes, configured with flake8_args.
+
+    All the plugins are enabled so the options of all of them are accepted.
+    """
+    plugins, _ = parse_args(argv=["--isolated", f"--enable-extensions={','.join(ALL_PLUGINS)}", *flake8_args])
+    return [loaded for loaded in plugins.checkers.tree if loaded.entry_name in codes]
+
+
+def load_files():
+    files = []
+    for filename in sorted(iter_tracked_files()):
+        if filename.endswith(".py"):
+            filename = os.path.join(".", filename)
+            with open(filename, "rb") as fd:
+                source = fd.read()
+
+            files.append((filename, ast.parse(source, filename=filename), source.decode().splitlines(keepends=True)))
+
+    return files
+
+
+def run_plugins(plugins, files):
+    """
+    Run the plugins on every file (one tree per file, shared by the plugins), get the number of findings.
+    """
+    findings = 0
+    for filename, tree, lines in files:
+        arguments = {"tree": tree, "filename": filename, "lines": lines}
+        for loaded in plugins:
+            checker = loaded.obj(**{name: arguments[name] for name in loaded.parameters})
+            findings += sum(1 for _ in checker.run())
+
+    return findings
+
+
+def measure(plugins, files, memory=False):
+    if memory:
+        tracemalloc.start()
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    findings = run_plugins(plugins=plugins, files=files)
+    seconds, cpu_seconds = time.perf_counter() - start, time.process_time() - cpu_start
+    peak_bytes = None
+    if memory:
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "files": len(files),
+        "findings": findings,
+        "seconds": seconds,
+        "cpu_seconds": cpu_seconds,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    flake8_args = []
+    if "--" in argv:
+        argv, flake8_args = argv[: argv.index("--")], argv[argv.index("--") + 1 :]
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.measure", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("plugins", nargs="+", choices=ALL_PLUGINS, help="Plugins codes.")
+    parser.add_argument("--memory", action="store_true", help="Trace the peak memory of the plugins.")
+    args = parser.parse_args(args=argv)
+
+    plugins = load_plugins(codes=args.plugins, flake8_args=flake8_args)
+    result = measure(plugins=plugins, files=load_files(), memory=args.memory)
+    json.dump(obj=result, fp=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+All plugins checking the same file, with the shared node index and with one index per plugin.
+
+python -m benchmarks.plugins_dispatch [--tests 100 1000 10000] [--repeat 3]
+
+The generated test module holds fixtures, test classes, parametrized tests, imports and calls. In the shared mode
+the plugins check the same tree (as flake8 runs them), in the per plugin mode the cached index, decorators resolver
+and import records are dropped before every plugin, as if every plugin traversed the file itself.
+PID runs without the duplicate IDs check, UFN and UUC only collect their candidates (no project wide state).
+"""
+
+import argparse
+import ast
+import time
+import types
+
+import PluginsUtils.imports
+from FunctionCallForceNames import ENGINES as FCN_ENGINES
+from FunctionCallForceNames import FunctionCallForceNames
+from NoImportFromConftest import NoImportFromConftest
+from NoImportFromTests import NoImportFromTests
+from PluginsUtils.decorators import RESOLVER_ATTRIBUTE, get_decorator_resolver
+from PluginsUtils.nodes import INDEX_ATTRIBUTE
+from PolarionIds import PolarionIds
+from UniqueFixturesNames import iter_fixtures
+from UnusedCode import ENGINES as UUC_ENGINES
+from UnusedCode import UnusedCode
+
+FILENAME = "tests/network/test_generated.py"
+MODES = ("shared", "per-plugin")
+
+
+def generate_source(tests):
+    lines = [
+        "import os",
+        "import pytest",
+        "from importlib import import_module",
+        "from utilities.network import get_interface, wait_for",
+        "",
+    ]
+    for idx in range(tests // 10 + 1):
+        lines.extend([
+            "@pytest.fixture(scope='module')",
+            f"def fixture_{idx}(request):",
+            f"    return get_interface(name=os.environ.get('IFACE_{idx}'), timeout={idx})",
+            "",
+        ])
+
+    for idx in range(tests // 5):
+        lines.extend([f"class TestGroup{idx}:", "    @pytest.mark.polarion('CNV-1')"])
+        for test in range(5):
+            num = idx * 5 + test
+            param = f"pytest.param({num}, marks=pytest.mark.polarion('CNV-{num}'))"
+            lines.extend([
+                f"    @pytest.mark.parametrize('value', [{param}])",
+                f"    def test_{num}(self, fixture_{idx // 2}, value):",
+                f"        assert wait_for(func=fixture_{idx // 2}.check, value=value, sleep=sorted([{num}, 1])[0])",
+                "",
+            ])
+
+    return "\n".join(lines) + "\n"
+
+
+def configure():
+    FunctionCallForceNames.parse_options(
+        options=types.SimpleNamespace(fcn_exclude_functions=[], fcn_engine=FCN_ENGINES[0], fcn_min_params=0)
+    )
+    PolarionIds.parse_options(
+        options=types.SimpleNamespace(
+            skip_duplicate_polarion_ids_check="True", pid_catalog="", pid_catalog_obsolete_statuses=[]
+        )
+    )
+    NoImportFromTests.parse_options(options=types.SimpleNamespace(nit_exclude_imports=[], nit_transitive="False"))
+    UnusedCode.parse_options(
+        options=types.SimpleNamespace(uuc_ignore_prefix=[], uuc_engine=UUC_ENGINES[0], uuc_entry_points=[])
+    )
+
+
+def _unused_code_candidates(tree):
+    plugin = UnusedCode(tree=tree)
+    resolver = get_decorator_resolver(tree=tree)
+    return [func for func in plugin._iter_functions() if not plugin.is_fixture_autouse(func=func, resolver=resolver)]
+
+
+PLUGINS = (
+    ("FCN", lambda tree: list(FunctionCallForceNames(tree=tree).run())),
+    ("PID", lambda tree: list(PolarionIds(tree=tree, filename=FILENAME).run())),
+    ("NIC", lambda tree: list(NoImportFromConftest(tree=tree, filename=FILENAME).run())),
+    ("NIT", lambda tree: list(NoImportFromTests(tree=tree, filename=FILENAME).run())),
+    ("UFN", lambda tree: list(iter_fixtures(tree=tree))),
+    ("UUC", _unused_code_candidates),
+)
+
+
+def reset(tree):
+    for attribute in (INDEX_ATTRIBUTE, RESOLVER_ATTRIBUTE):
+        if hasattr(tree, attribute):
+            delattr(tree, attribute)
+
+    PluginsUtils.imports._LAST = None
+
+
+def run_plugins(tree, mode):
+    """
+    Get the seconds of every plugin and the number of results of all the plugins on a fresh tree.
+    """
+    reset(tree=tree)
+    seconds = {}
+    results = 0
+    for name, plugin in PLUGINS:
+        if mode == "per-plugin":
+            reset(tree=tree)
+
+        start = time.perf_counter()
+        results += len(plugin(tree=tree))
+        seconds[name] = time.perf_counter() - start
+
+    return seconds, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.plugins_dispatch", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--tests", type=int, nargs="+", default=[100, 1000, 10000], help="Tests per file.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode, the fastest is kept.")
+    args = parser.parse_args(args=argv)
+
+    configure()
+    names = [name for name, _ in PLUGINS]
+    print(f"{'tests':>6} {'mode':<11} {'results':>8} " + " ".join(f"{name:>7}" for name in names) + "   total")
+    for tests in args.tests:
+        tree = ast.parse(generate_source(tests=tests), filename=FILENAME)
+        totals = {}
+        for mode in MODES:
+            runs = [run_plugins(tree=tree, mode=mode) for _ in range(args.repeat)]
+            seconds, results = min(runs, key=lambda run: sum(run[0].values()))
+            totals[mode] = sum(seconds.values())
+            timings = " ".join(f"{seconds[name]:>7.3f}" for name in names)
+            print(f"{tests:>6} {mode:<11} {results:>8} {timings} {totals[mode]:>7.3f}")
+
+        print(f"{tests:>6} {'speedup':<11} {totals['per-plugin'] / totals['shared']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Benchmark suite, every plugin and all the plugins together on synthetic corpora of growing sizes.
+
+python -m benchmarks.suite [--scenarios NAME ...] [--scale 1.0] [--repeat 1] [--no-memory] [--output FILE]
+                           [--baseline FILE] [--max-exponent 1.3] [--check]
+
+Every corpus is generated in a temporary git repository (offline, nothing is committed) and every measure runs in
+a fresh process (benchmarks.measure): cold with an empty cache directory, then warm with the cache the cold run
+left. The peak memory of the plugins is measured in another cold run under tracemalloc.
+For every scenario and plugins the time is fitted to a power of the corpus size, an exponent over --max-exponent
+means the plugins scale worse than linearly (quadratic lookups, list membership registries...), --check exits
+with an error for it.
+Results are written as JSON (--output) and compared to previous results with --baseline.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import corpora
+from benchmarks.measure import ALL_PLUGINS
+
+RESULTS_VERSION = 1
+# Python allows 100 indentation levels, a nested test body is 2 levels under its class.
+MAX_NESTING = 95
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> corpus generator, sizes, plugins measured alone (all the plugins are measured together as well) and
+# flake8 options.
+SCENARIOS = {
+    "tests": {
+        "generate": corpora.tests_module,
+        "sizes": (1000, 3000, 10000),
+        "plugins": ("FCN", "PID", "UFN", "UUC"),
+        "args": (),
+    },
+    "parametrize": {
+        "generate": corpora.parametrize_module,
+        "sizes": (10000, 30000, 100000),
+        "plugins": ("PID", "FCN"),
+        "args": (),
+    },
+    "nesting": {
+        "generate": corpora.nested_module,
+        "sizes": (10, 30, 90),
+        "plugins": ("PID", "FCN"),
+        "args": (),
+    },
+    "calls": {
+        "generate": corpora.calls_module,
+        "sizes": (10000, 30000, 100000),
+        "plugins": ("FCN",),
+        "args": (),
+    },
+    "fixtures": {
+        "generate": corpora.fixtures_modules,
+        "sizes": (1000, 3000, 10000),
+        "plugins": ("UFN", "PID", "UUC"),
+        "args": (),
+    },
+    "project": {
+        "generate": corpora.project_modules,
+        "sizes": (100, 300, 1000),
+        "plugins": ("UUC", "NIC", "NIT", "PID"),
+        "args": ("--nit_transitive=True",),
+    },
+    "project-graph": {
+        "generate": corpora.project_modules,
+        "sizes": (100, 300, 1000),
+        "plugins": ("UUC",),
+        "args": ("--uuc_engine=graph",),
+    },
+}
+
+
+def scaled_sizes(name, scale):
+    sizes = [max(2, round(size * scale)) for size in SCENARIOS[name]["sizes"]]
+    if name == "nesting":
+        sizes = [min(size, MAX_NESTING) for size in sizes]
+
+    return sorted(set(sizes))
+
+
+def run_measure(corpus_dir, cache_dir, plugins, args, memory=False):
+    """
+    Measure plugins on the corpus in a new process, the plugins keep their state in cache_dir.
+    """
+    env = dict(os.environ, FLAKE8_PLUGINS_CACHE_DIR=cache_dir)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in (REPO_ROOT, env.get("PYTHONPATH")) if path)
+    command = [sys.executable, "-m", "benchmarks.measure", *plugins, *(["--memory"] if memory else []), "--", *args]
+    res = subprocess.run(args=command, cwd=corpus_dir, env=env, capture_output=True, check=False, text=True)
+    if res.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed in {corpus_dir}:\n{res.stderr}")
+
+    return json.loads(s=res.stdout)
+
+
+def measure_plugins(corpus_dir, work_dir, plugins, args, repeat, memory):
+    """
+    Get the cold and warm results of plugins on a corpus, the fastest of repeat runs, with the peak memory of a
+    cold run.
+    """
+    results = {"cold": [], "warm": []}
+    for _ in range(repeat):
+        cache_dir = tempfile.mkdtemp(dir=work_dir, prefix="cache-")
+        for cache in ("cold", "warm"):
+            results[cache].append(run_measure(corpus_dir=corpus_dir, cache_dir=cache_dir, plugins=plugins, args=args))
+
+        shutil.rmtree(path=cache_dir, ignore_errors=True)
+
+    best = {cache: min(runs, key=lambda run: run["seconds"]) for cache, runs in results.items()}
+    if memory:
+        cache_dir = tempfile.mkdtemp(dir=work_dir, prefix="cache-")
+        peak = run_measure(corpus_dir=corpus_dir, cache_dir=cache_dir, plugins=plugins, args=args, memory=True)
+        best["cold"]["peak_bytes"] = peak["peak_bytes"]
+        shutil.rmtree(path=cache_dir, ignore_errors=True)
+
+    return best
+
+
+def fit_exponent(points):
+    """
+    Get the exponent k of the least squares fit of seconds = a * size ** k, None under 2 sizes.
+    """
+    points = [(math.log(size), math.log(max(seconds, 1e-6))) for size, seconds in points]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def get_fits(results, max_exponent):
+    series = {}
+    for result in results:
+        key = result["scenario"], result["plugins"], result["cache"]
+        series.setdefault(key, []).append((result["size"], result["seconds"]))
+
+    fits = []
+    for (scenario, plugins, cache), points in series.items():
+        exponent = fit_exponent(points=points)
+        fits.append({
+            "scenario": scenario,
+            "plugins": plugins,
+            "cache": cache,
+            "exponent": exponent,
+            "superlinear": exponent is not None and exponent > max_exponent,
+        })
+
+    return fits
+
+
+def result_key(result):
+    return result["scenario"], result["size"], result["plugins"], result["cache"]
+
+
+def print_comparison(results, baseline):
+    previous = {result_key(result=result): result for result in baseline["results"]}
+    print(f"\n{'scenario':<14} {'size':>7} {'plugins':<8} {'cache':<5} {'seconds':>9} {'ratio':>7} {'memory':>7}")
+    for result in results:
+        old = previous.get(result_key(result=result))
+        if not old:
+            continue
+
+        ratio = result["seconds"] / old["seconds"] if old["seconds"] else math.inf
+        memory = ""
+        if result["peak_bytes"] and old["peak_bytes"]:
+            memory = f"{result['peak_bytes'] / old['peak_bytes']:.2f}x"
+
+        print(
+            f"{result['scenario']:<14} {result['size']:>7} {result['plugins']:<8} {result['cache']:<5} "
+            f"{result['seconds']:>9.3f} {ratio:>6.2f}x {memory:>7}"
+        )
+
+
+def get_metadata(scale, repeat):
+    commit = subprocess.run(
+        args=["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, check=False, text=True
+    )
+    return {
+        "version": RESULTS_VERSION,
+        "created": round(time.time()),
+        "commit": commit.stdout.strip() or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scale": scale,
+        "repeat": repeat,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Factor of the corpora sizes.")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per measure, the fastest is kept.")
+    parser.add_argument("--no-memory", action="store_true", help="Do not measure the peak memory.")
+    parser.add_argument("--output", default="benchmarks-results.json", help="JSON results file.")
+    parser.add_argument("--baseline", help="Previous JSON results file to compare to.")
+    parser.add_argument("--max-exponent", type=float, default=1.3, help="Highest expected scaling exponent.")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if a scaling exponent is higher.")
+    args = parser.parse_args(args=argv)
+
+    work_dir = tempfile.mkdtemp(prefix="flake8-plugins-benchmarks-")
+    results = []
+    print(
+        f"{'scenario':<14} {'size':>7} {'plugins':<8} {'cache':<5} {'findings':>8} {'seconds':>9} {'cpu':>9} {'MiB':>8}"
+    )
+    try:
+        for name in args.scenarios:
+            scenario = SCENARIOS[name]
+            for size in scaled_sizes(name=name, scale=args.scale):
+                corpus_dir = os.path.join(work_dir, f"{name}-{size}")
+                corpora.write_corpus(directory=corpus_dir, files=scenario["generate"](size=size))
+                for plugins in (*scenario["plugins"], "all"):
+                    measures = measure_plugins(
+                        corpus_dir=corpus_dir,
+                        work_dir=work_dir,
+                        plugins=ALL_PLUGINS if plugins == "all" else (plugins,),
+                        args=scenario["args"],
+                        repeat=args.repeat,
+                        memory=not args.no_memory,
+                    )
+                    for cache, measure in measures.items():
+                        result = {"scenario": name, "size": size, "plugins": plugins, "cache": cache, **measure}
+                        results.append(result)
+                        peak = f"{measure['peak_bytes'] / 2**20:>8.1f}" if measure["peak_bytes"] else f"{'':>8}"
+                        print(
+                            f"{name:<14} {size:>7} {plugins:<8} {cache:<5} {measure['findings']:>8} "
+                            f"{measure['seconds']:>9.3f} {measure['cpu_seconds']:>9.3f} {peak}",
+                            flush=True,
+                        )
+
+                shutil.rmtree(path=corpus_dir, ignore_errors=True)
+
+    finally:
+        shutil.rmtree(path=work_dir, ignore_errors=True)
+
+    fits = get_fits(results=results, max_exponent=args.max_exponent)
+    for fit in fits:
+        if fit["superlinear"]:
+            print(
+                f"{fit['scenario']} {fit['plugins']} ({fit['cache']}) scales as size^{fit['exponent']:.2f}",
+                file=sys.stderr,
+            )
+
+    with open(args.output, "w", encoding="utf-8") as fd:
+        json.dump(
+            obj={**get_metadata(scale=args.scale, repeat=args.repeat), "results": results, "fits": fits},
+            fp=fd,
+            indent=2,
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fd:
+            print_comparison(results=results, baseline=json.load(fp=fd))
+
+    if args.check and any(fit["superlinear"] for fit in fits):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
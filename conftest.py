@@ -0,0 +1,48 @@
+import pytest
+
+import FunctionCallForceNames.fix
+import FunctionCallForceNames.signatures
+import NoImportFromTests.import_graph
+import NoImportFromTests.paths
+import PluginsUtils.imports
+import PluginsUtils.metrics
+import PluginsUtils.results
+import PolarionIds
+import PolarionIds.fixtures
+import UniqueFixturesNames
+import UnusedCode.reference_graph
+import UnusedCode.usage
+from PluginsUtils.cache import CACHE_DIR_ENV
+from PluginsUtils.metrics import METRICS_ENV, METRICS_TOP_ENV
+from PluginsUtils.results import RESULTS_CACHE_SIZE_ENV
+
+# (module, name, factory of its initial value) of the per process caches and registries.
+SINGLETONS = (
+    (FunctionCallForceNames.fix, "FIXER", lambda: None),
+    (FunctionCallForceNames.signatures, "SIGNATURES", lambda: None),
+    (NoImportFromTests.import_graph, "IMPORT_GRAPH", lambda: None),
+    (NoImportFromTests.paths, "DIRECTORIES", dict),
+    (PluginsUtils.imports, "_LAST", lambda: None),
+    (PluginsUtils.metrics, "METRICS", lambda: None),
+    (PluginsUtils.results, "RESULTS_CACHE", lambda: None),
+    (PolarionIds, "POLARION_IDS", lambda: None),
+    (PolarionIds.fixtures, "CONFTEST_INDEXES", dict),
+    (UniqueFixturesNames, "FIXTURES", lambda: None),
+    (UnusedCode.reference_graph, "REACHABLE", lambda: None),
+    (UnusedCode.usage, "USAGE_TABLE", lambda: None),
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_plugins_cache(monkeypatch, tmp_path_factory):
+    """
+    Run every test with its own plugins cache directory (inherited by the flake8 subprocesses), without metrics and
+    with fresh per process caches, so nothing is read from or written to the user cache.
+    """
+    monkeypatch.setenv(name=CACHE_DIR_ENV, value=str(tmp_path_factory.mktemp(basename="flake8-plugins-cache")))
+    monkeypatch.delenv(name=METRICS_ENV, raising=False)
+    monkeypatch.delenv(name=METRICS_TOP_ENV, raising=False)
+    monkeypatch.delenv(name=RESULTS_CACHE_SIZE_ENV, raising=False)
+    monkeypatch.setattr(target=PluginsUtils.metrics, name="METRICS_DIR", value=None)
+    for module, name, factory in SINGLETONS:
+        monkeypatch.setattr(target=module, name=name, value=factory())
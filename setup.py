@@ -5,7 +5,7 @@ from setuptools import find_packages, setup
 setup(
     name="flake8-python-plugins",
     version="1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
     python_requires=">=3.10",
     install_requires=["flake8"],
@@ -18,5 +18,10 @@ setup(
             "NIT = NoImportFromTests:NoImportFromTests",
             "UUC = UnusedCode:UnusedCode",
         ],
+        "console_scripts": [
+            "flake8-fixture-graph = FixtureGraph.__main__:main",
+            "flake8-pid-export = PolarionIds.__main__:main",
+            "flake8-fcn-fix = FunctionCallForceNames.__main__:main",
+        ],
     },
 )